@@ -0,0 +1,348 @@
+"""
+Benchmark suite for the heat exchanger simulator.
+
+Measures throughput (items per second) and peak Python memory of the physics
+kernels, the TP sweeps, the plotting and the report pipeline, stores them as a
+JSON baseline and compares later runs against it.
+
+Usage:
+    python benchmarks/bench.py --save benchmarks/baseline.json
+    python benchmarks/bench.py --check benchmarks/baseline.json --threshold 0.2
+    python benchmarks/bench.py --quick --only tp1 tp3
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "heat_exchanger_simulator"))
+
+import numpy as np
+import core
+import plotting
+import replay
+import report
+from utils import specific_heat_capacity
+
+SIZES = [10, 1_000, 100_000, 1_000_000]
+QUICK_SIZES = [10, 1_000]
+SCALAR_CALLS = 10_000
+MIN_TIME = 0.2
+MAX_REPEATS = 5
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+BENCHMARKS = []
+
+def benchmark(name, items, group):
+    """
+    Register a benchmark case.
+
+    Args:
+        name (str): Unique name of the case.
+        items (int): Number of items processed per call (for the throughput).
+        group (str): Group used by --only.
+    """
+    def register(func):
+        BENCHMARKS.append({"name": name, "items": items, "group": group, "func": func})
+        return func
+    return register
+
+def install_fake_pdflatex(bin_dir):
+    """
+    Put a "pdflatex" executable running fake_pdflatex.py first on the PATH.
+
+    Args:
+        bin_dir (Path): Directory for the stand-in executable.
+    """
+    script = Path(__file__).resolve().parent / "fake_pdflatex.py"
+    if os.name == "nt":
+        (bin_dir / "pdflatex.bat").write_text(f'@"{sys.executable}" "{script}" %*\n')
+    else:
+        launcher = bin_dir / "pdflatex"
+        launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+        launcher.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+
+# --- Physics kernels -------------------------------------------------------
+
+def _scalar_case(name, call):
+    @benchmark(f"kernel.{name}", SCALAR_CALLS, "kernels")
+    def run():
+        for _ in range(SCALAR_CALLS):
+            call()
+    return run
+
+_scalar_case("calculate_heat_transfer", lambda: core.calculate_heat_transfer("water", 0.2, 60.0, 40.0))
+_scalar_case("calculate_outer_surface", lambda: core.calculate_outer_surface(PIPE))
+_scalar_case("calculate_delta_T_lm", lambda: core.calculate_delta_T_lm(80.0, 70.0, 20.0, 30.0))
+_scalar_case("calculate_log_mean_temperature_difference", lambda: core.calculate_log_mean_temperature_difference(1000.0, 500.0, 0.7))
+_scalar_case("calculate_efficiency", lambda: core.calculate_efficiency(1000.0, 0.2, 4186, 80.0, 20.0))
+_scalar_case("calculate_reynolds_number", lambda: core.calculate_reynolds_number("water", 0.2, 0.1))
+_scalar_case("calculate_prandtl_number", lambda: core.calculate_prandtl_number("water"))
+_scalar_case("calculate_convection_coefficient", lambda: core.calculate_convection_coefficient("water", 0.1, 12000.0, 7.0))
+_scalar_case("calculate_overall_heat_transfer_coefficient", lambda: core.calculate_overall_heat_transfer_coefficient(PIPE, "iron", 500.0, 300.0))
+
+# --- Sweeps ----------------------------------------------------------------
+
+def register_sweeps(sizes):
+    """
+    Register the TP1, TP2 and TP4 sweeps at the given sizes.
+
+    Args:
+        sizes (list): Numbers of sweep points.
+    """
+    for n in sizes:
+        benchmark(f"sweep.tp1[{n}]", n, "tp1")(
+            lambda n=n: core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, n, PIPE, 0.01))
+        benchmark(f"sweep.tp2[{n}]", n, "tp2")(
+            lambda n=n: core.simulate_tp2("water", "water", "iron", 20, 10, 50, 100, n, PIPE, 0.01))
+        benchmark(f"sweep.tp4[{n}]", n, "tp4")(
+            lambda n=n: core.simulate_tp4("water", "water", "iron", 10, 10, 20, 80, "length", 1, 5, n, 0.01))
+
+def _tp3_all_fluids():
+    # Every cold fluid against every hot fluid; points where the temperatures cross are
+    # masked, a cold fluid with no valid point at all is rejected
+    for fluid in specific_heat_capacity:
+        try:
+            core.simulate_tp3(fluid, "iron", 10, 10, PIPE, 0.01)
+        except ValueError:
+            pass
+
+benchmark("sweep.tp3[all fluids]", len(specific_heat_capacity) ** 2, "tp3")(_tp3_all_fluids)
+
+# --- Reduced precision -----------------------------------------------------
+
+# Largest accepted float32 error against float64: outlet temperature (°C) and relative Q
+PRECISION_TOLERANCE = {"T_out": 1e-3, "Q": 1e-4}
+
+def register_precision(sizes):
+    """
+    Register the TP1 sweep solved in float32 and float64 at the given sizes.
+
+    Args:
+        sizes (list): Numbers of sweep points.
+    """
+    for n in sizes:
+        for precision in ("float32", "float64"):
+            benchmark(f"precision.tp1[{n}, {precision}]", n, "precision")(
+                lambda n=n, precision=precision: core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, n, PIPE, 0.01,
+                                                                   precision=precision))
+
+def precision_accuracy(n):
+    """
+    Compare float32 with float64 on a TP1 sweep and on random operating points.
+
+    Args:
+        n (int): Points of each batch.
+
+    Returns:
+        dict: "T_out" (largest absolute error, °C), "Q" (largest relative error) and
+        "reason_mismatches" (points valid in one precision only).
+    """
+    rng = np.random.default_rng(0)
+    batches = [
+        (np.linspace(5, 100, n), 10, 20, 80),
+        (rng.uniform(1, 40, n), rng.uniform(1, 40, n), rng.uniform(5, 30, n), rng.uniform(45, 95, n)),
+    ]
+    errors = {"T_out": 0.0, "Q": 0.0, "reason_mismatches": 0}
+    for flow_cold, flow_hot, T_cold_in, T_hot_in in batches:
+        reference, reduced = (core.solve_points("water", "water", "iron", flow_cold, flow_hot, T_cold_in, T_hot_in, PIPE,
+                                                precision=precision) for precision in ("float64", "float32"))
+        both = reference["valid"] & reduced["valid"]
+        errors["T_out"] = max(errors["T_out"], float(np.abs(reduced["T_out"][both] - reference["T_out"][both]).max(initial=0)))
+        Q = reference["Q"][both]
+        errors["Q"] = max(errors["Q"], float((np.abs(reduced["Q"][both] - Q) / np.abs(Q)).max(initial=0)))
+        errors["reason_mismatches"] += int((reference["reason"] != reduced["reason"]).sum())
+    return errors
+
+# --- Historian replay ------------------------------------------------------
+
+_HISTORIAN_DIR = tempfile.TemporaryDirectory()
+
+def _historian(rows):
+    # Synthetic historian file, written when the case is registered (not timed)
+    path = Path(_HISTORIAN_DIR.name) / f"historian_{rows}.csv"
+    if not path.exists():
+        rng = np.random.default_rng(0)
+        data = np.column_stack([rng.uniform(2, 10, rows), rng.uniform(5, 15, rows), rng.uniform(10, 20, rows),
+                                rng.uniform(55, 80, rows), rng.uniform(15, 30, rows)])
+        np.savetxt(path, data, fmt="%.3f", delimiter=",", header="flow_cold,flow_hot,T_cold_in,T_hot_in,T_cold_out", comments="")
+    return path
+
+def register_replay(sizes):
+    """
+    Register the historian replay (CSV in, .npy and CSV out) at the given sizes.
+
+    Args:
+        sizes (list): Numbers of historian rows.
+    """
+    for n in sizes:
+        historian = _historian(n)
+        for suffix in ("npy", "csv"):
+            @benchmark(f"replay.historian[{n}, {suffix}]", n, "replay")
+            def _replay(historian=historian, suffix=suffix):
+                replay.replay_historian(historian, Path(_HISTORIAN_DIR.name) / f"out.{suffix}",
+                                        "water", "water", "iron", PIPE, 0.01)
+
+# --- Plotting and reporting ------------------------------------------------
+
+_PLOT_RESULTS = {}
+
+def _results(tp_name):
+    if tp_name not in _PLOT_RESULTS:
+        if tp_name == "TP1":
+            _PLOT_RESULTS[tp_name] = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 1_000, PIPE, 0.01)
+        else:
+            _PLOT_RESULTS[tp_name] = core.simulate_tp3("water", "iron", 10, 10, PIPE, 0.01)
+    return _PLOT_RESULTS[tp_name]
+
+for _tp in ["TP1", "TP3"]:
+    @benchmark(f"plot.generate_plot[{_tp}]", 1, "plot")
+    def _plot(tp_name=_tp):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plotting.generate_plot(tp_name, _results(tp_name), tmp_dir)
+
+for _backend in report.BACKENDS:
+    @benchmark(f"report.{_backend}", 1, "report")
+    def _report(backend=_backend):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report.generate_report("TP1", _results("TP1"), {}, tmp_dir, "bench", backend=backend)
+
+# --- Runner ----------------------------------------------------------------
+
+def measure(case):
+    """
+    Time a benchmark case (best of several runs) and measure its peak memory.
+
+    Args:
+        case (dict): Registered benchmark case.
+
+    Returns:
+        dict: "seconds", "throughput" (items/s) and "peak_memory_mb".
+    """
+    func = case["func"]
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < MAX_REPEATS and (not timings or time.perf_counter() - start < MIN_TIME):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    best = min(timings)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "throughput": case["items"] / best if best > 0 else float("inf"),
+        "peak_memory_mb": peak / 2**20,
+        "repeats": len(timings),
+    }
+
+def run_benchmarks(groups=None):
+    """
+    Run all registered benchmarks (optionally only some groups).
+
+    Args:
+        groups (list, optional): Groups to run (e.g., ["tp1", "report"]).
+
+    Returns:
+        dict: Metadata and results per benchmark name.
+    """
+    original_path = os.environ["PATH"]
+    with tempfile.TemporaryDirectory() as bin_dir:
+        install_fake_pdflatex(Path(bin_dir))
+        try:
+            results = {}
+            for case in BENCHMARKS:
+                if groups and case["group"] not in groups:
+                    continue
+                results[case["name"]] = measure(case)
+                r = results[case["name"]]
+                print(f"{case['name']:<55} {r['throughput']:>14.1f} items/s {r['peak_memory_mb']:>10.2f} MB")
+        finally:
+            os.environ["PATH"] = original_path
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, threshold):
+    """
+    Compare a run with a baseline.
+
+    Args:
+        current (dict): Output of run_benchmarks.
+        baseline (dict): Stored baseline.
+        threshold (float): Allowed relative slowdown or memory growth (e.g., 0.2 for 20 %).
+
+    Returns:
+        list: Description of every regression found.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        if result["throughput"] < reference["throughput"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {result['throughput']:.1f} < baseline {reference['throughput']:.1f} items/s")
+        # Ignore sub-megabyte noise on small cases
+        if result["peak_memory_mb"] > reference["peak_memory_mb"] * (1 + threshold) + 1.0:
+            regressions.append(f"{name}: peak memory {result['peak_memory_mb']:.2f} > baseline {reference['peak_memory_mb']:.2f} MB")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Heat exchanger simulator benchmarks")
+    parser.add_argument("--quick", action="store_true", help=f"Only run sweeps of {QUICK_SIZES} points")
+    parser.add_argument("--only", nargs="+", help="Groups to run: kernels, tp1, tp2, tp3, tp4, precision, replay, plot, report")
+    parser.add_argument("--save", type=Path, help="Write the results as a JSON baseline")
+    parser.add_argument("--check", type=Path, help="Compare against a JSON baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    register_sweeps(QUICK_SIZES if args.quick else SIZES)
+    register_precision(QUICK_SIZES if args.quick else SIZES)
+    if not args.only or "replay" in args.only:
+        register_replay(QUICK_SIZES if args.quick else SIZES)
+    current = run_benchmarks(args.only)
+    inaccurate = []
+    if not args.only or "precision" in args.only:
+        # float32 is only worth its speed if it stays close to the float64 reference
+        current["accuracy"] = precision_accuracy(max(QUICK_SIZES if args.quick else SIZES))
+        print(f"float32 vs float64: T_out {current['accuracy']['T_out']:.2e} °C, Q {current['accuracy']['Q']:.2e} (relative), "
+              f"{current['accuracy']['reason_mismatches']} reason mismatches")
+        inaccurate = [f"{key}: float32 error {current['accuracy'][key]:.2e} > {limit:g}"
+                      for key, limit in PRECISION_TOLERANCE.items() if current["accuracy"][key] > limit]
+        if current["accuracy"]["reason_mismatches"]:
+            inaccurate.append(f"{current['accuracy']['reason_mismatches']} points change validity in float32")
+        for message in inaccurate:
+            print(f"INACCURATE {message}")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2))
+        print(f"Baseline written to {args.save}")
+    if args.check:
+        regressions = compare(current, json.loads(args.check.read_text()), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regression beyond the threshold.")
+    return 1 if inaccurate else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
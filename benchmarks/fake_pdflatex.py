@@ -0,0 +1,34 @@
+"""
+Local stand-in for pdflatex used by the benchmarks and tests: writes the files
+pdflatex would produce (.fmt, .toc, .log, .pdf) without compiling anything. A
+source using \\undefined fails like an undefined control sequence does, and a
+-fmt format that is missing or was not dumped by this script fails to load.
+"""
+import sys
+from pathlib import Path
+
+def main(args):
+    if "-ini" in args:
+        job = next(arg for arg in args if arg.startswith("-jobname=")).split("=", 1)[1]
+        Path(f"{job}.fmt").write_bytes(b"fmt")
+        return 0
+    fmt = next((arg.split("=", 1)[1] for arg in args if arg.startswith("-fmt=")), None)
+    if fmt is not None and not (Path(f"{fmt}.fmt").exists() and Path(f"{fmt}.fmt").read_bytes() == b"fmt"):
+        print(f"---! {fmt}.fmt was written by another pdfTeX\n(Fatal format file error; I'm stymied)")
+        return 3
+    output_dir = Path(args[args.index("-output-directory") + 1])
+    tex_file = Path(args[-1])
+    source = tex_file.read_text(encoding="utf-8")
+    if "\\undefined" in source:
+        message = "! Undefined control sequence.\nl.1 \\undefined"
+        (output_dir / f"{tex_file.stem}.log").write_text(message, encoding="utf-8")
+        print(message)
+        return 1
+    sections = "\n".join(line for line in source.splitlines() if line.startswith("\\section"))
+    (output_dir / f"{tex_file.stem}.toc").write_text(sections, encoding="utf-8")
+    (output_dir / f"{tex_file.stem}.log").write_text("Output written", encoding="utf-8")
+    (output_dir / f"{tex_file.stem}.pdf").write_bytes(b"%PDF-1.4\n" + source.encode("utf-8"))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
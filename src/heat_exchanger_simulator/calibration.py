@@ -0,0 +1,337 @@
+#calibration of fouling resistances and correlation multipliers against measured data
+import numpy as np
+import profiling
+from core import (fluid_properties, validate_points, wall_resistance, _resolve_correlations,
+                  _internal_side, _external_side, _overall_coefficient, _outlet, NON_FINITE)
+
+# name -> (initial value, lower bound, upper bound)
+PARAMETERS = {
+    "fouling_internal": (0.0, 0.0, np.inf),     # m²·K/W
+    "fouling_external": (0.0, 0.0, np.inf),     # m²·K/W
+    "h_internal_factor": (1.0, 1e-3, np.inf),   # multiplier of the tube-side correlation
+    "h_external_factor": (1.0, 1e-3, np.inf),   # multiplier of the annulus-side correlation
+}
+# Typical magnitudes, for the finite-difference steps
+_SCALES = {"fouling_internal": 1e-4, "fouling_external": 1e-4, "h_internal_factor": 1.0, "h_external_factor": 1.0}
+
+MEASUREMENTS = ("flow_cold", "flow_hot", "T_cold_in", "T_hot_in", "T_cold_out")
+
+class _Problem:
+    """Measured points with everything that does not depend on the fitted parameters precomputed."""
+    def __init__(self, data, fluid, hot_fluid, material, pipe_properties, gap, max_iter, tol, correlation):
+        flow_cold, flow_hot, T_cold_in, T_hot_in, self.measured = (np.asarray(data[key], dtype=float) for key in MEASUREMENTS)
+        cold, hot = fluid_properties(fluid), fluid_properties(hot_fluid)
+        internal_correlation, external_correlation = _resolve_correlations(correlation)
+        self.outer_diameter, self.thickness, self.length = (
+            np.asarray(pipe_properties[key], dtype=float) for key in ("outer_diameter", "thickness", "length")
+        )
+        self.reason = validate_points(pipe_properties, gap, flow_cold, flow_hot, T_cold_in, T_hot_in)
+        self.used = (self.reason == 0) & np.isfinite(self.measured)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            self.m_dot_cold = (flow_cold * cold["rho"]) / 60
+            self.m_dot_hot = (flow_hot * hot["rho"]) / 60
+            _, self.h_internal = _internal_side(cold, self.m_dot_cold, self.outer_diameter, self.thickness, self.length, internal_correlation)
+            _, self.h_external = _external_side(hot, self.m_dot_hot, self.outer_diameter, gap, self.length, external_correlation)
+        wall = pipe_properties.get("wall_resistance")
+        self.wall = wall_resistance(self.outer_diameter, self.thickness, material) if wall is None else wall
+        self.A = np.pi * self.outer_diameter * self.length
+        self.cold, self.hot = cold, hot
+        self.T_cold_in, self.T_hot_in = T_cold_in, T_hot_in
+        self.max_iter, self.tol = max_iter, tol
+
+    def U(self, values):
+        # values: name -> per-point array (or stacked perturbations, leading axis)
+        return _overall_coefficient(self.h_internal * values["h_internal_factor"], self.h_external * values["h_external_factor"],
+                                    self.outer_diameter, self.thickness, self.length, self.wall,
+                                    values["fouling_internal"], values["fouling_external"])
+
+    def residuals(self, U):
+        # Same outlet solution as the simulations (invalid and crossed points come back as NaN)
+        reason = np.broadcast_to(np.where(self.used, 0, self.reason | NON_FINITE), np.shape(U))
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            T_out = _outlet(self.cold, self.hot, self.m_dot_cold, self.m_dot_hot, self.T_cold_in, self.T_hot_in,
+                            U, self.A, reason, self.max_iter, self.tol)["T_out"]
+        return T_out - self.measured
+
+    def dU(self, values, U):
+        # Analytic derivatives of U with respect to every parameter
+        ri, ro, length = self.outer_diameter / 2 - self.thickness, self.outer_diameter / 2, self.length
+        total = 1 / (2 * np.pi * length * ro * U)
+        dU_dtotal = -U / total
+        resistance_internal = 1 / (2 * np.pi * length * ri * self.h_internal * values["h_internal_factor"])
+        resistance_external = 1 / (2 * np.pi * length * ro * self.h_external * values["h_external_factor"])
+        return {
+            "fouling_internal": dU_dtotal / (2 * np.pi * length * ri),
+            "fouling_external": dU_dtotal / (2 * np.pi * length * ro),
+            "h_internal_factor": -dU_dtotal * resistance_internal / values["h_internal_factor"],
+            "h_external_factor": -dU_dtotal * resistance_external / values["h_external_factor"],
+        }
+
+def _segment_sums(values, segments, count):
+    # Sum of the rows of values (points, m) per segment -> (count, m)
+    sums = np.zeros((count, values.shape[1]))
+    for k in range(values.shape[1]):
+        sums[:, k] = np.bincount(segments, weights=values[:, k], minlength=count)
+    return sums
+
+class _Layout:
+    """Position of the global and per-segment parameters in the parameter vector."""
+    def __init__(self, parameters, segment_parameters, segments, n_points):
+        self.global_names = [name for name in parameters if name not in segment_parameters]
+        self.segment_names = [name for name in parameters if name in segment_parameters]
+        self.segments = np.zeros(n_points, dtype=np.int64) if segments is None else np.asarray(segments, dtype=np.int64)
+        self.n_segments = int(self.segments.max()) + 1 if self.segment_names and len(self.segments) else 1
+        self.G, self.Ps = len(self.global_names), len(self.segment_names)
+
+    def values(self, x, initial):
+        # Per-point value of every model parameter (fitted or fixed at its initial value)
+        values = {name: initial[name] for name in PARAMETERS}
+        for k, name in enumerate(self.global_names):
+            values[name] = x[k]
+        for j, name in enumerate(self.segment_names):
+            values[name] = x[self.G + j * self.n_segments:self.G + (j + 1) * self.n_segments][self.segments]
+        return values
+
+    def unpack(self, x):
+        result = {name: float(x[k]) for k, name in enumerate(self.global_names)}
+        for j, name in enumerate(self.segment_names):
+            result[name] = x[self.G + j * self.n_segments:self.G + (j + 1) * self.n_segments].copy()
+        return result
+
+def _normal_equations(layout, J, r):
+    # J (points, G + Ps) holds each point's derivatives with respect to the global parameters and
+    # to the parameters of its own segment; the segment blocks of JᵀJ are kept block diagonal
+    Jg, Js = J[:, :layout.G], J[:, layout.G:]
+    S, Ps = layout.n_segments, layout.Ps
+    Agg, gg = Jg.T @ Jg, Jg.T @ r
+    Ags = _segment_sums((Jg[:, :, None] * Js[:, None, :]).reshape(len(r), -1), layout.segments, S).reshape(S, layout.G, Ps)
+    Ass = _segment_sums((Js[:, :, None] * Js[:, None, :]).reshape(len(r), -1), layout.segments, S).reshape(S, Ps, Ps)
+    gs = _segment_sums(Js * r[:, None], layout.segments, S)
+    return Agg, Ags, Ass, gg, gs
+
+def _solve_damped(layout, equations, damping):
+    """Levenberg-Marquardt step (Schur complement on the global parameters) and the inverse diagonal."""
+    Agg, Ags, Ass, gg, gs = equations
+    G, Ps, S = layout.G, layout.Ps, layout.n_segments
+    scale_g = np.diag(Agg).copy()
+    scale_s = np.diagonal(Ass, axis1=1, axis2=2).copy()
+    # Parameters without data (e.g. an empty segment) keep their value
+    scale_g[scale_g <= 0] = 1.0
+    scale_s[scale_s <= 0] = 1.0
+    Agg = Agg + np.diag(damping * scale_g)
+    Ass = Ass + damping * scale_s[:, :, None] * np.eye(Ps)
+    Ass[:, np.arange(Ps), np.arange(Ps)] += (np.diagonal(Ass, axis1=1, axis2=2) == 0)
+
+    # Y_s = Ass_s⁻¹ [Ags_sᵀ | gs_s]
+    Y = np.linalg.solve(Ass, np.concatenate([Ags.transpose(0, 2, 1), gs[:, :, None]], axis=2)) if Ps else np.zeros((S, 0, G + 1))
+    reduced = Agg - np.einsum("sgp,sph->gh", Ags, Y[:, :, :G])
+    rhs = -gg + np.einsum("sgp,sp->g", Ags, Y[:, :, G])
+    reduced_inverse = np.linalg.inv(reduced) if G else np.zeros((0, 0))
+    step_g = reduced_inverse @ rhs
+    step_s = -Y[:, :, G] - np.einsum("sph,h->sp", Y[:, :, :G], step_g)
+    return np.concatenate([step_g, step_s.T.ravel()]), (Ass, Y, reduced_inverse)
+
+def _inverse_diagonal(layout, factors):
+    # Diagonal of (JᵀJ)⁻¹ from the factors of an undamped solve
+    Ass, Y, reduced_inverse = factors
+    G, Ps = layout.G, layout.Ps
+    diagonal_s = np.zeros((layout.n_segments, Ps))
+    if Ps:
+        diagonal_s = np.diagonal(np.linalg.inv(Ass), axis1=1, axis2=2) + np.einsum(
+            "sph,hk,spk->sp", Y[:, :, :G], reduced_inverse, Y[:, :, :G]
+        )
+    return np.concatenate([np.diag(reduced_inverse), diagonal_s.T.ravel()])
+
+@profiling.profiled("calibrate", "calibration")
+def calibrate(data, fluid, hot_fluid, material, pipe_properties, gap=0.01, parameters=("fouling_internal",),
+              segments=None, segment_parameters=None, initial=None, jacobian="analytic",
+              max_iterations=50, ftol=1e-10, xtol=1e-10, max_iter=5, tol=None, correlation=None):
+    """
+    Fit fouling resistances and correlation multipliers to measured cold outlet temperatures
+    by nonlinear least squares (Levenberg-Marquardt).
+
+    The convection coefficients do not depend on the fitted parameters and are computed
+    once; every evaluation only recomputes U and the outlet iteration for the whole batch.
+    With segments (e.g. one per day), the fouling resistances get one value per segment
+    while the multipliers stay global; the normal equations keep their block structure,
+    so the cost grows linearly with the number of segments.
+
+    Args:
+        data (dict): Measured arrays "flow_cold", "flow_hot" (L/min), "T_cold_in", "T_hot_in"
+            and "T_cold_out" (°C), one entry per sample (NaN samples are ignored).
+        fluid (str): Cold fluid name.
+        hot_fluid (str): Hot fluid name.
+        material (str): Pipe material.
+        pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
+        gap (float): Gap between pipes (m).
+        parameters (tuple): Names from PARAMETERS to fit; the others keep their initial value.
+        segments (array, optional): Segment index (0, 1, ...) of every sample.
+        segment_parameters (tuple, optional): Fouling resistances fitted per segment (the
+            fitted ones by default when segments are given); multipliers are always global.
+        initial (dict, optional): Initial values, PARAMETERS defaults otherwise.
+        jacobian (str): "analytic" (closed-form dU/dθ times dT_out/dU from one batched difference
+            of the outlet iteration) or "finite-difference" (all parameters perturbed in one batch).
+        max_iterations (int): Maximum Levenberg-Marquardt iterations.
+        ftol (float): Stop when the relative decrease of the cost is below ftol.
+        xtol (float): Stop when the relative step is below xtol.
+        max_iter (int): Fixed-point iterations of the outlet temperature (as in the simulations).
+        tol (float, optional): Outlet iteration tolerance (°C).
+        correlation (str or dict, optional): Nusselt correlation(s), see core.solve_points.
+
+    Returns:
+        dict: "parameters" (fitted values, arrays per segment), "std_error" (same layout),
+        "pipe_properties" to use the calibrated model in the simulations (the fouling of the last
+        segment when fitted per segment, see calibrated_pipe_properties), "correlation_factors"
+        ({"internal": (correlation, multiplier), "external": ...}, see calibrated_correlation),
+        "residuals" (°C, predicted - measured, NaN for unused samples), "rms", "samples",
+        "iterations", "evaluations" and "converged".
+
+    Raises:
+        ValueError: If a parameter is unknown, a multiplier is fitted per segment or no sample can be used.
+    """
+    unknown = [name for name in parameters if name not in PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown calibration parameter(s): {', '.join(unknown)}. Available: {', '.join(PARAMETERS)}.")
+    multipliers = [name for name in segment_parameters or () if not name.startswith("fouling")]
+    if multipliers:
+        raise ValueError(f"Only fouling resistances can be fitted per segment, not {', '.join(multipliers)}.")
+    if jacobian not in ("analytic", "finite-difference"):
+        raise ValueError("jacobian must be 'analytic' or 'finite-difference'.")
+    initial = {name: (initial or {}).get(name, PARAMETERS[name][0]) for name in PARAMETERS}
+    if segment_parameters is None:
+        segment_parameters = () if segments is None else tuple(name for name in parameters if name.startswith("fouling"))
+
+    problem = _Problem(data, fluid, hot_fluid, material, pipe_properties, gap, max_iter, tol, correlation)
+    layout = _Layout(parameters, segment_parameters, segments, len(problem.measured))
+    names = layout.global_names + layout.segment_names
+    lower = np.concatenate([[PARAMETERS[n][1] for n in layout.global_names]] + [np.full(layout.n_segments, PARAMETERS[n][1]) for n in layout.segment_names])
+    upper = np.concatenate([[PARAMETERS[n][2] for n in layout.global_names]] + [np.full(layout.n_segments, PARAMETERS[n][2]) for n in layout.segment_names])
+    x = np.concatenate([[initial[n] for n in layout.global_names]] + [np.full(layout.n_segments, initial[n], dtype=float) for n in layout.segment_names])
+    evaluations = 0
+
+    def evaluate(x, with_jacobian):
+        nonlocal evaluations
+        values = layout.values(x, initial)
+        U = problem.U(values)
+        if not with_jacobian:
+            evaluations += 1
+            return problem.residuals(U), None
+        if jacobian == "analytic":
+            epsilon = 1e-7
+            U = np.broadcast_to(U, problem.measured.shape)
+            r, r_step = problem.residuals(np.stack([U, U * (1 + epsilon)]))
+            dr_dU = (r_step - r) / (U * epsilon)
+            derivatives = problem.dU(values, U)
+            J = np.stack([dr_dU * np.broadcast_to(derivatives[name], r.shape) for name in names], axis=1)
+        else:
+            steps = [1e-6 * max(abs(np.max(values[name])), _SCALES[name]) for name in names]
+            perturbed = [values] + [{**values, name: values[name] + step} for name, step in zip(names, steps)]
+            U_stack = np.stack([np.broadcast_to(problem.U(v), problem.measured.shape) for v in perturbed])
+            r_stack = problem.residuals(U_stack)
+            r = r_stack[0]
+            J = np.stack([(r_stack[k + 1] - r) / step for k, step in enumerate(steps)], axis=1)
+        evaluations += 1
+        return r, J
+
+    def cost_of(r):
+        finite = np.isfinite(r)
+        return 0.5 * float(r[finite] @ r[finite]), finite
+
+    r, J = evaluate(x, True)
+    cost, finite = cost_of(r)
+    if not finite.any():
+        raise ValueError("No measured sample can be used for the calibration (invalid inputs or temperature cross).")
+    damping, converged, iteration = 1e-3, False, 0
+    for iteration in range(1, max_iterations + 1):
+        mask = finite & np.isfinite(J).all(axis=1)
+        equations = _normal_equations(layout, np.where(mask[:, None], J, 0.0), np.where(mask, r, 0.0))
+        while True:
+            step, _ = _solve_damped(layout, equations, damping)
+            x_new = np.clip(x + step, lower, upper)
+            r_new, _ = evaluate(x_new, False)
+            cost_new, finite_new = cost_of(r_new)
+            if cost_new < cost or damping > 1e12:
+                break
+            damping *= 4
+        if cost_new >= cost:
+            converged = True  # no step decreases the cost any more
+            break
+        actual_step = x_new - x
+        decrease = cost - cost_new
+        x, cost = x_new, cost_new
+        damping = max(damping / 3, 1e-12)
+        if decrease <= ftol * cost or np.linalg.norm(actual_step) <= xtol * (np.linalg.norm(x) + xtol):
+            converged = True
+            break
+        r, J = evaluate(x, True)
+        finite = np.isfinite(r)
+
+    r, J = evaluate(x, True)
+    cost, finite = cost_of(r)
+    mask = finite & np.isfinite(J).all(axis=1)
+    samples = int(mask.sum())
+    _, factors = _solve_damped(layout, _normal_equations(layout, np.where(mask[:, None], J, 0.0), np.where(mask, r, 0.0)), 0.0)
+    variance = 2 * cost / (samples - len(x)) if samples > len(x) else np.nan
+    with np.errstate(invalid="ignore"):
+        std_error = np.sqrt(variance * _inverse_diagonal(layout, factors))
+
+    fitted = layout.unpack(x)
+    values = {name: fitted.get(name, initial[name]) for name in PARAMETERS}
+    calibrated_pipe = dict(pipe_properties)
+    for name in ("fouling_internal", "fouling_external"):
+        value = values[name]
+        # Per-segment resistances: the latest state of the pipe (see calibrated_pipe_properties)
+        calibrated_pipe[name] = float(value[-1]) if np.ndim(value) else value
+    internal, external = _resolve_correlations(correlation)
+    return {
+        "parameters": fitted,
+        "std_error": layout.unpack(std_error),
+        "pipe_properties": calibrated_pipe,
+        "correlation_factors": {
+            "internal": (internal, float(values["h_internal_factor"])),
+            "external": (external, float(values["h_external_factor"])),
+        },
+        "residuals": np.where(finite, r, np.nan),
+        "rms": float(np.sqrt(2 * cost / samples)) if samples else float("nan"),
+        "samples": samples,
+        "iterations": iteration,
+        "evaluations": evaluations,
+        "converged": converged,
+    }
+
+def calibrated_correlation(fit):
+    """
+    Correlations of a calibration, for the correlation argument of the simulations.
+
+    A fitted multiplier is passed as a (name, factor) pair (see correlations.get_correlation),
+    without adding an entry to the correlation registry; a multiplier of 1 keeps the
+    correlation itself.
+
+    Args:
+        fit (dict): Result of calibrate.
+
+    Returns:
+        dict: {"internal": name or (name, factor), "external": ...}.
+    """
+    return {side: (name, factor) if factor != 1 else name for side, (name, factor) in fit["correlation_factors"].items()}
+
+def calibrated_pipe_properties(fit, segment=-1):
+    """
+    Pipe properties of a calibration with the fouling resistances of a given segment.
+
+    fit["pipe_properties"] holds the last segment; an array of segment indices gives one
+    value per point, e.g. the segments of calibrate to replay the calibration data.
+
+    Args:
+        fit (dict): Result of calibrate.
+        segment (int or array): Segment index, or one segment index per point.
+
+    Returns:
+        dict: Pipe properties, for the pipe_properties argument of the simulations.
+    """
+    pipe = dict(fit["pipe_properties"])
+    for name in ("fouling_internal", "fouling_external"):
+        value = fit["parameters"].get(name)
+        if np.ndim(value):
+            pipe[name] = value[segment]
+    return pipe
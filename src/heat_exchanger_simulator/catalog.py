@@ -0,0 +1,140 @@
+#catalog of standard pipe sizes with precomputed wall resistances
+import csv
+import functools
+from pathlib import Path
+import numpy as np
+from core import solve_points, wall_resistance
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+PIPE_SCHEDULES_FILE = DATA_DIR / "pipe_schedules.csv"
+
+@functools.lru_cache(maxsize=None)
+def load_pipe_catalog(path=PIPE_SCHEDULES_FILE):
+    """
+    Load a pipe catalog (CSV with name, nominal_size, schedule, outer_diameter_mm, thickness_mm).
+    Lines starting with '#' are comments. The file is read once per path.
+
+    Args:
+        path (str or Path): Catalog file, the bundled ASME B36.10M schedules by default.
+
+    Returns:
+        dict: "names", "nominal_size", "schedule" (tuples) and "outer_diameter", "thickness"
+        (read-only arrays, m), in file order.
+
+    Raises:
+        ValueError: If a line is incomplete or describes an impossible pipe.
+    """
+    names, nominal_size, schedule, outer_diameter, thickness = [], [], [], [], []
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = csv.DictReader(line for line in file if line.strip() and not line.startswith("#"))
+        for number, row in enumerate(rows, start=1):
+            try:
+                od = float(row["outer_diameter_mm"]) / 1000
+                th = float(row["thickness_mm"]) / 1000
+                name = row["name"].strip()
+            except (KeyError, TypeError, ValueError, AttributeError):
+                raise ValueError(f"Invalid pipe catalog entry {number} in {path}: {row}")
+            if not 0 < th < od / 2:
+                raise ValueError(f"Pipe '{name}' in {path}: thickness must be positive and less than half the outer diameter.")
+            if name in names:
+                raise ValueError(f"Pipe '{name}' is listed twice in {path}.")
+            names.append(name)
+            nominal_size.append(row.get("nominal_size", ""))
+            schedule.append(row.get("schedule", ""))
+            outer_diameter.append(od)
+            thickness.append(th)
+
+    catalog = {"names": tuple(names), "nominal_size": tuple(nominal_size), "schedule": tuple(schedule),
+               "outer_diameter": np.array(outer_diameter), "thickness": np.array(thickness)}
+    # Shared by every caller through the cache
+    catalog["outer_diameter"].flags.writeable = False
+    catalog["thickness"].flags.writeable = False
+    return catalog
+
+@functools.lru_cache(maxsize=None)
+def catalog_wall_resistance(material, path=PIPE_SCHEDULES_FILE):
+    """
+    Wall resistance per unit length of every pipe of a catalog, computed once per material.
+
+    Args:
+        material (str): Pipe material.
+        path (str or Path): Catalog file.
+
+    Returns:
+        numpy.ndarray: Read-only resistances (K·m/W), in catalog order.
+    """
+    catalog = load_pipe_catalog(path)
+    resistance = wall_resistance(catalog["outer_diameter"], catalog["thickness"], material)
+    resistance.flags.writeable = False
+    return resistance
+
+def _indices(catalog, names):
+    if names is None:
+        return np.arange(len(catalog["names"]))
+    missing = [name for name in names if name not in catalog["names"]]
+    if missing:
+        raise ValueError(f"Unknown pipe(s): {', '.join(missing)}.")
+    return np.array([catalog["names"].index(name) for name in names], dtype=int)
+
+def pipe_preset(name, length=2.0, material=None, path=PIPE_SCHEDULES_FILE):
+    """
+    Pipe properties of a catalog entry, in the format used by the simulations.
+
+    Args:
+        name (str): Pipe name (e.g. "NPS 1 Sch 40").
+        length (float): Pipe length (m).
+        material (str, optional): If given, the cached wall resistance is included.
+        path (str or Path): Catalog file.
+
+    Returns:
+        dict: outer_diameter, thickness and length (m), and wall_resistance (K·m/W) if material is given.
+    """
+    catalog = load_pipe_catalog(path)
+    index = _indices(catalog, [name])[0]
+    pipe_properties = {
+        "outer_diameter": float(catalog["outer_diameter"][index]),
+        "thickness": float(catalog["thickness"][index]),
+        "length": length,
+    }
+    if material is not None:
+        pipe_properties["wall_resistance"] = float(catalog_wall_resistance(material, path)[index])
+    return pipe_properties
+
+def scan_catalog(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in,
+                 length=2.0, gap=0.01, names=None, path=PIPE_SCHEDULES_FILE, **options):
+    """
+    Solve every catalog pipe against the same operating points in one batch.
+
+    The pipes form the first axis and the operating points the second, so the wall
+    resistances are taken from the per-material cache and the operating-point inputs
+    are shared by every pipe.
+
+    Args:
+        fluid (str): Cold fluid (inside the pipe).
+        hot_fluid (str): Hot fluid (annulus).
+        material (str): Pipe material.
+        flow_cold, flow_hot (float or array): Flow rates (L/min).
+        T_cold_in, T_hot_in (float or array): Inlet temperatures (°C).
+        length (float): Pipe length (m).
+        gap (float): Gap between pipes (m).
+        names (list, optional): Pipes to scan, the whole catalog by default.
+        path (str or Path): Catalog file.
+        **options: Passed to solve_points (max_iter, tol, correlation).
+
+    Returns:
+        dict: "names" and the solve_points arrays with shape (pipes, points).
+    """
+    catalog = load_pipe_catalog(path)
+    index = _indices(catalog, names)
+    pipe_properties = {
+        "outer_diameter": catalog["outer_diameter"][index, None],
+        "thickness": catalog["thickness"][index, None],
+        "length": length,
+        "wall_resistance": catalog_wall_resistance(material, path)[index, None],
+    }
+    points = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (flow_cold, flow_hot, T_cold_in, T_hot_in))
+    flow_cold, flow_hot, T_cold_in, T_hot_in = np.broadcast_arrays(*points)
+    results = solve_points(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in,
+                           pipe_properties, gap=gap, **options)
+    results["names"] = [catalog["names"][i] for i in index]
+    return results
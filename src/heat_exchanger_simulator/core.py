@@ -1,6 +1,11 @@
 import numpy as np
 import math
-from utils import specific_heat_capacity, thermal_conductivity, density, viscosity, thermal_conductivity_fluid
+import functools
+import profiling
+from correlations import DEFAULT_CORRELATION, get_correlation, nusselt
+from mixtures import is_mixture, mixture_properties
+from profiles import AxialProfiles
+from utils import specific_heat_capacity, thermal_conductivity, density, viscosity, thermal_conductivity_fluid, roughness
 
 def calculate_heat_transfer(fluid, mass_flow_rate, temp_in, temp_out):
     """
@@ -195,7 +200,7 @@ def calculate_convection_coefficient(fluid, pipe_diameter, Re, Pr):
     else:  # Turbulent
         return 0.023 * (Re ** 0.8) * (Pr ** 0.33) * k / pipe_diameter
 
-def calculate_overall_heat_transfer_coefficient(pipe, material, h_internal, h_external):
+def calculate_overall_heat_transfer_coefficient(pipe, material, h_internal, h_external, fouling_internal=0.0, fouling_external=0.0):
     """
     Calculates the overall heat transfer coefficient U (W/m²·K).
     
@@ -204,6 +209,8 @@ def calculate_overall_heat_transfer_coefficient(pipe, material, h_internal, h_ex
         material (str): Pipe material.
         h_internal (float): Internal convection coefficient (W/m²·K).
         h_external (float): External convection coefficient (W/m²·K).
+        fouling_internal (float): Fouling resistance on the inner surface (m²·K/W).
+        fouling_external (float): Fouling resistance on the outer surface (m²·K/W).
     
     Returns:
         float: Overall heat transfer coefficient (W/m²·K).
@@ -216,12 +223,614 @@ def calculate_overall_heat_transfer_coefficient(pipe, material, h_internal, h_ex
     resistance_internal = 1 / (2 * math.pi * length * ri * h_internal)
     resistance_wall = math.log(ro / ri) / (2 * math.pi * length * k)
     resistance_external = 1 / (2 * math.pi * length * ro * h_external)
+    resistance_fouling = fouling_internal / (2 * math.pi * length * ri) + fouling_external / (2 * math.pi * length * ro)
 
-    total_resistance = resistance_internal + resistance_wall + resistance_external
+    total_resistance = resistance_internal + resistance_wall + resistance_external + resistance_fouling
     U = 1 / (2 * math.pi * length * ro * total_resistance)
     return U
 
-def simulate_tp1(fluid, hot_fluid, material, T_cold_in, T_hot_in, flow_start, flow_end, flow_steps, pipe_properties, gap=0.01):
+# Reason codes of invalid sweep points (bit flags, a point can have several)
+INVALID_GEOMETRY = 1
+INVALID_ANNULUS = 2
+INVALID_FLOW = 4
+TEMPERATURE_CROSS = 8
+NON_FINITE = 16
+INVALID_INLET = 32
+
+# The log-mean temperature difference of the model takes the hot outlet this many °C
+# below the hot inlet; the reported hot outlet follows from the energy balance instead
+HOT_OUTLET_DROP = 10
+
+REASONS = {
+    INVALID_GEOMETRY: "invalid pipe geometry (diameter, thickness or length)",
+    INVALID_ANNULUS: "external pipe not larger than the internal pipe",
+    INVALID_FLOW: "non-positive flow rate",
+    TEMPERATURE_CROSS: "hot and cold temperatures cross (LMTD undefined)",
+    NON_FINITE: "non-finite result",
+    INVALID_INLET: "invalid inlet stream (an upstream unit failed)",
+}
+
+def describe_reason(code):
+    """
+    Human-readable description of a reason code.
+    
+    Args:
+        code (int): Reason code (0 for a valid point).
+    
+    Returns:
+        str: Description of every reason contained in the code.
+    """
+    code = int(code)
+    if code == 0:
+        return "valid"
+    return "; ".join(message for flag, message in REASONS.items() if code & flag)
+
+def _single_fluid_properties(name):
+    if is_mixture(name):
+        return mixture_properties(name)
+    return {
+        "cp": specific_heat_capacity.get(name, 4186),
+        "rho": density.get(name, 1.0),
+        "mu": viscosity.get(name, 0.001),
+        "k": thermal_conductivity_fluid.get(name, 0.6),
+    }
+
+# Floating-point types of the batch engine (precision argument of solve_points)
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+def _float_array(x):
+    # Float arrays keep their precision (float32 batches), anything else becomes float64
+    x = np.asarray(x)
+    return x if x.dtype.kind == "f" else x.astype(float)
+
+def _precision(precision):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'. Available: {', '.join(PRECISIONS)}.")
+    return PRECISIONS[precision]
+
+def fluid_properties(fluids):
+    """
+    Look up the properties of one fluid or of one fluid per point.
+    
+    Args:
+        fluids (str or list): Fluid name, or a sequence of fluid names. Mixtures are
+            written "base+additive:fraction" (e.g. "water+glycol:0.35", see mixtures.py).
+    
+    Returns:
+        dict: "cp" (J/kg·K), "rho" (kg/L), "mu" (Pa·s) and "k" (W/m·K), as floats
+        for a single name or as arrays for a sequence.
+    """
+    if isinstance(fluids, str):
+        return _single_fluid_properties(fluids.lower())
+    # Each distinct fluid (e.g. each concentration of a sweep) is looked up once
+    names, inverse = np.unique([fluid.lower() for fluid in fluids], return_inverse=True)
+    distinct = [_single_fluid_properties(name) for name in names.tolist()]
+    return {key: np.array([properties[key] for properties in distinct], dtype=float)[inverse] for key in ("cp", "rho", "mu", "k")}
+
+def validate_points(pipe_properties, gap, flow_cold, flow_hot, T_cold_in, T_hot_in, approach=HOT_OUTLET_DROP):
+    """
+    Check a whole batch of operating points before solving it.
+    
+    Args:
+        pipe_properties (dict): outer_diameter, thickness and length (m), floats or arrays.
+        gap (float or array): Gap between pipes (m).
+        flow_cold (float or array): Cold fluid flow rate (L/min).
+        flow_hot (float or array): Hot fluid flow rate (L/min).
+        T_cold_in (float or array): Cold fluid inlet temperature (°C).
+        T_hot_in (float or array): Hot fluid inlet temperature (°C).
+        approach (float): Minimum T_hot_in - T_cold_in (°C), exclusive. The LMTD of solve_points
+            needs HOT_OUTLET_DROP; 0 only requires the hot inlet above the cold inlet.
+    
+    Returns:
+        numpy.ndarray: Reason code per point (0 for valid points).
+    """
+    outer_diameter, thickness, length, gap, flow_cold, flow_hot, T_cold_in, T_hot_in = (
+        np.asarray(x, dtype=float) for x in (pipe_properties["outer_diameter"], pipe_properties["thickness"],
+                                             pipe_properties["length"], gap, flow_cold, flow_hot, T_cold_in, T_hot_in)
+    )
+    shape = np.broadcast_shapes(outer_diameter.shape, thickness.shape, length.shape, gap.shape,
+                                flow_cold.shape, flow_hot.shape, T_cold_in.shape, T_hot_in.shape)
+    reason = np.zeros(shape, dtype=np.int64)
+
+    # Conditions are written as ~(x > 0) so that NaN inputs are rejected too
+    reason |= np.where(~((outer_diameter > 0) & (thickness >= 0) & (outer_diameter - 2 * thickness > 0) & (length > 0)), INVALID_GEOMETRY, 0)
+    reason |= np.where(~(gap > 0), INVALID_ANNULUS, 0)
+    reason |= np.where(~((flow_cold > 0) & (flow_hot > 0)), INVALID_FLOW, 0)
+    # e.g. the assumed hot outlet of the LMTD must stay above the cold inlet
+    reason |= np.where(~(T_hot_in - approach - T_cold_in > 0), TEMPERATURE_CROSS, 0)
+    return reason
+
+def solve_cold_outlet(T_hot_in, T_hot_out, T_cold_in, U, A, m_dot_cold, Cp_cold, max_iter=5, tol=None, active=None):
+    """
+    Fixed-point iteration on the cold outlet temperature of a batch of points:
+    T_cold_out = T_cold_in + U * A * delta_T_lm(T_cold_out) / (m_dot_cold * Cp_cold).
+    
+    Args:
+        T_hot_in (float or array): Inlet temperature of hot fluid (°C).
+        T_hot_out (float or array): Outlet temperature of hot fluid (°C).
+        T_cold_in (float or array): Inlet temperature of cold fluid (°C).
+        U (float or array): Overall heat transfer coefficient (W/m²·K).
+        A (float or array): Surface area (m²).
+        m_dot_cold (float or array): Mass flow rate of cold fluid (kg/s).
+        Cp_cold (float or array): Specific heat capacity of cold fluid (J/kg·K).
+        max_iter (int): Maximum number of iterations.
+        tol (float, optional): A point stops once its outlet temperature moves less than tol (°C).
+        active (array, optional): Boolean mask of the points to solve (default all).
+    
+    Returns:
+        tuple: Arrays (T_cold_out, Q, delta_T_lm, residual, iterations, crossed), where residual
+        is the change of T_cold_out in the last iteration (°C) and crossed marks the points whose
+        temperatures crossed during the iteration.
+    """
+    T_hot_in, T_hot_out, T_cold_in, U, A, m_dot_cold, Cp_cold = np.broadcast_arrays(
+        *(_float_array(x) for x in (T_hot_in, T_hot_out, T_cold_in, U, A, m_dot_cold, Cp_cold))
+    )
+    shape = T_hot_in.shape
+    # float32 only when every input is float32
+    dtype = np.result_type(T_hot_in, T_hot_out, T_cold_in, U, A, m_dot_cold, Cp_cold)
+    active = np.ones(shape, dtype=bool) if active is None else np.array(active, dtype=bool)
+    T_cold_out = np.asarray(T_cold_in + 10, dtype=dtype)  # stays an array for 0-d batches
+    Q = np.full(shape, np.nan, dtype=dtype)
+    delta_T_lm = np.full(shape, np.nan, dtype=dtype)
+    residual = np.full(shape, np.inf, dtype=dtype)
+    iterations = np.zeros(shape, dtype=np.int64)
+    crossed = np.zeros(shape, dtype=bool)
+    dT2 = T_hot_out - T_cold_in
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iter):
+            dT1 = T_hot_in - T_cold_out
+            cross = active & ~((dT1 > 0) & (dT2 > 0))
+            if cross.any():
+                crossed |= cross
+                active &= ~cross
+            if not active.any():
+                break
+            # Same formula as calculate_delta_T_lm, dT1 is used when dT1 ≈ dT2; log1p keeps
+            # the ratio accurate near dT1 = dT2, where float32 would lose most of its digits
+            lmtd = np.where(np.abs(dT1 - dT2) < 1e-6, dT1, (dT1 - dT2) / np.log1p((dT1 - dT2) / dT2))
+            Q_next = U * A * lmtd
+            T_next = T_cold_in + Q_next / (m_dot_cold * Cp_cold)
+            residual = np.where(active, np.abs(T_next - T_cold_out), residual)
+            delta_T_lm = np.where(active, lmtd, delta_T_lm)
+            Q = np.where(active, Q_next, Q)
+            T_cold_out = np.where(active, T_next, T_cold_out)
+            iterations += active
+            if tol is not None:
+                active &= ~(residual <= tol)
+    return T_cold_out, Q, delta_T_lm, residual, iterations, crossed
+
+def calculate_energy_balance_error(Q, m_dot_hot, Cp_hot, T_hot_in, T_hot_out):
+    """
+    Relative disagreement between the duty given to the cold side and the duty
+    released by the hot side, |Q_hot - Q| / max(|Q_hot|, |Q|).
+    
+    Args:
+        Q (float or array): Heat transfer rate received by the cold fluid (W).
+        m_dot_hot (float or array): Mass flow rate of hot fluid (kg/s).
+        Cp_hot (float or array): Specific heat capacity of hot fluid (J/kg·K).
+        T_hot_in (float or array): Inlet temperature of hot fluid (°C).
+        T_hot_out (float or array): Outlet temperature of hot fluid (°C).
+    
+    Returns:
+        float or numpy.ndarray: Relative energy-balance error (0 when both sides agree).
+    """
+    Q_hot = m_dot_hot * Cp_hot * (T_hot_in - T_hot_out)
+    scale = np.maximum(np.abs(Q_hot), np.abs(Q))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(scale == 0, 0.0, np.abs(Q_hot - Q) / scale)
+
+def material_properties(material):
+    """
+    Thermal conductivity and wall roughness of a pipe material. Unlike the scalar
+    functions of the original model, the batch functions do not fall back to stainless
+    steel values for a misspelled material.
+    
+    Args:
+        material (str): Pipe material (e.g. "copper (pure)").
+    
+    Returns:
+        tuple: Thermal conductivity (W/m·K) and absolute wall roughness (m).
+    
+    Raises:
+        ValueError: If the material is not in the property database.
+    """
+    name = material.lower()
+    if name not in thermal_conductivity:
+        raise ValueError(f"Unknown pipe material '{material}'. Available: {', '.join(sorted(thermal_conductivity))}.")
+    return thermal_conductivity[name], roughness[name]
+
+@functools.lru_cache(maxsize=4096)
+def _wall_resistance_scalar(outer_diameter, thickness, material):
+    ro = outer_diameter / 2
+    ri = ro - thickness
+    return math.log(ro / ri) / (2 * math.pi * thermal_conductivity.get(material, 16.0))
+
+def wall_resistance(outer_diameter, thickness, material):
+    """
+    Conduction resistance of the pipe wall per unit length, ln(ro / ri) / (2 * pi * k).
+    It only depends on the geometry and the material, so scalar geometries are cached
+    and sweeps over operating points reuse it.
+    
+    Args:
+        outer_diameter (float or array): Pipe outer diameter (m).
+        thickness (float or array): Wall thickness (m).
+        material (str): Pipe material.
+    
+    Returns:
+        float or numpy.ndarray: Wall resistance per unit length (K·m/W), divide by the length for K/W.
+    
+    Raises:
+        ValueError: If the material is unknown.
+    """
+    k, _ = material_properties(material)
+    if np.ndim(outer_diameter) == 0 and np.ndim(thickness) == 0:
+        if not 0 <= thickness < outer_diameter / 2:
+            return float("nan")
+        return _wall_resistance_scalar(float(outer_diameter), float(thickness), material.lower())
+    ro = _float_array(outer_diameter) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(ro / (ro - thickness)) / (2 * np.pi * k)
+
+def friction_factor(Re, relative_roughness, newton_steps=2):
+    """
+    Darcy friction factor of a batch of points: 64 / Re in laminar flow (Re < 2300),
+    Colebrook equation otherwise, solved by Newton steps on 1 / sqrt(f) starting from
+    the explicit Swamee-Jain approximation (2 steps bring 1 / sqrt(f) within 1e-10).
+    
+    Args:
+        Re (float or array): Reynolds number.
+        relative_roughness (float or array): Wall roughness divided by the hydraulic diameter.
+        newton_steps (int): Newton steps on the Colebrook equation.
+    
+    Returns:
+        numpy.ndarray: Darcy friction factor.
+    """
+    Re = _float_array(Re)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = relative_roughness / 3.7
+        b = 2.51 / Re
+        # Swamee-Jain start, then Newton on F(x) = x + 2 log10(a + b x), x = 1 / sqrt(f)
+        x = -2 * np.log10(a + 5.74 / Re ** 0.9)
+        for _ in range(newton_steps):
+            inner = a + b * x
+            x = x - (x + 2 * np.log10(inner)) / (1 + 2 * b / (inner * math.log(10)))
+        return np.where(Re < 2300, 64 / Re, 1 / x ** 2)
+
+def pressure_drop(props, mass_flow_rate, hydraulic_diameter, flow_area, length, wall_roughness):
+    """
+    Frictional pressure drop of a batch of points (Darcy-Weisbach).
+    
+    Args:
+        props (dict): Fluid properties (see fluid_properties).
+        mass_flow_rate (float or array): Mass flow rate (kg/s).
+        hydraulic_diameter (float or array): Hydraulic diameter (m).
+        flow_area (float or array): Flow cross-section (m²).
+        length (float or array): Flow length (m).
+        wall_roughness (float): Absolute wall roughness (m).
+    
+    Returns:
+        numpy.ndarray: Pressure drop (Pa).
+    """
+    rho = props["rho"] * 1000  # kg/L -> kg/m³
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity = mass_flow_rate / (rho * flow_area)
+        Re = rho * velocity * hydraulic_diameter / props["mu"]
+        f = friction_factor(Re, wall_roughness / hydraulic_diameter)
+        return f * length / hydraulic_diameter * rho * velocity ** 2 / 2
+
+@profiling.profiled("solve_points", "simulation")
+def solve_points(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, pipe_properties, gap=0.01, max_iter=5, tol=None, correlation=None, precision="float64"):
+    """
+    Solve a batch of double-pipe operating points at once.
+    
+    Every numeric argument (and every value of pipe_properties) may be a float or an
+    array; they are broadcast together. Points failing validation, or whose
+    temperatures cross during the iteration, are not solved: their outputs are NaN
+    and their reason code says why.
+    
+    Args:
+        fluid (str): Cold fluid name.
+        hot_fluid (str or list): Hot fluid name, or one hot fluid name per point.
+        material (str): Pipe material.
+        flow_cold (float or array): Cold fluid flow rate (L/min).
+        flow_hot (float or array): Hot fluid flow rate (L/min).
+        T_cold_in (float or array): Cold fluid inlet temperature (°C).
+        T_hot_in (float or array): Hot fluid inlet temperature (°C).
+        pipe_properties (dict): outer_diameter, thickness and length (m), optionally the
+            precomputed "wall_resistance" per unit length for this material (see wall_resistance)
+            and the fouling resistances "fouling_internal" and "fouling_external" (m²·K/W).
+        gap (float or array): Gap between pipes (m).
+        max_iter (int): Maximum fixed-point iterations per point.
+        tol (float, optional): Stop iterating a point once its outlet temperature moves less than tol (°C).
+        correlation (str or dict, optional): Nusselt correlation for both sides, or
+            {"internal": name, "external": name} (see correlations.available_correlations);
+            a (name, factor) pair multiplies a correlation (see correlations.get_correlation).
+        precision (str): "float64", or "float32" to compute and return the float columns in
+            single precision (half the memory and bandwidth, relative errors around 1e-6).
+    
+    Returns:
+        dict: Arrays "T_out", "T_hot_out", "Q", "efficiency", "U", "Re_internal", "Re_external", "delta_T_lm",
+        "h_internal", "h_external", "A", "dp_internal" and "dp_external" (Pa), "pumping_power" (W),
+        "residual", "iterations", "energy_balance_error", "reason" and "valid". Columns that do
+        not vary along the batch are read-only broadcast views.
+    
+    Raises:
+        ValueError: If the precision or the material is unknown.
+    """
+    tracer = profiling.tracer()
+    if tracer:
+        mark = tracer.mark()
+    dtype = _precision(precision)
+    cold = fluid_properties(fluid)
+    hot = fluid_properties(hot_fluid)
+    if dtype is not np.float64:
+        cold, hot = ({key: np.asarray(value, dtype=dtype) for key, value in props.items()} for props in (cold, hot))
+    _, wall_roughness = material_properties(material)
+    internal_correlation, external_correlation = _resolve_correlations(correlation)
+    if tracer:
+        mark = tracer.lap("solve_points.properties", mark)
+
+    reason = validate_points(pipe_properties, gap, flow_cold, flow_hot, T_cold_in, T_hot_in)
+    shape = np.broadcast_shapes(reason.shape, np.shape(hot["cp"]), np.shape(pipe_properties.get("fouling_internal", 0.0)),
+                                np.shape(pipe_properties.get("fouling_external", 0.0)))
+    reason = np.broadcast_to(reason, shape).copy()
+    # Inputs keep their own shapes: quantities that do not vary along the batch
+    # (e.g. the hot side of a TP1 sweep) are computed once and broadcast at the end
+    outer_diameter, thickness, length, gap, flow_cold, flow_hot, T_cold_in, T_hot_in = (
+        np.asarray(x, dtype=dtype)
+        for x in (pipe_properties["outer_diameter"], pipe_properties["thickness"], pipe_properties["length"],
+                  gap, flow_cold, flow_hot, T_cold_in, T_hot_in)
+    )
+    fouling_internal, fouling_external = (np.asarray(pipe_properties.get(key, 0.0), dtype=dtype)
+                                          for key in ("fouling_internal", "fouling_external"))
+    if tracer:
+        mark = tracer.lap("solve_points.validate", mark)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        A = np.pi * outer_diameter * length
+        m_dot_cold = (flow_cold * cold["rho"]) / 60
+        m_dot_hot = (flow_hot * hot["rho"]) / 60
+        Re_internal, h_internal = _internal_side(cold, m_dot_cold, outer_diameter, thickness, length, internal_correlation)
+        Re_external, h_external = _external_side(hot, m_dot_hot, outer_diameter, gap, length, external_correlation)
+        # Precomputed by the pipe catalog, otherwise from the (cached) geometry/material pair
+        wall = pipe_properties.get("wall_resistance")
+        if wall is None:
+            wall = wall_resistance(outer_diameter, thickness, material)
+        U = _overall_coefficient(h_internal, h_external, outer_diameter, thickness, length, np.asarray(wall, dtype=dtype),
+                                 fouling_internal, fouling_external)
+        if tracer:
+            mark = tracer.lap("solve_points.U", mark)
+
+        dp_internal, dp_external, pumping_power = _pressure_drops(
+            cold, hot, m_dot_cold, m_dot_hot, flow_cold, flow_hot, outer_diameter, thickness, gap, length, wall_roughness
+        )
+        if tracer:
+            mark = tracer.lap("solve_points.pressure_drop", mark)
+
+        outlet = _outlet(cold, hot, m_dot_cold, m_dot_hot, T_cold_in, T_hot_in, U, A, reason, max_iter, tol)
+        T_out, T_hot_out, Q, delta_T_lm, residual, iterations, efficiency, energy_balance_error, reason, valid = (
+            outlet[key] for key in ("T_out", "T_hot_out", "Q", "delta_T_lm", "residual", "iterations", "efficiency",
+                                    "energy_balance_error", "reason", "valid")
+        )
+    if tracer:
+        mark = tracer.lap("solve_points.lmtd", mark)
+
+    return {
+        "T_out": T_out,
+        "T_hot_out": T_hot_out,
+        "Q": Q,
+        "efficiency": efficiency,
+        "U": np.broadcast_to(U, shape),
+        "Re_internal": np.broadcast_to(Re_internal, shape),
+        "Re_external": np.broadcast_to(Re_external, shape),
+        "delta_T_lm": delta_T_lm,
+        "h_internal": np.broadcast_to(h_internal, shape),
+        "h_external": np.broadcast_to(h_external, shape),
+        "A": np.broadcast_to(A, shape),
+        "dp_internal": np.broadcast_to(dp_internal, shape),
+        "dp_external": np.broadcast_to(dp_external, shape),
+        "pumping_power": np.broadcast_to(pumping_power, shape),
+        "residual": residual,
+        "iterations": iterations,
+        "energy_balance_error": energy_balance_error,
+        "reason": reason,
+        "valid": valid,
+    }
+
+# Stages of solve_points, also evaluated one by one by model.ExchangerModel
+
+def _internal_side(cold, m_dot_cold, outer_diameter, thickness, length, correlation):
+    internal_diameter = outer_diameter - 2 * thickness
+    Re_internal = _reynolds_number(cold, m_dot_cold, internal_diameter)
+    h_internal = convection_coefficient_array(
+        cold, Re_internal, cold["mu"] * cold["cp"] / cold["k"],
+        {"diameter": internal_diameter, "length": length, "heating": True}, correlation
+    )
+    return Re_internal, h_internal
+
+def _external_side(hot, m_dot_hot, outer_diameter, gap, length, correlation):
+    external_diameter = outer_diameter + gap
+    if get_correlation(correlation)["kind"] == "annulus":
+        # Annulus correlations work on the hydraulic diameter (the gap)
+        annulus_area = np.pi * (external_diameter ** 2 - outer_diameter ** 2) / 4
+        Re_external = m_dot_hot * gap / (annulus_area * hot["mu"])
+        external_geometry = {"diameter": gap, "length": length, "heating": False,
+                             "diameter_ratio": outer_diameter / external_diameter}
+    else:
+        Re_external = _reynolds_number(hot, m_dot_hot, external_diameter)
+        external_geometry = {"diameter": external_diameter, "length": length, "heating": False}
+    h_external = convection_coefficient_array(hot, Re_external, hot["mu"] * hot["cp"] / hot["k"], external_geometry, correlation)
+    return Re_external, h_external
+
+def _overall_coefficient(h_internal, h_external, outer_diameter, thickness, length, wall, fouling_internal=0.0, fouling_external=0.0):
+    ri = outer_diameter / 2 - thickness
+    ro = outer_diameter / 2
+    resistance_internal = 1 / (2 * np.pi * length * ri * h_internal)
+    resistance_wall = wall / length
+    resistance_external = 1 / (2 * np.pi * length * ro * h_external)
+    resistance_fouling = fouling_internal / (2 * np.pi * length * ri) + fouling_external / (2 * np.pi * length * ro)
+    return 1 / (2 * np.pi * length * ro * (resistance_internal + resistance_wall + resistance_external + resistance_fouling))
+
+def _pressure_drops(cold, hot, m_dot_cold, m_dot_hot, flow_cold, flow_hot, outer_diameter, thickness, gap, length, wall_roughness):
+    # Pressure drop in the tube and in the annulus (hydraulic diameter = gap)
+    internal_diameter = outer_diameter - 2 * thickness
+    external_diameter = outer_diameter + gap
+    dp_internal = pressure_drop(cold, m_dot_cold, internal_diameter, np.pi * internal_diameter ** 2 / 4, length, wall_roughness)
+    dp_external = pressure_drop(hot, m_dot_hot, gap, np.pi * (external_diameter ** 2 - outer_diameter ** 2) / 4, length, wall_roughness)
+    pumping_power = (dp_internal * flow_cold + dp_external * flow_hot) / 60000  # L/min -> m³/s
+    return dp_internal, dp_external, pumping_power
+
+def _outlet(cold, hot, m_dot_cold, m_dot_hot, T_cold_in, T_hot_in, U, A, reason, max_iter, tol):
+    # reason holds the validation codes (full batch shape); a new array is returned
+    reason = reason.copy()
+    T_hot_assumed = T_hot_in - HOT_OUTLET_DROP
+    T_out, Q, delta_T_lm, residual, iterations, crossed = solve_cold_outlet(
+        T_hot_in, T_hot_assumed, T_cold_in, U, A, m_dot_cold, cold["cp"], max_iter, tol, active=reason == 0
+    )
+    # Hot outlet that releases the duty Q. A duty larger than the hot stream can give (low hot
+    # flow or heat capacity) takes it below the cold inlet; such points are kept, as in the
+    # original model, and energy_balance_error shows how far off the assumed outlet is
+    T_hot_out = np.array(np.broadcast_to(T_hot_in - Q / (m_dot_hot * hot["cp"]), T_out.shape), dtype=T_out.dtype)
+    reason[crossed] |= TEMPERATURE_CROSS
+    reason[(reason == 0) & ~np.isfinite(T_out)] |= NON_FINITE
+
+    Q_max = m_dot_cold * cold["cp"] * (T_hot_in - T_cold_in)
+    efficiency = np.where(Q_max == 0, 0.0, Q / Q_max)
+    # How far the assumed hot outlet of the LMTD is from the energy balance
+    energy_balance_error = calculate_energy_balance_error(Q, m_dot_hot, hot["cp"], T_hot_in, T_hot_assumed)
+    valid = reason == 0
+    for column in (T_out, T_hot_out, Q, delta_T_lm, residual, efficiency, energy_balance_error):
+        column[~valid] = np.nan
+    return {"T_out": T_out, "T_hot_out": T_hot_out, "Q": Q, "delta_T_lm": delta_T_lm, "residual": residual, "iterations": iterations,
+            "efficiency": efficiency, "energy_balance_error": energy_balance_error, "reason": reason, "valid": valid}
+
+def _reynolds_number(props, mass_flow_rate, pipe_diameter):
+    # Array form of calculate_reynolds_number
+    area = np.pi * (pipe_diameter / 2) ** 2
+    velocity = mass_flow_rate / (props["rho"] * area)
+    return (props["rho"] * velocity * pipe_diameter) / props["mu"]
+
+def convection_coefficient_array(props, Re, Pr, geometry, correlation=DEFAULT_CORRELATION):
+    """
+    Convection coefficient of a batch of points from a registered Nusselt correlation
+    (the "legacy" correlation is the array form of calculate_convection_coefficient).
+    
+    Args:
+        props (dict): Fluid properties (see fluid_properties).
+        Re (float or array): Reynolds number.
+        Pr (float or array): Prandtl number.
+        geometry (dict): "diameter" (hydraulic diameter, m) and the other entries
+            described in correlations.register_correlation.
+        correlation (str): Name of the Nusselt correlation.
+    
+    Returns:
+        numpy.ndarray: Convection coefficient (W/m²·K).
+    """
+    return nusselt(correlation, Re, Pr, geometry) * props["k"] / geometry["diameter"]
+
+def _resolve_correlations(correlation):
+    # None, one name for both sides, or {"internal": name, "external": name}; a name can
+    # also be a (name, factor) pair, see correlations.get_correlation
+    if correlation is None:
+        correlation = DEFAULT_CORRELATION
+    if isinstance(correlation, (str, tuple)):
+        internal = correlation
+        external = correlation if get_correlation(correlation)["kind"] == "tube" else DEFAULT_CORRELATION
+    else:
+        internal = correlation.get("internal", DEFAULT_CORRELATION)
+        external = correlation.get("external", DEFAULT_CORRELATION)
+    if get_correlation(internal)["kind"] != "tube":
+        raise ValueError(f"Correlation '{internal}' is for annuli and cannot be used inside the tube.")
+    get_correlation(external)
+    return internal, external
+
+# Flow regimes of the sweep results, indexed by regime_codes
+REGIMES = ("Laminar", "Turbulent", "Unknown")
+
+def regime_codes(Re):
+    """
+    Array form of interpret_reynolds_number, as indices into REGIMES.
+    
+    Args:
+        Re (array): Reynolds numbers (NaN where they could not be computed).
+    
+    Returns:
+        numpy.ndarray: int8 codes, 0 laminar (Re < 5000), 1 turbulent, 2 unknown.
+    """
+    Re = np.asarray(Re)
+    return np.where(np.isnan(Re), 2, Re >= 5000).astype(np.int8)
+
+def _regimes(Re):
+    return np.asarray(REGIMES)[regime_codes(Re)]
+
+def sweep_results(tp_name, axis, points, diagnostics=False, profiles=None, T_cold_in=None, T_hot_in=None, arrays=False):
+    """
+    Turn the arrays of solve_points into the result dict of a TP sweep.
+    
+    Args:
+        tp_name (str): Name of the TP (used in error messages).
+        axis (dict): Swept variable(s), e.g. {"flow_rates": [...]}.
+        points (dict): Output of solve_points.
+        diagnostics (bool): Keep the "residual", "iterations" and "energy_balance_error" columns.
+        profiles (str or int, optional): Add the axial temperature profiles: "analytic" (exact,
+            5 numbers per point) or a number of grid positions (float32 samples), see profiles.AxialProfiles.
+            Points whose "T_hot_out" falls below the cold inlet have NaN profiles.
+        T_cold_in (float or array): Cold inlet temperature of the points (°C), needed for profiles.
+        T_hot_in (float or array): Hot inlet temperature of the points (°C), needed for profiles.
+        arrays (bool): Return the per-point columns (and array axis values) as NumPy arrays
+            instead of lists; float32 points always are. export.to_dataframe and export.to_arrow
+            wrap such columns without copying them.
+    
+    Returns:
+        dict: Simulation results, one list entry per point, with "valid" and "reason" columns,
+        and "profiles" (an AxialProfiles) when asked.
+    
+    Raises:
+        ValueError: If no point of the sweep is valid.
+    """
+    valid = points["valid"]
+    if not valid.any():
+        reasons = sorted({describe_reason(code) for code in np.unique(points["reason"])})
+        raise ValueError(f"No valid point in the {tp_name} sweep: {', '.join(reasons)}.")
+    shape = valid.shape
+    # A list of Python floats takes 32 bytes per point, 4 to 8 times the array
+    arrays = arrays or points["T_out"].dtype == np.float32
+    if arrays:
+        column = lambda values: np.array(np.broadcast_to(values, shape))
+    else:
+        column = lambda values: np.broadcast_to(values, shape).tolist()
+    results = {key: column(value) if isinstance(value, np.ndarray) else value for key, value in axis.items()}
+    for key in ["T_out", "T_hot_out", "Q", "efficiency", "U", "Re_internal", "Re_external"]:
+        results[key] = column(points[key])
+    results["Re_internal_regime"] = column(_regimes(np.broadcast_to(points["Re_internal"], shape)))
+    results["Re_external_regime"] = column(_regimes(np.broadcast_to(points["Re_external"], shape)))
+    for key in ["delta_T_lm", "h_internal", "h_external", "A", "dp_internal", "dp_external", "pumping_power"]:
+        results[key] = column(points[key])
+    results["valid"] = column(valid)
+    results["reason"] = column(points["reason"])
+    if diagnostics:
+        for key in ["residual", "iterations", "energy_balance_error"]:
+            results[key] = column(points[key])
+    if profiles is not None:
+        dtype = points["T_out"].dtype
+        results["profiles"] = AxialProfiles(np.broadcast_to(np.asarray(T_cold_in, dtype=dtype), shape), points["T_out"],
+                                            np.broadcast_to(np.asarray(T_hot_in, dtype=dtype), shape), points["T_hot_out"],
+                                            grid=None if profiles == "analytic" else int(profiles))
+    return results
+
+def _solve_points(model, fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, pipe_properties, gap, max_iter, tol, correlation, precision="float64"):
+    # solve_points, or an incremental update of a model.ExchangerModel (float64 only)
+    if model is None:
+        return solve_points(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, pipe_properties, gap, max_iter, tol, correlation, precision)
+    if precision != "float64":
+        raise ValueError("An ExchangerModel computes in float64; run without model for precision='float32'.")
+    return model.update(fluid=fluid, hot_fluid=hot_fluid, material=material, flow_cold=flow_cold, flow_hot=flow_hot,
+                        T_cold_in=T_cold_in, T_hot_in=T_hot_in, pipe_properties=pipe_properties, gap=gap,
+                        max_iter=max_iter, tol=tol, correlation=correlation).points()
+
+@profiling.profiled("simulate_tp1", "simulation")
+def simulate_tp1(fluid, hot_fluid, material, T_cold_in, T_hot_in, flow_start, flow_end, flow_steps, pipe_properties, gap=0.01, max_iter=5, tol=None, diagnostics=False, correlation=None, model=None, profiles=None, precision="float64", arrays=False):
     """
     Simulate TP1: Impact of cold fluid flow rate on outlet temperature.
     
@@ -236,86 +845,34 @@ def simulate_tp1(fluid, hot_fluid, material, T_cold_in, T_hot_in, flow_start, fl
         flow_steps (int): Number of flow steps.
         pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
         gap (float): Gap between pipes (m).
+        max_iter (int): Maximum fixed-point iterations per point.
+        tol (float, optional): Stop iterating once the outlet temperature moves less than tol (°C).
+        diagnostics (bool): Add per-point "residual", "iterations" and "energy_balance_error".
+        correlation (str or dict, optional): Nusselt correlation(s), see solve_points.
+        model (model.ExchangerModel, optional): Keep the intermediate quantities between runs:
+            only those depending on inputs that changed since the last run are recomputed.
+        profiles (str or int, optional): Add "profiles", the axial temperature profiles of every
+            point ("analytic" or a number of float32 grid positions, see sweep_results).
+        precision (str): "float64", or "float32" for very large sweeps: half the memory and
+            bandwidth, float32 array columns (see solve_points). Not available with a model.
+        arrays (bool): Return NumPy array columns instead of lists (see sweep_results).
     
     Returns:
         dict: Simulation results including additional parameters for reporting.
+        Invalid points are NaN, flagged in "valid" and explained by "reason".
     """
     try:
-        A = calculate_outer_surface(pipe_properties)
         flow_rates = np.linspace(flow_start, flow_end, flow_steps)
-        T_outs = []
-        Qs = []
-        efficiencies = []
-        Re_internals = []
-        Re_externals = []
-        Re_internal_regimes = []
-        Re_external_regimes = []
-        Us = []
-        delta_T_lms = []
-        h_internals = []
-        h_externals = []
-
-        fluid_density = density.get(fluid.lower(), 1.0)
-        hot_fluid_density = density.get(hot_fluid.lower(), 1.0)
-        Cp_cold = specific_heat_capacity.get(fluid.lower(), 4186)
-        Cp_hot = specific_heat_capacity.get(hot_fluid.lower(), 4186)
-        m_dot_hot = (10 * hot_fluid_density) / 60  # Fixed hot flow rate: 10 L/min
-
-        external_pipe = {
-            "inter_diameter": pipe_properties["outer_diameter"] + gap,
-            "thickness": pipe_properties["thickness"],
-            "length": pipe_properties["length"]
-        }
-        validate_pipe_dimensions(pipe_properties, external_pipe)
-
-        Re_external = calculate_reynolds_number(hot_fluid, m_dot_hot, external_pipe["inter_diameter"])
-        Pr_external = calculate_prandtl_number(hot_fluid)
-        h_external = calculate_convection_coefficient(hot_fluid, external_pipe["inter_diameter"], Re_external, Pr_external)
-
-        for flow in flow_rates:
-            m_dot_cold = (flow * fluid_density) / 60
-            Re_internal = calculate_reynolds_number(fluid, m_dot_cold, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"])
-            Pr_internal = calculate_prandtl_number(fluid)
-            h_internal = calculate_convection_coefficient(fluid, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"], Re_internal, Pr_internal)
-            U = calculate_overall_heat_transfer_coefficient(pipe_properties, material, h_internal, h_external)
-
-            T_hot_out = T_hot_in - 10
-            T_cold_out_guess = T_cold_in + 10
-            for _ in range(5):
-                delta_T_lm = calculate_delta_T_lm(T_hot_in, T_hot_out, T_cold_in, T_cold_out_guess)
-                Q = U * A * delta_T_lm
-                T_cold_out_guess = T_cold_in + Q / (m_dot_cold * Cp_cold)
-            T_outs.append(T_cold_out_guess)
-            Qs.append(Q)
-            efficiencies.append(calculate_efficiency(Q, m_dot_cold, Cp_cold, T_hot_in, T_cold_in))
-            Re_internals.append(Re_internal)
-            Re_externals.append(Re_external)
-            Re_internal_regimes.append(interpret_reynolds_number(Re_internal))
-            Re_external_regimes.append(interpret_reynolds_number(Re_external))
-            Us.append(U)
-            delta_T_lms.append(delta_T_lm)
-            h_internals.append(h_internal)
-            h_externals.append(h_external)
-
-        return {
-            "flow_rates": flow_rates.tolist(),
-            "T_out": T_outs,
-            "Q": Qs,
-            "efficiency": efficiencies,
-            "U": Us,
-            "Re_internal": Re_internals,
-            "Re_external": Re_externals,
-            "Re_internal_regime": Re_internal_regimes,
-            "Re_external_regime": Re_external_regimes,
-            "delta_T_lm": delta_T_lms,
-            "h_internal": h_internals,
-            "h_external": h_externals,
-            "A": [A] * len(flow_rates)
-        }
+        # Fixed hot flow rate: 10 L/min
+        points = _solve_points(model, fluid, hot_fluid, material, flow_rates, 10, T_cold_in, T_hot_in, pipe_properties, gap, max_iter, tol, correlation, precision)
+        with profiling.span("simulate_tp1.results", "simulation"):
+            return sweep_results("TP1", {"flow_rates": flow_rates}, points, diagnostics,
+                                 profiles, T_cold_in, T_hot_in, arrays)
     except Exception as e:
         raise ValueError(f"Erreur lors de la simulation TP1 : {str(e)}")
 
-def simulate_tp2(fluid, hot_fluid, material, T_cold_in, flow_cold, T_hot_start, T_hot_end, T_hot_steps, pipe_properties, gap=0.01):
+@profiling.profiled("simulate_tp2", "simulation")
+def simulate_tp2(fluid, hot_fluid, material, T_cold_in, flow_cold, T_hot_start, T_hot_end, T_hot_steps, pipe_properties, gap=0.01, max_iter=5, tol=None, diagnostics=False, correlation=None, model=None, profiles=None, precision="float64", arrays=False):
     """
     Simulate TP2: Impact of hot fluid temperature on outlet temperature.
     
@@ -330,85 +887,33 @@ def simulate_tp2(fluid, hot_fluid, material, T_cold_in, flow_cold, T_hot_start,
         T_hot_steps (int): Number of temperature steps.
         pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
         gap (float): Gap between pipes (m).
+        max_iter (int): Maximum fixed-point iterations per point.
+        tol (float, optional): Stop iterating once the outlet temperature moves less than tol (°C).
+        diagnostics (bool): Add per-point "residual", "iterations" and "energy_balance_error".
+        correlation (str or dict, optional): Nusselt correlation(s), see solve_points.
+        model (model.ExchangerModel, optional): Keep the intermediate quantities between runs:
+            only those depending on inputs that changed since the last run are recomputed.
+        profiles (str or int, optional): Add "profiles", the axial temperature profiles of every
+            point ("analytic" or a number of float32 grid positions, see sweep_results).
+        precision (str): "float64", or "float32" for very large sweeps: half the memory and
+            bandwidth, float32 array columns (see solve_points). Not available with a model.
+        arrays (bool): Return NumPy array columns instead of lists (see sweep_results).
     
     Returns:
         dict: Simulation results including additional parameters for reporting.
+        Invalid points are NaN, flagged in "valid" and explained by "reason".
     """
     try:
-        A = calculate_outer_surface(pipe_properties)
         T_hot_ins = np.linspace(T_hot_start, T_hot_end, T_hot_steps)
-        T_outs = []
-        Qs = []
-        efficiencies = []
-        Re_internals = []
-        Re_externals = []
-        Re_internal_regimes = []
-        Re_external_regimes = []
-        Us = []
-        delta_T_lms = []
-        h_internals = []
-        h_externals = []
-
-        fluid_density = density.get(fluid.lower(), 1.0)
-        hot_fluid_density = density.get(hot_fluid.lower(), 1.0)
-        Cp_cold = specific_heat_capacity.get(fluid.lower(), 4186)
-        Cp_hot = specific_heat_capacity.get(hot_fluid.lower(), 4186)
-        m_dot_cold = (flow_cold * fluid_density) / 60
-        m_dot_hot = (10 * hot_fluid_density) / 60
-
-        external_pipe = {
-            "inter_diameter": pipe_properties["outer_diameter"] + gap,
-            "thickness": pipe_properties["thickness"],
-            "length": pipe_properties["length"]
-        }
-        validate_pipe_dimensions(pipe_properties, external_pipe)
-
-        Re_internal = calculate_reynolds_number(fluid, m_dot_cold, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"])
-        Pr_internal = calculate_prandtl_number(fluid)
-        h_internal = calculate_convection_coefficient(fluid, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"], Re_internal, Pr_internal)
-        Re_external = calculate_reynolds_number(hot_fluid, m_dot_hot, external_pipe["inter_diameter"])
-        Pr_external = calculate_prandtl_number(hot_fluid)
-        h_external = calculate_convection_coefficient(hot_fluid, external_pipe["inter_diameter"], Re_external, Pr_external)
-        U = calculate_overall_heat_transfer_coefficient(pipe_properties, material, h_internal, h_external)
-
-        for T_hot_in in T_hot_ins:
-            T_hot_out = T_hot_in - 10
-            T_cold_out_guess = T_cold_in + 10
-            for _ in range(5):
-                delta_T_lm = calculate_delta_T_lm(T_hot_in, T_hot_out, T_cold_in, T_cold_out_guess)
-                Q = U * A * delta_T_lm
-                T_cold_out_guess = T_cold_in + Q / (m_dot_cold * Cp_cold)
-            T_outs.append(T_cold_out_guess)
-            Qs.append(Q)
-            efficiencies.append(calculate_efficiency(Q, m_dot_cold, Cp_cold, T_hot_in, T_cold_in))
-            Re_internals.append(Re_internal)
-            Re_externals.append(Re_external)
-            Re_internal_regimes.append(interpret_reynolds_number(Re_internal))
-            Re_external_regimes.append(interpret_reynolds_number(Re_external))
-            Us.append(U)
-            delta_T_lms.append(delta_T_lm)
-            h_internals.append(h_internal)
-            h_externals.append(h_external)
-
-        return {
-            "T_hot_in": T_hot_ins.tolist(),
-            "T_out": T_outs,
-            "Q": Qs,
-            "efficiency": efficiencies,
-            "U": Us,
-            "Re_internal": Re_internals,
-            "Re_external": Re_externals,
-            "Re_internal_regime": Re_internal_regimes,
-            "Re_external_regime": Re_external_regimes,
-            "delta_T_lm": delta_T_lms,
-            "h_internal": h_internals,
-            "h_external": h_externals,
-            "A": [A] * len(T_hot_ins)
-        }
+        points = _solve_points(model, fluid, hot_fluid, material, flow_cold, 10, T_cold_in, T_hot_ins, pipe_properties, gap, max_iter, tol, correlation, precision)
+        with profiling.span("simulate_tp2.results", "simulation"):
+            return sweep_results("TP2", {"T_hot_in": T_hot_ins}, points, diagnostics,
+                                 profiles, T_cold_in, T_hot_ins, arrays)
     except Exception as e:
         raise ValueError(f"Erreur lors de la simulation TP2 : {str(e)}")
 
-def simulate_tp3(fluid, material, flow_cold, flow_hot, pipe_properties, gap=0.01):
+@profiling.profiled("simulate_tp3", "simulation")
+def simulate_tp3(fluid, material, flow_cold, flow_hot, pipe_properties, gap=0.01, max_iter=5, tol=None, diagnostics=False, correlation=None, hot_fluids=None, model=None, profiles=None, precision="float64", arrays=False):
     """
     Simulate TP3: Impact of hot fluid choice on outlet temperature.
     
@@ -419,88 +924,34 @@ def simulate_tp3(fluid, material, flow_cold, flow_hot, pipe_properties, gap=0.01
         flow_hot (float): Hot fluid flow rate (L/min).
         pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
         gap (float): Gap between pipes (m).
+        max_iter (int): Maximum fixed-point iterations per point.
+        tol (float, optional): Stop iterating once the outlet temperature moves less than tol (°C).
+        diagnostics (bool): Add per-point "residual", "iterations" and "energy_balance_error".
+        correlation (str or dict, optional): Nusselt correlation(s), see solve_points.
+        hot_fluids (list, optional): Hot fluids to compare, every fluid of the database by
+            default. Mixtures are allowed, e.g. ["water+glycol:0.2", "water+glycol:0.4"].
+        model (model.ExchangerModel, optional): Keep the intermediate quantities between runs:
+            only those depending on inputs that changed since the last run are recomputed.
+        profiles (str or int, optional): Add "profiles", the axial temperature profiles of every
+            point ("analytic" or a number of float32 grid positions, see sweep_results).
+        precision (str): "float64", or "float32" for very large sweeps: half the memory and
+            bandwidth, float32 array columns (see solve_points). Not available with a model.
+        arrays (bool): Return NumPy array columns instead of lists (see sweep_results).
     
     Returns:
         dict: Simulation results including additional parameters for reporting.
+        Invalid points are NaN, flagged in "valid" and explained by "reason".
     """
     try:
-        A = calculate_outer_surface(pipe_properties)
-        hot_fluids = list(specific_heat_capacity.keys())
-        T_outs = []
-        Qs = []
-        efficiencies = []
-        Re_internals = []
-        Re_externals = []
-        Re_internal_regimes = []
-        Re_external_regimes = []
-        Us = []
-        delta_T_lms = []
-        h_internals = []
-        h_externals = []
-
-        fluid_density = density.get(fluid.lower(), 1.0)
-        Cp_cold = specific_heat_capacity.get(fluid.lower(), 4186)
-        m_dot_cold = (flow_cold * fluid_density) / 60
-        T_hot_in = 80
-        T_cold_in = 20
-
-        external_pipe = {
-            "inter_diameter": pipe_properties["outer_diameter"] + gap,
-            "thickness": pipe_properties["thickness"],
-            "length": pipe_properties["length"]
-        }
-        validate_pipe_dimensions(pipe_properties, external_pipe)
-
-        Re_internal = calculate_reynolds_number(fluid, m_dot_cold, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"])
-        Pr_internal = calculate_prandtl_number(fluid)
-        h_internal = calculate_convection_coefficient(fluid, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"], Re_internal, Pr_internal)
-
-        for hot_fluid in hot_fluids:
-            hot_fluid_density = density.get(hot_fluid.lower(), 1.0)
-            Cp_hot = specific_heat_capacity.get(hot_fluid.lower(), 4186)
-            m_dot_hot = (flow_hot * hot_fluid_density) / 60
-            Re_external = calculate_reynolds_number(hot_fluid, m_dot_hot, external_pipe["inter_diameter"])
-            Pr_external = calculate_prandtl_number(hot_fluid)
-            h_external = calculate_convection_coefficient(hot_fluid, external_pipe["inter_diameter"], Re_external, Pr_external)
-            U = calculate_overall_heat_transfer_coefficient(pipe_properties, material, h_internal, h_external)
-
-            T_hot_out = T_hot_in - 10
-            T_cold_out_guess = T_cold_in + 10
-            for _ in range(5):
-                delta_T_lm = calculate_delta_T_lm(T_hot_in, T_hot_out, T_cold_in, T_cold_out_guess)
-                Q = U * A * delta_T_lm
-                T_cold_out_guess = T_cold_in + Q / (m_dot_cold * Cp_cold)
-            T_outs.append(T_cold_out_guess)
-            Qs.append(Q)
-            efficiencies.append(calculate_efficiency(Q, m_dot_cold, Cp_cold, T_hot_in, T_cold_in))
-            Re_internals.append(Re_internal)
-            Re_externals.append(Re_external)
-            Re_internal_regimes.append(interpret_reynolds_number(Re_internal))
-            Re_external_regimes.append(interpret_reynolds_number(Re_external))
-            Us.append(U)
-            delta_T_lms.append(delta_T_lm)
-            h_internals.append(h_internal)
-            h_externals.append(h_external)
-
-        return {
-            "hot_fluids": hot_fluids,
-            "T_out": T_outs,
-            "Q": Qs,
-            "efficiency": efficiencies,
-            "U": Us,
-            "Re_internal": Re_internals,
-            "Re_external": Re_externals,
-            "Re_internal_regime": Re_internal_regimes,
-            "Re_external_regime": Re_external_regimes,
-            "delta_T_lm": delta_T_lms,
-            "h_internal": h_internals,
-            "h_external": h_externals,
-            "A": [A] * len(hot_fluids)
-        }
+        hot_fluids = list(specific_heat_capacity.keys()) if hot_fluids is None else list(hot_fluids)
+        points = _solve_points(model, fluid, hot_fluids, material, flow_cold, flow_hot, 20, 80, pipe_properties, gap, max_iter, tol, correlation, precision)
+        with profiling.span("simulate_tp3.results", "simulation"):
+            return sweep_results("TP3", {"hot_fluids": hot_fluids}, points, diagnostics, profiles, 20, 80, arrays)
     except Exception as e:
         raise ValueError(f"Erreur lors de la simulation TP3 : {str(e)}")
 
-def simulate_tp4(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, dimension_type, dim_start, dim_end, dim_steps, gap=0.01):
+@profiling.profiled("simulate_tp4", "simulation")
+def simulate_tp4(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, dimension_type, dim_start, dim_end, dim_steps, gap=0.01, max_iter=5, tol=None, diagnostics=False, correlation=None, model=None, profiles=None, precision="float64", arrays=False):
     """
     Simulate TP4: Impact of pipe dimensions on outlet temperature.
     
@@ -517,88 +968,33 @@ def simulate_tp4(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_h
         dim_end (float): Ending dimension (m).
         dim_steps (int): Number of dimension steps.
         gap (float): Gap between pipes (m).
+        max_iter (int): Maximum fixed-point iterations per point.
+        tol (float, optional): Stop iterating once the outlet temperature moves less than tol (°C).
+        diagnostics (bool): Add per-point "residual", "iterations" and "energy_balance_error".
+        correlation (str or dict, optional): Nusselt correlation(s), see solve_points.
+        model (model.ExchangerModel, optional): Keep the intermediate quantities between runs:
+            only those depending on inputs that changed since the last run are recomputed.
+        profiles (str or int, optional): Add "profiles", the axial temperature profiles of every
+            point ("analytic" or a number of float32 grid positions, see sweep_results).
+        precision (str): "float64", or "float32" for very large sweeps: half the memory and
+            bandwidth, float32 array columns (see solve_points). Not available with a model.
+        arrays (bool): Return NumPy array columns instead of lists (see sweep_results).
     
     Returns:
         dict: Simulation results including additional parameters for reporting.
+        Invalid points are NaN, flagged in "valid" and explained by "reason".
     """
     try:
-        T_outs = []
-        Qs = []
-        efficiencies = []
-        Re_internals = []
-        Re_externals = []
-        Re_internal_regimes = []
-        Re_external_regimes = []
-        Us = []
-        delta_T_lms = []
-        h_internals = []
-        h_externals = []
-        As = []
-
-        fluid_density = density.get(fluid.lower(), 1.0)
-        hot_fluid_density = density.get(hot_fluid.lower(), 1.0)
-        Cp_cold = specific_heat_capacity.get(fluid.lower(), 4186)
-        Cp_hot = specific_heat_capacity.get(hot_fluid.lower(), 4186)
-        m_dot_cold = (flow_cold * fluid_density) / 60
-        m_dot_hot = (flow_hot * hot_fluid_density) / 60
-
         dims = np.linspace(dim_start, dim_end, dim_steps)
-        for dim in dims:
-            pipe_properties = {"outer_diameter": 0.1, "thickness": 0.005, "length": 2.0}
-            if dimension_type == "length":
-                pipe_properties["length"] = dim
-            else:
-                pipe_properties["outer_diameter"] = dim
-            A = calculate_outer_surface(pipe_properties)
-            external_pipe = {
-                "inter_diameter": pipe_properties["outer_diameter"] + gap,
-                "thickness": pipe_properties["thickness"],
-                "length": pipe_properties["length"]
-            }
-            validate_pipe_dimensions(pipe_properties, external_pipe)
-
-            Re_internal = calculate_reynolds_number(fluid, m_dot_cold, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"])
-            Pr_internal = calculate_prandtl_number(fluid)
-            h_internal = calculate_convection_coefficient(fluid, pipe_properties["outer_diameter"] - 2 * pipe_properties["thickness"], Re_internal, Pr_internal)
-            Re_external = calculate_reynolds_number(hot_fluid, m_dot_hot, external_pipe["inter_diameter"])
-            Pr_external = calculate_prandtl_number(hot_fluid)
-            h_external = calculate_convection_coefficient(hot_fluid, external_pipe["inter_diameter"], Re_external, Pr_external)
-            U = calculate_overall_heat_transfer_coefficient(pipe_properties, material, h_internal, h_external)
-
-            T_hot_out = T_hot_in - 10
-            T_cold_out_guess = T_cold_in + 10
-            for _ in range(5):
-                delta_T_lm = calculate_delta_T_lm(T_hot_in, T_hot_out, T_cold_in, T_cold_out_guess)
-                Q = U * A * delta_T_lm
-                T_cold_out_guess = T_cold_in + Q / (m_dot_cold * Cp_cold)
-            T_outs.append(T_cold_out_guess)
-            Qs.append(Q)
-            efficiencies.append(calculate_efficiency(Q, m_dot_cold, Cp_cold, T_hot_in, T_cold_in))
-            Re_internals.append(Re_internal)
-            Re_externals.append(Re_external)
-            Re_internal_regimes.append(interpret_reynolds_number(Re_internal))
-            Re_external_regimes.append(interpret_reynolds_number(Re_external))
-            Us.append(U)
-            delta_T_lms.append(delta_T_lm)
-            h_internals.append(h_internal)
-            h_externals.append(h_external)
-            As.append(A)
-
-        return {
-            "dimensions": dims.tolist(),
-            "T_out": T_outs,
-            "Q": Qs,
-            "efficiency": efficiencies,
-            "dimension_type": dimension_type,
-            "U": Us,
-            "Re_internal": Re_internals,
-            "Re_external": Re_externals,
-            "Re_internal_regime": Re_internal_regimes,
-            "Re_external_regime": Re_external_regimes,
-            "delta_T_lm": delta_T_lms,
-            "h_internal": h_internals,
-            "h_external": h_externals,
-            "A": As
-        }
+        pipe_properties = {"outer_diameter": 0.1, "thickness": 0.005, "length": 2.0}
+        if dimension_type == "length":
+            pipe_properties["length"] = dims
+        else:
+            pipe_properties["outer_diameter"] = dims
+        points = _solve_points(model, fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, pipe_properties, gap, max_iter, tol, correlation, precision)
+        with profiling.span("simulate_tp4.results", "simulation"):
+            results = sweep_results("TP4", {"dimensions": dims, "dimension_type": dimension_type}, points, diagnostics,
+                                    profiles, T_cold_in, T_hot_in, arrays)
+        return results
     except Exception as e:
-        raise ValueError(f"Erreur lors de la simulation TP4 : {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Erreur lors de la simulation TP4 : {str(e)}")
@@ -0,0 +1,253 @@
+#registry of Nusselt number correlations (array kernels)
+import contextlib
+import math
+import numpy as np
+
+# name -> {"function": f(Re, Pr, geometry) -> Nu, "kind": "tube" or "annulus", "description": str}
+# (plus "scale": (base name, factor) for the entries of scaled)
+NUSSELT_CORRELATIONS = {}
+
+DEFAULT_CORRELATION = "legacy"
+
+def register_correlation(name, kind="tube", description="", replace=False):
+    """
+    Decorator registering a Nusselt correlation.
+
+    The function receives arrays (Re, Pr) and a geometry dict with "diameter" (hydraulic
+    diameter, m), "length" (m), "heating" (True when the fluid is heated) and, for annulus
+    correlations, "diameter_ratio" (inner / outer diameter of the annulus). It must return
+    the Nusselt number with numpy operations only, so that whole batches are evaluated at once.
+
+    Args:
+        name (str): Name used to select the correlation.
+        kind (str): "tube" (pipe flow) or "annulus" (Re and h based on the annulus hydraulic diameter).
+        description (str): Short description (validity range, reference).
+        replace (bool): Overwrite a correlation already registered under this name.
+
+    Raises:
+        ValueError: If the kind is unknown, or if the name is taken by another function and replace is False.
+    """
+    if kind not in ("tube", "annulus"):
+        raise ValueError(f"Correlation kind must be 'tube' or 'annulus', not '{kind}'.")
+
+    def register(function):
+        existing = NUSSELT_CORRELATIONS.get(name)
+        if existing is not None and existing["function"] is not function and not replace:
+            raise ValueError(f"A Nusselt correlation named '{name}' is already registered (use replace=True or unregister_correlation).")
+        NUSSELT_CORRELATIONS[name] = {"function": function, "kind": kind, "description": description}
+        return function
+    return register
+
+def unregister_correlation(name):
+    """
+    Remove a registered correlation.
+
+    Args:
+        name (str): Correlation name.
+
+    Raises:
+        ValueError: If the correlation is not registered.
+    """
+    get_correlation(name)
+    del NUSSELT_CORRELATIONS[name]
+
+@contextlib.contextmanager
+def registered_correlation(name, function, kind="tube", description=""):
+    """
+    Context manager registering a correlation for the duration of a block.
+
+    Args:
+        name (str): Name used to select the correlation.
+        function (function): Correlation, see register_correlation.
+        kind (str): "tube" or "annulus".
+        description (str): Short description.
+
+    Yields:
+        str: The correlation name.
+    """
+    register_correlation(name, kind, description)(function)
+    try:
+        yield name
+    finally:
+        unregister_correlation(name)
+
+def get_correlation(name):
+    """
+    Registered correlation by name, or a registered correlation multiplied by a constant.
+
+    Args:
+        name (str or tuple): Correlation name, or (name, factor) for the correlation times factor
+            (e.g. a multiplier fitted to plant data); such pairs are not added to the registry.
+
+    Returns:
+        dict: "function", "kind" and "description".
+
+    Raises:
+        ValueError: If the correlation is not registered.
+    """
+    if isinstance(name, tuple):
+        base, factor = name
+        entry, factor = get_correlation(base), float(factor)
+        function = entry["function"]
+        return {"function": lambda Re, Pr, geometry: factor * function(Re, Pr, geometry), "kind": entry["kind"],
+                "description": f"{factor:.6g} x {base}"}
+    if name not in NUSSELT_CORRELATIONS:
+        raise ValueError(f"Unknown Nusselt correlation '{name}'. Available: {', '.join(sorted(NUSSELT_CORRELATIONS))}.")
+    return NUSSELT_CORRELATIONS[name]
+
+def available_correlations(kind=None):
+    """
+    Names of the registered correlations.
+
+    Args:
+        kind (str, optional): Only list "tube" or "annulus" correlations.
+
+    Returns:
+        list: Correlation names.
+    """
+    return sorted(name for name, entry in NUSSELT_CORRELATIONS.items() if kind is None or entry["kind"] == kind)
+
+def _float_array(x):
+    # float32 batches stay in single precision, anything else becomes float64
+    x = np.asarray(x)
+    return x if x.dtype.kind == "f" else x.astype(float)
+
+def nusselt(name, Re, Pr, geometry):
+    """
+    Evaluate a registered correlation.
+
+    Args:
+        name (str or tuple): Correlation name, or (name, factor), see get_correlation.
+        Re (float or array): Reynolds number.
+        Pr (float or array): Prandtl number.
+        geometry (dict): See register_correlation.
+
+    Returns:
+        numpy.ndarray: Nusselt number.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return get_correlation(name)["function"](_float_array(Re), _float_array(Pr), geometry)
+
+def smooth_step(x, low, high):
+    """
+    Quintic smooth step: 0 below low, 1 above high, continuous up to the second derivative.
+
+    Args:
+        x (array): Position.
+        low (float): Start of the transition.
+        high (float): End of the transition.
+
+    Returns:
+        numpy.ndarray: Weight in [0, 1].
+    """
+    t = np.clip((x - low) / (high - low), 0.0, 1.0)
+    return t ** 3 * (t * (6 * t - 15) + 10)
+
+def blend(name, laminar, turbulent, Re_low=2300.0, Re_high=10000.0, description=""):
+    """
+    Register a correlation switching smoothly from a laminar to a turbulent correlation.
+
+    The weight is a quintic smooth step in log(Re) between Re_low and Re_high, so the
+    result and its first two derivatives are continuous (no jump for optimizers or root
+    finders). Both correlations must be of the same kind.
+
+    Args:
+        name (str): Name of the new correlation.
+        laminar (str): Registered correlation used below Re_low.
+        turbulent (str): Registered correlation used above Re_high.
+        Re_low (float): Start of the transition.
+        Re_high (float): End of the transition.
+        description (str): Short description.
+
+    Returns:
+        function: The blended correlation.
+    """
+    kind = get_correlation(laminar)["kind"]
+    if get_correlation(turbulent)["kind"] != kind:
+        raise ValueError(f"Cannot blend a {kind} correlation with a {get_correlation(turbulent)['kind']} correlation.")
+    log_low, log_high = math.log(Re_low), math.log(Re_high)
+
+    def blended(Re, Pr, geometry):
+        weight = smooth_step(np.log(Re), log_low, log_high)
+        Nu_laminar = get_correlation(laminar)["function"](Re, Pr, geometry)
+        Nu_turbulent = get_correlation(turbulent)["function"](np.maximum(Re, Re_low), Pr, geometry)
+        return (1 - weight) * Nu_laminar + weight * Nu_turbulent
+
+    register_correlation(name, kind, description or f"{laminar} -> {turbulent} between Re = {Re_low:g} and {Re_high:g}")(blended)
+    return blended
+
+def scaled(name, factor):
+    """
+    Register a correlation multiplied by a constant (e.g. a multiplier fitted to plant data).
+
+    The name holds the exact factor, so calling scaled again with the same correlation and
+    factor reuses the registered entry.
+
+    Args:
+        name (str): Registered correlation.
+        factor (float): Multiplier of the Nusselt number.
+
+    Returns:
+        str: Name of the scaled correlation, "<name>*<factor>".
+
+    Raises:
+        ValueError: If the correlation is unknown, or if the scaled name is taken by another correlation.
+    """
+    factor = float(factor)
+    entry = get_correlation(name)
+    scaled_name = f"{name}*{factor!r}"
+    existing = NUSSELT_CORRELATIONS.get(scaled_name)
+    if existing is not None and existing.get("scale") == (name, factor):
+        return scaled_name
+    function = entry["function"]
+    register_correlation(scaled_name, entry["kind"], f"{factor:.6g} x {name}")(
+        lambda Re, Pr, geometry: factor * function(Re, Pr, geometry)
+    )
+    NUSSELT_CORRELATIONS[scaled_name]["scale"] = (name, factor)
+    return scaled_name
+
+# --- Built-in correlations -------------------------------------------------
+
+@register_correlation("legacy", description="3.66 below Re = 5000, 0.023 Re^0.8 Pr^0.33 above (historical model, discontinuous)")
+def _legacy(Re, Pr, geometry):
+    return np.where(Re < 5000, 3.66, 0.023 * (Re ** 0.8) * (Pr ** 0.33))
+
+@register_correlation("constant_wall_temperature", description="Fully developed laminar flow, Nu = 3.66")
+def _constant_wall_temperature(Re, Pr, geometry):
+    return np.full(np.broadcast_shapes(np.shape(Re), np.shape(Pr)), 3.66, dtype=np.result_type(Re, Pr))
+
+@register_correlation("hausen", description="Laminar, thermally developing flow (Hausen), Re < 2300")
+def _hausen(Re, Pr, geometry):
+    Gz = geometry["diameter"] / geometry["length"] * Re * Pr
+    return 3.66 + 0.0668 * Gz / (1 + 0.04 * Gz ** (2 / 3))
+
+@register_correlation("dittus_boelter", description="Turbulent, Re > 10^4, 0.6 < Pr < 160; Pr^0.4 heating, Pr^0.3 cooling")
+def _dittus_boelter(Re, Pr, geometry):
+    n = 0.4 if geometry.get("heating", True) else 0.3
+    return 0.023 * Re ** 0.8 * Pr ** n
+
+@register_correlation("sieder_tate", description="Turbulent, Re > 10^4, 0.7 < Pr < 16700 (wall viscosity correction taken as 1)")
+def _sieder_tate(Re, Pr, geometry):
+    return 0.027 * Re ** 0.8 * Pr ** (1 / 3)
+
+@register_correlation("gnielinski", description="Turbulent and transitional, 3000 < Re < 5e6, 0.5 < Pr < 2000")
+def _gnielinski(Re, Pr, geometry):
+    f = (0.79 * np.log(Re) - 1.64) ** -2
+    return (f / 8) * (Re - 1000) * Pr / (1 + 12.7 * np.sqrt(f / 8) * (Pr ** (2 / 3) - 1))
+
+# Laminar annulus, inner wall heated and outer wall insulated (Kays & Perkins)
+_ANNULUS_RATIOS = np.array([0.05, 0.10, 0.25, 0.50, 1.00])
+_ANNULUS_NU_INNER = np.array([17.46, 11.56, 7.37, 5.74, 4.86])
+
+@register_correlation("annulus_laminar", kind="annulus", description="Fully developed laminar annulus, heat exchanged at the inner wall")
+def _annulus_laminar(Re, Pr, geometry):
+    Nu = np.interp(geometry["diameter_ratio"], _ANNULUS_RATIOS, _ANNULUS_NU_INNER)
+    return np.broadcast_to(Nu, np.broadcast_shapes(np.shape(Re), np.shape(Pr), np.shape(Nu))).astype(np.result_type(Re, Pr))
+
+@register_correlation("annulus_gnielinski", kind="annulus", description="Turbulent annulus, heat exchanged at the inner wall (Gnielinski, F_ann = 0.75 a^-0.17)")
+def _annulus_gnielinski(Re, Pr, geometry):
+    return _gnielinski(Re, Pr, geometry) * 0.75 * geometry["diameter_ratio"] ** -0.17
+
+blend("smooth", "hausen", "gnielinski", description="Hausen below Re = 2300, Gnielinski above 10^4, smooth in between")
+blend("annulus_smooth", "annulus_laminar", "annulus_gnielinski",
+      description="Laminar annulus below Re = 2300, annulus Gnielinski above 10^4, smooth in between")
@@ -0,0 +1,173 @@
+#long-horizon fouling build-up and cleaning scenarios, stepped in time and streamed to disk
+import time
+import numpy as np
+import profiling
+from core import solve_points
+from replay import _record_dtype, _writer
+
+SCHEDULE_KEYS = ("flow_cold", "flow_hot", "T_cold_in", "T_hot_in")
+
+OUTPUT_DTYPE = np.dtype([
+    ("step", "<i8"),
+    ("time", "<f8"),                 # hours since the start of the horizon, at the beginning of the step
+    ("scenario", "<i4"),             # index in the cleaning list
+    ("fouling", "<f8"),              # m²·K/W during the step
+    ("online", "?"),                 # False while the exchanger is being cleaned
+    ("U", "<f8"),
+    ("T_out", "<f8"),
+    ("Q", "<f8"),
+    ("reason", "<i4"),               # see core.describe_reason
+])
+
+def kern_seaton(fouling, hours, asymptotic, time_constant):
+    """
+    Advance the Kern-Seaton fouling model dR/dt = (R_inf - R) / tau by a time step.
+
+    The step is exact (R tends to R_inf exponentially), so it does not depend on the
+    step size as long as R_inf and tau are constant over the step.
+
+    Args:
+        fouling (float or array): Fouling resistance at the beginning of the step (m²·K/W).
+        hours (float): Step (h).
+        asymptotic (float or array): Asymptotic fouling resistance R_inf (m²·K/W).
+        time_constant (float or array): Time constant tau (h).
+
+    Returns:
+        float or numpy.ndarray: Fouling resistance at the end of the step.
+    """
+    return asymptotic + (fouling - asymptotic) * np.exp(-hours / time_constant)
+
+def _cleanings_before(cleaning, times):
+    # Number of cleanings at or before each time (rows) of every scenario (columns)
+    counts = np.zeros((len(times), len(cleaning)), dtype=np.int64)
+    for scenario, plan in enumerate(cleaning):
+        if plan is None:
+            continue
+        if np.ndim(plan) == 0:
+            counts[:, scenario] = np.floor(np.maximum(times, 0) / plan)
+        else:
+            counts[:, scenario] = np.searchsorted(np.sort(np.asarray(plan, dtype=float)), times, side="right")
+    return counts
+
+def _per_step(value, steps):
+    return value[steps] if value.ndim else np.full(len(steps), float(value))
+
+@profiling.profiled("simulate_degradation", "degradation")
+def simulate_degradation(output_path, fluid, hot_fluid, material, pipe_properties, schedule, cleaning=(None,),
+                         asymptotic=5e-4, time_constant=500.0, initial_fouling=0.0, side="internal", time_step=1.0,
+                         steps=None, downtime=0.0, gap=0.01, chunk_steps=4096, max_iter=5, tol=None, correlation=None,
+                         precision="float64"):
+    """
+    Forecast the degradation of the exchanger as fouling builds up, for several cleaning
+    schedules at once, and stream the results to a file.
+
+    The fouling of every scenario is stepped with the Kern-Seaton model and reset to zero
+    at each cleaning; chunk_steps time steps of all the scenarios are then solved as one
+    (steps, scenarios) batch, so memory does not depend on the horizon.
+
+    Args:
+        output_path (str): Output file, ".npy" (binary records) or CSV, fields of OUTPUT_DTYPE,
+            one row per (step, scenario), step by step.
+        fluid (str): Cold fluid name.
+        hot_fluid (str): Hot fluid name.
+        material (str): Pipe material.
+        pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
+        schedule (dict): Operating conditions "flow_cold", "flow_hot" (L/min), "T_cold_in" and
+            "T_hot_in" (°C), each a constant or one value per time step.
+        cleaning (list): One entry per scenario: None (never cleaned), a cleaning interval (h)
+            or a list of cleaning times (h).
+        asymptotic (float or array): Asymptotic fouling resistance (m²·K/W), constant or per step.
+        time_constant (float or array): Fouling time constant (h), constant or per step.
+        initial_fouling (float): Fouling resistance at the start (m²·K/W).
+        side (str): Fouled surface, "internal" or "external".
+        time_step (float): Time step (h).
+        steps (int, optional): Number of steps, required only when the whole schedule is constant.
+        downtime (float): Hours offline after each cleaning (no heat delivered).
+        gap (float): Gap between pipes (m).
+        chunk_steps (int): Time steps per batch.
+        max_iter (int): Maximum fixed-point iterations per point.
+        tol (float, optional): Outlet iteration tolerance (°C).
+        correlation (str or dict, optional): Nusselt correlation(s), see core.solve_points.
+        precision (str): "float64", or "float32" to solve and store the records in single
+            precision; the energy totals are still accumulated in float64.
+
+    Returns:
+        dict: "steps", "scenarios", one array per scenario: "energy" (heat delivered while
+        online, kWh), "cleanings", "mean_Q" (W, online steps), "final_fouling" (m²·K/W), then
+        "best" (scenario delivering the most energy) and "points_per_second" (steps × scenarios).
+
+    Raises:
+        ValueError: If the side is unknown or the schedule lengths do not match.
+    """
+    if side not in ("internal", "external"):
+        raise ValueError("side must be 'internal' or 'external'.")
+    schedule = {key: np.asarray(schedule[key], dtype=float) for key in SCHEDULE_KEYS}
+    asymptotic, time_constant = np.asarray(asymptotic, dtype=float), np.asarray(time_constant, dtype=float)
+    lengths = {len(value) for value in (*schedule.values(), asymptotic, time_constant) if value.ndim}
+    if steps is None and len(lengths) == 1:
+        steps = lengths.pop()
+    elif steps is None or lengths - {steps}:
+        raise ValueError("The schedule arrays must all have one value per time step (give steps for a constant schedule).")
+
+    scenarios = len(cleaning)
+    fouling = np.full(scenarios, float(initial_fouling))
+    since_cleaning = np.full(scenarios, np.inf)
+    energy, online_steps, Q_sum = np.zeros(scenarios), np.zeros(scenarios, dtype=np.int64), np.zeros(scenarios)
+    cleanings = np.zeros(scenarios, dtype=np.int64)
+    dtype = _record_dtype(OUTPUT_DTYPE, precision)
+    writer = _writer(output_path, dtype)
+    start = time.perf_counter()
+    try:
+        for first in range(0, steps, chunk_steps):
+            step = np.arange(first, min(first + chunk_steps, steps))
+            times = step * time_step
+            cleaned = _cleanings_before(cleaning, times) > _cleanings_before(cleaning, times - time_step)
+            with profiling.span("degradation.fouling", "degradation"):
+                R_inf, tau = _per_step(asymptotic, step), _per_step(time_constant, step)
+                R = np.empty((len(step), scenarios))
+                online = np.empty((len(step), scenarios), dtype=bool)
+                for i in range(len(step)):
+                    fouling = np.where(cleaned[i], 0.0, fouling)
+                    since_cleaning = np.where(cleaned[i], 0.0, since_cleaning)
+                    R[i] = fouling
+                    online[i] = since_cleaning >= downtime
+                    fouling = kern_seaton(fouling, time_step, R_inf[i], tau[i])
+                    since_cleaning = since_cleaning + time_step
+            inputs = {key: _per_step(value, step)[:, None] for key, value in schedule.items()}
+            with profiling.span("degradation.solve", "degradation"):
+                points = solve_points(fluid, hot_fluid, material, inputs["flow_cold"], inputs["flow_hot"],
+                                      inputs["T_cold_in"], inputs["T_hot_in"], dict(pipe_properties, **{f"fouling_{side}": R}),
+                                      gap, max_iter, tol, correlation, precision)
+
+            records = np.empty(R.size, dtype=dtype)
+            records["step"] = np.repeat(step, scenarios)
+            records["time"] = np.repeat(times, scenarios)
+            records["scenario"] = np.tile(np.arange(scenarios), len(step))
+            records["fouling"] = R.ravel()
+            records["online"] = online.ravel()
+            for key in ("U", "T_out", "Q", "reason"):
+                records[key] = np.broadcast_to(points[key], R.shape).ravel()
+            with profiling.span("degradation.write", "degradation"):
+                writer.write(records)
+
+            delivered = online & points["valid"]
+            Q = np.where(delivered, points["Q"], 0.0).astype(float)
+            energy += Q.sum(axis=0) * time_step / 1000
+            Q_sum += Q.sum(axis=0)
+            online_steps += delivered.sum(axis=0)
+            cleanings += cleaned.sum(axis=0)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_Q = np.where(online_steps > 0, Q_sum / online_steps, np.nan)
+    return {
+        "steps": steps,
+        "scenarios": scenarios,
+        "energy": energy,
+        "cleanings": cleanings,
+        "mean_Q": mean_Q,
+        "final_fouling": fouling,
+        "best": int(np.argmax(energy)),
+        "points_per_second": steps * scenarios / elapsed if elapsed > 0 else float("inf"),
+    }
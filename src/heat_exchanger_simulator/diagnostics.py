@@ -0,0 +1,97 @@
+#convergence and energy-balance diagnostics of simulation results
+import numpy as np
+from core import describe_reason
+from profiles import AxialProfiles
+
+DIAGNOSTIC_KEYS = ("residual", "iterations", "energy_balance_error")
+
+def _column(results, key):
+    if key not in results:
+        raise ValueError(f"Results have no '{key}' column; run the simulation with diagnostics=True.")
+    return np.asarray(results[key], dtype=float)
+
+def summarize_diagnostics(results):
+    """
+    Summary statistics of the per-point diagnostics (invalid points are ignored).
+    
+    Args:
+        results (dict): Simulation results computed with diagnostics=True.
+    
+    Returns:
+        dict: For each diagnostic, its "min", "mean", "p95" and "max" over the points.
+    """
+    summary = {}
+    for key in DIAGNOSTIC_KEYS:
+        values = _column(results, key)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            summary[key] = {"min": np.nan, "mean": np.nan, "p95": np.nan, "max": np.nan}
+            continue
+        summary[key] = {
+            "min": float(values.min()),
+            "mean": float(values.mean()),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+        }
+    return summary
+
+def flag_points(results, max_residual=1e-3, max_energy_balance_error=0.05, max_iterations=None):
+    """
+    Flag the points whose diagnostics exceed the given limits.
+    
+    Args:
+        results (dict): Simulation results computed with diagnostics=True.
+        max_residual (float, optional): Largest accepted last-iteration change of T_out (°C).
+        max_energy_balance_error (float, optional): Largest accepted relative hot/cold duty mismatch.
+        max_iterations (int, optional): Flag points that needed more iterations than this.
+    
+    Returns:
+        numpy.ndarray: Boolean array, True for flagged (bad) points.
+    """
+    flags = np.zeros(len(results["T_out"]), dtype=bool)
+    if max_residual is not None:
+        flags |= ~(_column(results, "residual") <= max_residual)
+    if max_energy_balance_error is not None:
+        flags |= ~(_column(results, "energy_balance_error") <= max_energy_balance_error)
+    if max_iterations is not None:
+        flags |= _column(results, "iterations") > max_iterations
+    return flags
+
+def mask_results(results, keep):
+    """
+    Keep only some points of a result dict.
+    
+    Args:
+        results (dict): Simulation results.
+        keep (array-like): Boolean array, True for the points to keep (e.g., ~flag_points(results)).
+    
+    Returns:
+        dict: Copy of the results with every per-point column filtered; other entries are unchanged.
+    """
+    keep = np.asarray(keep, dtype=bool)
+    n_points = len(results["T_out"])
+    if keep.shape != (n_points,):
+        raise ValueError(f"Mask has shape {keep.shape}, expected ({n_points},).")
+    indices = np.flatnonzero(keep)
+    masked = {}
+    for key, value in results.items():
+        if isinstance(value, AxialProfiles):
+            masked[key] = value.take(indices)
+        elif isinstance(value, (list, np.ndarray)) and len(value) == n_points:
+            masked[key] = value[keep] if isinstance(value, np.ndarray) else [value[i] for i in indices]
+        else:
+            masked[key] = value
+    return masked
+
+def count_invalid(results):
+    """
+    Count the invalid points of a sweep per reason.
+    
+    Args:
+        results (dict): Simulation results with a "reason" column.
+    
+    Returns:
+        dict: Number of points per reason description (valid points are not counted).
+    """
+    codes, counts = np.unique(np.asarray(results["reason"], dtype=np.int64), return_counts=True)
+    return {describe_reason(code): int(count) for code, count in zip(codes, counts) if code != 0}
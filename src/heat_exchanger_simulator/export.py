@@ -0,0 +1,172 @@
+#pandas / Arrow views of simulation results and Parquet / Feather export
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import profiling
+from core import REGIMES, regime_codes
+from profiles import AxialProfiles
+
+# Text columns exported as categoricals: column -> Reynolds column the codes are derived from,
+# or None to encode the distinct values
+CATEGORICAL_COLUMNS = {"Re_internal_regime": "Re_internal", "Re_external_regime": "Re_external", "hot_fluids": None}
+
+def _pyarrow():
+    # pyarrow is only needed for Arrow, Parquet and Feather, not for to_dataframe
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Arrow, Parquet and Feather export need pyarrow (pip install pyarrow).") from None
+    return pyarrow
+
+def _columns(results):
+    # Per-point columns of a result dict (or fields of a record array) and the other entries
+    if isinstance(results, np.ndarray) and results.dtype.names:
+        return {name: results[name] for name in results.dtype.names}, {}
+    n_points = len(results["T_out"])
+    columns, metadata = {}, {}
+    for key, value in results.items():
+        if isinstance(value, AxialProfiles):
+            continue
+        if isinstance(value, (list, np.ndarray)) and len(value) == n_points:
+            columns[key] = value
+        elif isinstance(value, (str, int, float)):
+            metadata[key] = value
+    return columns, metadata
+
+def _encode(key, value, columns):
+    # (codes, categories) of a categorical column, None for the other columns
+    if key not in CATEGORICAL_COLUMNS:
+        return None
+    source = CATEGORICAL_COLUMNS[key]
+    if source is not None and source in columns:
+        return regime_codes(columns[source]), list(REGIMES)
+    categories, codes = np.unique(np.asarray(value), return_inverse=True)
+    return codes.astype(np.int32), categories.tolist()
+
+def to_dataframe(results):
+    """
+    Simulation results as a pandas DataFrame.
+
+    Array columns (sweeps run with arrays=True or precision="float32", record arrays
+    loaded from replay or degradation outputs) are wrapped without copying; list columns
+    are converted once. Flow regimes and hot fluid names become categoricals.
+
+    Args:
+        results (dict or numpy.ndarray): Result dict of a sweep, or a structured record array
+            (e.g. np.load("replay.npy", mmap_mode="r")).
+
+    Returns:
+        pandas.DataFrame: One row per point; entries that are not per-point columns
+        (e.g. "dimension_type") are kept in DataFrame.attrs.
+    """
+    columns, metadata = _columns(results)
+    data = {}
+    for key, value in columns.items():
+        encoded = _encode(key, value, columns)
+        data[key] = pd.Categorical.from_codes(*encoded) if encoded else value
+    frame = pd.DataFrame(data, copy=False)
+    frame.attrs.update(metadata)
+    return frame
+
+def to_arrow(results):
+    """
+    Simulation results as a pyarrow Table.
+
+    Contiguous numeric array columns are shared with the table (zero copy); boolean
+    columns are bit-packed and list columns converted. Flow regimes and hot fluid names
+    are dictionary-encoded.
+
+    Args:
+        results (dict or numpy.ndarray): Result dict of a sweep, or a structured record array.
+
+    Returns:
+        pyarrow.Table: One row per point; entries that are not per-point columns are stored
+        in the schema metadata.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    pa = _pyarrow()
+    columns, metadata = _columns(results)
+    arrays = {}
+    for key, value in columns.items():
+        encoded = _encode(key, value, columns)
+        if encoded:
+            arrays[key] = pa.DictionaryArray.from_arrays(pa.array(encoded[0]), pa.array(encoded[1], pa.string()))
+        else:
+            # Fields of a record array are strided views: Arrow needs them contiguous
+            arrays[key] = pa.array(np.ascontiguousarray(value) if isinstance(value, np.ndarray) else value)
+    table = pa.table(arrays)
+    return table.replace_schema_metadata({key: str(value) for key, value in metadata.items()}) if metadata else table
+
+def _format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix == ".parquet":
+        return "parquet"
+    if suffix in (".feather", ".arrow"):
+        return "feather"
+    raise ValueError(f"Unknown export format '{suffix}': use .parquet, .feather or .arrow.")
+
+@profiling.profiled("export_results", "export")
+def export_results(results, path, row_group_size=1 << 20, compression=None):
+    """
+    Write simulation results to a Parquet or Feather (Arrow IPC) file.
+
+    Args:
+        results (dict or numpy.ndarray): Result dict of a sweep, or a structured record array.
+        path (str): Output file, ".parquet", ".feather" or ".arrow".
+        row_group_size (int): Rows per Parquet row group.
+        compression (str, optional): Codec understood by pyarrow (e.g. "zstd", "lz4"), its default otherwise.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+        ImportError: If pyarrow is not installed.
+    """
+    file_format = _format(path)
+    table = to_arrow(results)
+    options = {} if compression is None else {"compression": compression}
+    if file_format == "parquet":
+        _pyarrow().parquet.write_table(table, path, row_group_size=row_group_size, **options)
+    else:
+        _pyarrow().feather.write_feather(table, path, **options)
+
+@profiling.profiled("export_records", "export")
+def export_records(input_path, output_path, chunk_rows=1 << 20, compression=None):
+    """
+    Convert a .npy record file of replay_historian or simulate_degradation to Parquet or
+    Feather, chunk by chunk: the input is memory-mapped, so files larger than memory work.
+
+    Args:
+        input_path (str): Structured .npy file.
+        output_path (str): Output file, ".parquet", ".feather" or ".arrow".
+        chunk_rows (int): Rows per chunk (one Parquet row group or Arrow record batch each).
+        compression (str, optional): Codec understood by pyarrow (e.g. "zstd", "lz4"), its default otherwise.
+
+    Returns:
+        dict: "rows" and "rows_per_second".
+
+    Raises:
+        ValueError: If the input is not a structured record file or the extension is not supported.
+        ImportError: If pyarrow is not installed.
+    """
+    file_format = _format(output_path)
+    pa = _pyarrow()
+    records = np.load(input_path, mmap_mode="r")
+    if not records.dtype.names:
+        raise ValueError(f"{input_path} does not hold records (fields), see replay.OUTPUT_DTYPE.")
+    options = {} if compression is None else {"compression": compression}
+    start = time.perf_counter()
+    schema = to_arrow(records[:0]).schema
+    if file_format == "parquet":
+        writer = pa.parquet.ParquetWriter(output_path, schema, **options)
+    else:
+        writer = pa.ipc.new_file(output_path, schema, options=pa.ipc.IpcWriteOptions(**options))
+    with writer:
+        for first in range(0, len(records), chunk_rows):
+            with profiling.span("export_records.chunk", "export"):
+                writer.write_table(to_arrow(records[first:first + chunk_rows]))
+    elapsed = time.perf_counter() - start
+    return {"rows": len(records), "rows_per_second": len(records) / elapsed if elapsed > 0 else float("inf")}
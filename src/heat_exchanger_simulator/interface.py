@@ -1,12 +1,78 @@
 import os
 from PIL import Image, ImageTk
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from concurrent.futures import ThreadPoolExecutor
 from core import simulate_tp1, simulate_tp2, simulate_tp3, simulate_tp4
+from catalog import load_pipe_catalog, pipe_preset
+from model import ExchangerModel
+from diagnostics import count_invalid
 from utils import specific_heat_capacity, thermal_conductivity
-from report import write_tex
-from plotting import generate_plot
-from pathlib import Path
+from report import generate_report
+from registry import RunRegistry
+from plotting import draw_results
+from simulation import animate_exchanger, exchanger_state
+import profiling
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+REPORT_FORMATS = {
+    "PDF (LaTeX)": "latex",
+    "PDF": "pdf",
+    "HTML": "html"
+}
+
+class ReportQueue:
+    """
+    Generate reports in background threads so the GUI stays responsive.
+    Completed jobs are collected from the Tk event loop and passed to a callback.
+    """
+    def __init__(self, window, on_done, max_workers=2, poll_ms=200):
+        """
+        Args:
+            window: Tk root window (used to schedule polling).
+            on_done: Function called with (name, report, error) when a job finishes.
+            max_workers (int): Number of reports built in parallel.
+            poll_ms (int): Polling interval (ms).
+        """
+        self.window = window
+        self.on_done = on_done
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.jobs = []
+
+    @property
+    def pending(self):
+        """int: Number of reports not finished yet."""
+        return len(self.jobs)
+
+    def submit(self, tp_name, results, params, output_dir, name, backend):
+        """
+        Queue a report for generation.
+
+        Args:
+            tp_name (str): Name of the TP.
+            results (dict): Simulation results.
+            params (dict): Simulation parameters.
+            output_dir (str): Output directory.
+            name (str): Base filename of the report.
+            backend (str): Report backend ("latex", "pdf" or "html").
+        """
+        future = self.executor.submit(generate_report, tp_name, results, dict(params), output_dir, name, backend)
+        self.jobs.append((name, future))
+        if len(self.jobs) == 1:
+            self.window.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        finished = [(name, future) for name, future in self.jobs if future.done()]
+        self.jobs = [job for job in self.jobs if not job[1].done()]
+        for name, future in finished:
+            try:
+                self.on_done(name, future.result(), None)
+            except Exception as e:
+                self.on_done(name, None, e)
+        if self.jobs:
+            self.window.after(self.poll_ms, self._poll)
 
 class HeatExchangerSimulator:
     def __init__(self):
@@ -16,6 +82,13 @@ class HeatExchangerSimulator:
         self.window.title("Heat Exchanger Simulator")
         self.window.geometry(f"{self.dim_x}x{self.dim_y}")
         self.window.configure(bg="#EEEEEE")
+        self.result_window = None
+        self.result_figure = None
+        self.result_canvas = None
+        self.result_toolbar = None
+        self.report_status = None
+        self.report_queue = ReportQueue(self.window, self.report_finished)
+        self.registry = None  # opened on the first run (see record_run)
 
         style = ttk.Style()
         style.configure("TButton", font=("Segoe UI", 12, "bold"), padding=10, background="#003087")
@@ -91,31 +164,48 @@ class HeatExchangerSimulator:
         entry.pack(side="right", padx=5, fill="x", expand=True)
         return entry
 
-    def draw_exchanger(self, canvas, params):
+    @profiling.profiled("gui.draw_exchanger", "gui")
+    def draw_exchanger(self, canvas, state):
         """
-        Draw the heat exchanger schematic on the canvas.
+        Animate the heat exchanger (temperature profiles and flow directions) on the canvas.
         
         Args:
-            canvas: Tkinter Canvas widget.
-            params (dict): Parameters to display on the schematic.
+            canvas: FigureCanvasTkAgg of the TP window.
+            state (dict): Operating point, see simulation.exchanger_state (None for an empty view).
+        """
+        if getattr(canvas, "animation", None) is None:
+            canvas.animation = animate_exchanger(canvas, state)
+        else:
+            canvas.animation.set_state(state)
+
+    def preview_state(self, params):
         """
-        canvas.delete("all")
+        Operating point shown before the first run, from the default fields of the TP window.
+        
+        Args:
+            params (dict): Field values (strings, "Varies" for swept ones).
+        
+        Returns:
+            dict: See simulation.exchanger_state, None if the fields do not describe a valid point.
+        """
+        def number(key, default):
+            try:
+                return float(params.get(key))
+            except (TypeError, ValueError):
+                return default
+        thickness = 0.005
         try:
-            img_path = os.path.join(os.path.dirname(__file__), "exchanger.png")
-            img = Image.open(img_path)
-            img = img.resize((400, 300), Image.Resampling.LANCZOS)
-            canvas.image = ImageTk.PhotoImage(img)
-            canvas.create_image(200, 150, image=canvas.image)
-        except Exception as e:
-            print(f"Erreur de chargement de l'image : {e}")
-            canvas.create_rectangle(100, 100, 300, 200, outline="black", width=2)
-            canvas.create_line(50, 150, 100, 150, arrow=tk.LAST)
-            canvas.create_line(300, 150, 350, 150, arrow=tk.LAST)
-            canvas.create_line(350, 120, 100, 120, arrow=tk.LAST)
-            canvas.create_text(50, 130, text=f"T_in: {params.get('T_cold_in', '')}°C", anchor="e")
-            canvas.create_text(350, 130, text=f"T_out: ?", anchor="w")
-            canvas.create_text(200, 80, text=f"Hot Fluid: {params.get('hot_fluid', '')}, T_hot: {params.get('T_hot_in', '')}°C")
-            canvas.create_text(200, 220, text=f"Pipe: {params.get('material', '')}, L={params.get('length', '')}m, D={params.get('diameter', '')}m")
+            model = ExchangerModel(
+                fluid="water", hot_fluid=params.get("hot_fluid") if params.get("hot_fluid") != "Multiple" else "water",
+                material=params.get("material") or "stainless steel",
+                pipe_properties={"outer_diameter": number("diameter", 0.1) + 2 * thickness, "thickness": thickness,
+                                 "length": number("length", 2.0)},
+                gap=number("gap", 0.01), flow_cold=10.0, flow_hot=10.0,
+                T_cold_in=number("T_cold_in", 20.0), T_hot_in=number("T_hot_in", 80.0)
+            )
+            return exchanger_state(model)
+        except Exception:
+            return None
 
     def run_simulation(self, progress_bar, callback):
         """
@@ -136,6 +226,110 @@ class HeatExchangerSimulator:
                 callback()
         update_progress()
 
+    @profiling.profiled("gui.show_results", "gui")
+    def show_results(self, tp_name, results):
+        """
+        Display the results in an embedded Matplotlib canvas with pan/zoom toolbar.
+        The result window and canvas are created once and redrawn in place on later runs.
+        
+        Args:
+            tp_name (str): Name of the TP (e.g., "TP1").
+            results (dict): Simulation results.
+        """
+        if self.result_window is None or not self.result_window.winfo_exists():
+            self.result_window = tk.Toplevel(self.window)
+            self.result_figure = Figure(figsize=(6, 4), dpi=100)
+            self.result_figure.add_subplot()
+            self.result_canvas = FigureCanvasTkAgg(self.result_figure, master=self.result_window)
+            self.result_toolbar = NavigationToolbar2Tk(self.result_canvas, self.result_window)
+            self.result_canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+        self.result_window.title(f"{tp_name} Results")
+        draw_results(self.result_figure.axes[0], tp_name, results)
+        self.result_figure.tight_layout()
+        self.result_toolbar.update()  # Reset the pan/zoom history to the new data
+        self.result_canvas.draw_idle()
+        self.result_window.lift()
+
+    def record_run(self, tp_name, params, results):
+        """
+        Save a run in the run registry (registry.default_path), with its full results.
+        A failure does not interrupt the GUI, it is only notified.
+        
+        Args:
+            tp_name (str): Name of the TP (e.g., "TP1").
+            params (dict): Parameters of the run.
+            results (dict): Simulation results.
+        """
+        try:
+            if self.registry is None:
+                self.registry = RunRegistry()
+            self.registry.register(tp_name, params, results)
+        except Exception as e:
+            self.notify("Run not saved", str(e))
+
+    def notify(self, title, message, duration_ms=5000):
+        """
+        Show a non-blocking notification in the bottom-right corner of the main window.
+        
+        Args:
+            title (str): Notification title.
+            message (str): Notification text.
+            duration_ms (int): Time before the notification closes (ms).
+        """
+        toast = tk.Toplevel(self.window)
+        toast.overrideredirect(True)
+        toast.configure(bg="#003087")
+        tk.Label(toast, text=title, font=("Segoe UI", 11, "bold"), fg="white", bg="#003087").pack(anchor="w", padx=10, pady=(8, 0))
+        tk.Label(toast, text=message, font=("Segoe UI", 10), fg="white", bg="#003087", wraplength=320, justify="left").pack(anchor="w", padx=10, pady=(0, 8))
+        toast.update_idletasks()
+        x = self.window.winfo_rootx() + self.window.winfo_width() - toast.winfo_width() - 20
+        y = self.window.winfo_rooty() + self.window.winfo_height() - toast.winfo_height() - 20
+        toast.geometry(f"+{x}+{y}")
+        toast.after(duration_ms, toast.destroy)
+
+    def update_report_status(self):
+        """
+        Refresh the label showing how many reports are being generated.
+        """
+        if self.report_status is not None and self.report_status.winfo_exists():
+            pending = self.report_queue.pending
+            self.report_status["text"] = f"{pending} report(s) in progress" if pending else ""
+
+    def report_finished(self, name, report, error):
+        """
+        Called by the report queue when a report is done.
+        
+        Args:
+            name (str): Report name.
+            report (dict): Paths returned by generate_report, or None on failure.
+            error (Exception): Error raised by the generation, or None.
+        """
+        self.update_report_status()
+        if error is None:
+            self.notify("Report ready", f"{name}: {report['path']}")
+        else:
+            messagebox.showerror("Error", f"Failure of the report generation ({name}) : {str(error)}")
+
+    def request_report(self, tp_name, results, params, backend):
+        """
+        Ask for the report name and folder, then queue the report in the background.
+        
+        Args:
+            tp_name (str): Name of the TP.
+            results (dict): Simulation results.
+            params (dict): Simulation parameters.
+            backend (str): Report backend ("latex", "pdf" or "html").
+        """
+        name = simpledialog.askstring("Nom du fichier", "Entrez le nom du fichier (sans extension) :", parent=self.window)
+        if not name:
+            return
+        output_dir = filedialog.asksaveasfilename(parent=self.window, title=f"Select Output Directory for {tp_name} Report")
+        if not output_dir:
+            messagebox.showinfo("cancel", "The repport was not generated.")
+            return
+        self.report_queue.submit(tp_name, results, params, output_dir, name, backend)
+        self.update_report_status()
+
     def create_main_window(self):
         """
         Create the main window for selecting a TP.
@@ -268,8 +462,24 @@ class HeatExchangerSimulator:
             else:
                 entries[field_name] = self.create_entry(params_frame, f"{field_name.replace('_', ' ').title()}:", default)
 
-        canvas = tk.Canvas(main_frame, bg="#EEEEEE")
-        canvas.grid(row=0, column=1, sticky="nsew", padx=10)
+        if "pipe_diameter" in entries and "pipe_thickness" in entries:
+            # Standard pipe sizes fill the diameter (inner) and thickness fields
+            catalog = load_pipe_catalog()
+            preset = self.create_dropdown(params_frame, "Pipe Preset:", ("Custom",) + catalog["names"], "Custom")
+
+            def apply_preset(*_):
+                if preset.get() not in catalog["names"]:
+                    return
+                pipe = pipe_preset(preset.get())
+                for field_name, value in (("pipe_diameter", pipe["outer_diameter"] - 2 * pipe["thickness"]),
+                                          ("pipe_thickness", pipe["thickness"])):
+                    entries[field_name].delete(0, tk.END)
+                    entries[field_name].insert(0, f"{value:.5g}")
+                    entries[field_name].config(foreground="black")
+            preset.trace_add("write", apply_preset)
+
+        canvas = FigureCanvasTkAgg(Figure(figsize=(4, 3.5), dpi=100), master=main_frame)
+        canvas.get_tk_widget().grid(row=0, column=1, sticky="nsew", padx=10)
         canvas_params = {
             "T_cold_in": entries.get("T_cold_in", tk.Entry()).get() or "20",
             "hot_fluid": entries.get("hot_fluid", tk.StringVar(value="water")).get() or "Multiple" if tp_name == "TP3" else "water",
@@ -279,7 +489,7 @@ class HeatExchangerSimulator:
             "diameter": entries.get("pipe_diameter", tk.Entry()).get() or "Varies" if tp_name == "TP4" and entries.get("dimension_type", tk.StringVar()).get() == "diameter" else "0.1",
             "gap": entries.get("gap", tk.Entry()).get() or "0.01"
         }
-        self.draw_exchanger(canvas, canvas_params)
+        self.draw_exchanger(canvas, self.preview_state(canvas_params))
 
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=0, column=2, sticky="nsew", padx=10)
@@ -288,6 +498,8 @@ class HeatExchangerSimulator:
         progress_bar.pack(pady=20)
 
         results = {}
+        # Intermediate quantities kept between runs: changing one field only recomputes what depends on it
+        model = ExchangerModel()
 
         def validate_inputs():
             """
@@ -355,6 +567,7 @@ class HeatExchangerSimulator:
                     if key in params:
                         params[key] = int(params[key])
 
+                @profiling.profiled("gui.run_sim_callback", "gui")
                 def callback():
                     nonlocal results
                     try:
@@ -363,20 +576,20 @@ class HeatExchangerSimulator:
                                 params["fluid"], params["hot_fluid"], params["material"],
                                 params["T_cold_in"], params["T_hot_in"],
                                 params["flow_start"], params["flow_end"], params["flow_steps"],
-                                params["pipe_properties"], params["gap"]
+                                params["pipe_properties"], params["gap"], model=model
                             )
                         elif tp_name == "TP2":
                             results = simulate_tp2(
                                 params["fluid"], params["hot_fluid"], params["material"],
                                 params["T_cold_in"], params["flow_cold"],
                                 params["T_hot_start"], params["T_hot_end"], params["T_hot_steps"],
-                                params["pipe_properties"], params["gap"]
+                                params["pipe_properties"], params["gap"], model=model
                             )
                         elif tp_name == "TP3":
                             results = simulate_tp3(
                                 params["fluid"], params["material"],
                                 params["flow_cold"], params["flow_hot"],
-                                params["pipe_properties"], params["gap"]
+                                params["pipe_properties"], params["gap"], model=model
                             )
                         elif tp_name == "TP4":
                             results = simulate_tp4(
@@ -384,19 +597,18 @@ class HeatExchangerSimulator:
                                 params["flow_cold"], params["flow_hot"],
                                 params["T_cold_in"], params["T_hot_in"],
                                 params["dimension_type"], params["dim_start"], params["dim_end"], params["dim_steps"],
-                                params["gap"]
+                                params["gap"], model=model
                             )
-                        output_dir = Path("temp_plots")
-                        output_dir.mkdir(exist_ok=True)
-                        plot_path = generate_plot(tp_name, results, output_dir=output_dir)
-                        img = Image.open(plot_path)
-                        img = img.resize((600, 400), Image.Resampling.LANCZOS)
-                        img_tk = ImageTk.PhotoImage(img)
-                        plt_window = tk.Toplevel()
-                        plt_window.title(f"{tp_name} Results")
-                        tk.Label(plt_window, image=img_tk).pack()
-                        plt_window.image = img_tk
+                        self.show_results(tp_name, results)
+                        self.draw_exchanger(canvas, exchanger_state(model))
+                        self.record_run(tp_name, params, results)
                         download_button["state"] = "normal"
+                        invalid = count_invalid(results)
+                        if invalid:
+                            self.notify(
+                                f"{sum(invalid.values())} of {len(results['T_out'])} points skipped",
+                                "\n".join(f"{count} × {reason}" for reason, count in invalid.items())
+                            )
                     except Exception as e:
                         messagebox.showerror("Erreur", f"Erreur lors de la simulation : {str(e)}")
                 
@@ -409,16 +621,17 @@ class HeatExchangerSimulator:
             Generate and download the report for the simulation.
             """
             if results:
-                try:
-                    write_tex(tp_name, results, {
-                        field_name: entries[field_name].get() for field_name, _, _, _ in fields
-                    })
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failure of the report generation : {str(e)}")
+                self.request_report(tp_name, results, {
+                    field_name: entries[field_name].get() for field_name, _, _, _ in fields
+                }, REPORT_FORMATS[report_format.get()])
 
         ttk.Button(button_frame, text="Run Simulation", command=run_sim).pack(pady=10)
+        report_format = self.create_dropdown(button_frame, "Format:", REPORT_FORMATS.keys(), "PDF (LaTeX)", width=12)
         download_button = ttk.Button(button_frame, text="Download Report", command=download_report, state="disabled")
         download_button.pack(pady=10)
+        self.report_status = ttk.Label(button_frame, text="")
+        self.report_status.pack(pady=5)
+        self.update_report_status()
         ttk.Button(button_frame, text="Another TP", command=lambda: self.create_main_window()).pack(pady=10)
 
         main_frame.columnconfigure(0, weight=1)
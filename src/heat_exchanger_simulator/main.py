@@ -1,6 +1,22 @@
+import os
+import atexit
+import profiling
 from interface import HeatExchangerSimulator
 
+def export_profile(trace_path):
+    """Write the Chrome trace and print the stage summary when the application exits."""
+    tracer = profiling.disable()
+    if tracer is not None:
+        tracer.export_chrome_trace(trace_path)
+        print(tracer.summary())
+        print(f"Chrome trace written to {trace_path}")
+
 if __name__ == "__main__":
     """Entry point for the Heat Exchanger Simulator application."""
+    # Opt-in profiling: HX_PROFILE=trace.json python main.py
+    trace_path = os.environ.get("HX_PROFILE")
+    if trace_path:
+        profiling.enable()
+        atexit.register(export_profile, trace_path)
     app = HeatExchangerSimulator()
-    app.create_main_window()
\ No newline at end of file
+    app.create_main_window()
@@ -0,0 +1,116 @@
+#binary fluid mixtures ("water+glycol:0.35"), properties memoized per composition
+import functools
+import numpy as np
+from properties import load_database, property_at
+
+def is_mixture(name):
+    """True if the fluid name describes a mixture ("base+additive:fraction")."""
+    return "+" in name
+
+def parse_mixture(name):
+    """
+    Split a mixture name into its components.
+
+    Args:
+        name (str): "base+additive:fraction", the fraction being the additive mass fraction
+            (0.35 or 35%), e.g. "water+glycol:0.35".
+
+    Returns:
+        tuple: (base, additive, fraction).
+
+    Raises:
+        ValueError: If the name is malformed, a component is unknown or the fraction is not in [0, 1].
+    """
+    components, _, fraction = name.lower().partition(":")
+    base, _, additive = (component.strip() for component in components.partition("+"))
+    try:
+        fraction = fraction.strip()
+        fraction = float(fraction[:-1]) / 100 if fraction.endswith("%") else float(fraction)
+    except ValueError:
+        raise ValueError(f"Mixture '{name}' must be written 'base+additive:fraction', e.g. 'water+glycol:0.35'.")
+    if not base or not additive or "+" in additive:
+        raise ValueError(f"Mixture '{name}' must have exactly two components.")
+    if not 0 <= fraction <= 1:
+        raise ValueError(f"Mixture '{name}': the additive fraction must be between 0 and 1.")
+    fluids = load_database()["fluids"].tolist()
+    for component in (base, additive):
+        if component not in fluids:
+            raise ValueError(f"Mixture '{name}': unknown fluid '{component}'.")
+    return base, additive, fraction
+
+def mixing_rules(base, additive, fraction):
+    """
+    Mixture properties from the pure-component properties.
+
+    cp is mass weighted, the density assumes additive volumes, the viscosity is
+    interpolated in log (Arrhenius, with mass fractions) and the thermal conductivity
+    follows Filippov's rule.
+
+    Args:
+        base (dict): "cp", "rho", "mu" and "k" of the base fluid (floats or arrays).
+        additive (dict): Same for the additive.
+        fraction (float): Additive mass fraction.
+
+    Returns:
+        dict: "cp", "rho", "mu" and "k" of the mixture.
+    """
+    w = fraction
+    return {
+        "cp": (1 - w) * base["cp"] + w * additive["cp"],
+        "rho": 1 / ((1 - w) / base["rho"] + w / additive["rho"]),
+        "mu": np.exp((1 - w) * np.log(base["mu"]) + w * np.log(additive["mu"])),
+        "k": (1 - w) * base["k"] + w * additive["k"] - 0.72 * w * (1 - w) * np.abs(additive["k"] - base["k"]),
+    }
+
+_KEYS = {"cp": "specific_heat_capacity", "rho": "density", "mu": "viscosity", "k": "thermal_conductivity"}
+
+def _component(name, temperatures):
+    if temperatures is None:
+        database = load_database()
+        index = database["fluids"].tolist().index(name)
+        return {key: float(database[prop][index]) for key, prop in _KEYS.items()}
+    return {key: property_at(name, prop, np.array(temperatures)) for key, prop in _KEYS.items()}
+
+@functools.lru_cache(maxsize=1024)
+def _mixture_properties(base, additive, fraction, temperatures):
+    pure_base, pure_additive = _component(base, temperatures), _component(additive, temperatures)
+    properties = mixing_rules(pure_base, pure_additive, fraction)
+    database = load_database()
+    pairs = database["mixtures"].tolist()
+    if temperatures is None and f"{base}+{additive}" in pairs:
+        # Tabulated data, with the pure components at both ends; viscosity interpolated in log
+        index = pairs.index(f"{base}+{additive}")
+        start, end = database["mixture_offsets"][index], database["mixture_offsets"][index + 1]
+        fractions = np.concatenate(([0.0], database["mixture_fraction"][start:end], [1.0]))
+        for key, prop in _KEYS.items():
+            values = np.concatenate(([pure_base[key]], database[f"mixture_{prop}"][start:end], [pure_additive[key]]))
+            if key == "mu":
+                properties[key] = float(np.exp(np.interp(fraction, fractions, np.log(values))))
+            else:
+                properties[key] = float(np.interp(fraction, fractions, values))
+    if temperatures is None:
+        return {key: float(value) for key, value in properties.items()}
+    for value in properties.values():
+        value.flags.writeable = False
+    return properties
+
+def mixture_properties(name, temperatures=None):
+    """
+    Properties of a binary mixture, computed once per composition and temperature grid.
+
+    At the reference state (temperatures=None, the state used by the simulations) a
+    tabulated mixture (data/mixtures.csv) is interpolated in fraction; other pairs, and
+    temperature grids, use the mixing rules on the pure components.
+
+    Args:
+        name (str): Mixture name, see parse_mixture.
+        temperatures (float or sequence, optional): Temperature grid (°C).
+
+    Returns:
+        dict: "cp" (J/kg·K), "rho" (kg/L), "mu" (Pa·s) and "k" (W/m·K), floats at the
+        reference state, read-only arrays on a temperature grid.
+    """
+    base, additive, fraction = parse_mixture(name)
+    if temperatures is not None:
+        temperatures = tuple(np.atleast_1d(np.asarray(temperatures, dtype=float)).tolist())
+    return dict(_mixture_properties(base, additive, fraction, temperatures))
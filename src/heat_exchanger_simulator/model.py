@@ -0,0 +1,194 @@
+#dependency graph of the double-pipe model: memoized nodes, lazy evaluation, incremental updates
+from collections import Counter
+from collections.abc import Mapping
+import numpy as np
+import profiling
+from core import (fluid_properties, material_properties, validate_points, wall_resistance, _resolve_correlations,
+                  _internal_side, _external_side, _overall_coefficient, _pressure_drops, _outlet)
+
+def _same(a, b):
+    if a is b:
+        return True
+    if isinstance(a, dict) or isinstance(b, dict):
+        return isinstance(a, dict) and isinstance(b, dict) and a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    try:
+        return np.shape(a) == np.shape(b) and bool(np.all(np.asarray(a) == np.asarray(b)))
+    except (TypeError, ValueError):
+        return False
+
+class DependencyGraph:
+    """
+    Memoized nodes computed from inputs and from other nodes.
+
+    A node is only evaluated when it (or a node depending on it) is read, and its value is
+    kept until one of the inputs it depends on changes: set() invalidates the nodes
+    downstream of the changed inputs only.
+    """
+    def __init__(self):
+        self.inputs = {}
+        self.nodes = {}        # producer -> (function, dependencies, output names)
+        self.producers = {}    # output name -> producer
+        self.dependents = {}   # name -> names of the producers reading it
+        self.values = {}
+        self.evaluations = Counter()  # value name -> number of times it was computed
+
+    def node(self, outputs, function, dependencies):
+        """
+        Add a node.
+
+        Args:
+            outputs (str or tuple): Name of the value, or names of the values returned as a tuple.
+            function: Called with the values of the dependencies, in order.
+            dependencies (list): Names of inputs or of other nodes' outputs.
+        """
+        names = (outputs,) if isinstance(outputs, str) else tuple(outputs)
+        self.nodes[names[0]] = (function, tuple(dependencies), names)
+        for name in names:
+            self.producers[name] = names[0]
+        for dependency in dependencies:
+            self.dependents.setdefault(dependency, set()).add(names[0])
+
+    def set(self, **values):
+        """
+        Change inputs; the nodes depending on the changed ones are invalidated.
+
+        Returns:
+            set: Names of the invalidated values.
+        """
+        changed = [name for name, value in values.items() if name not in self.inputs or not _same(self.inputs[name], value)]
+        for name in changed:
+            self.inputs[name] = values[name]
+        stale = self.downstream(changed)
+        for name in stale:
+            self.values.pop(name, None)
+        return stale
+
+    def downstream(self, names):
+        """Names of every value computed (directly or not) from the given names."""
+        stale, pending = set(), list(names)
+        while pending:
+            for producer in self.dependents.get(pending.pop(), ()):
+                outputs = self.nodes[producer][2]
+                if outputs[0] not in stale:
+                    stale.update(outputs)
+                    pending.extend(outputs)
+        return stale
+
+    def __getitem__(self, name):
+        if name in self.inputs:
+            return self.inputs[name]
+        if name not in self.values:
+            if name not in self.producers:
+                raise KeyError(name)
+            self._evaluate(self.producers[name])
+        return self.values[name]
+
+    def _evaluate(self, producer):
+        function, dependencies, outputs = self.nodes[producer]
+        arguments = [self[dependency] for dependency in dependencies]
+        result = function(*arguments)
+        self.evaluations.update(outputs)
+        self.values.update(zip(outputs, result) if len(outputs) > 1 else [(producer, result)])
+
+class ExchangerModel(DependencyGraph):
+    """
+    Double-pipe model of solve_points expressed as a dependency graph:
+    inputs -> properties -> Re, h -> U -> ΔT_lm, Q -> T_out (and pressure drops, validity).
+
+    Changing only T_hot_in keeps the Reynolds numbers, convection coefficients, U and
+    pressure drops of the previous evaluation; only the validity and outlet nodes are
+    recomputed. Values are computed the first time a consumer reads them.
+    """
+    def __init__(self, **inputs):
+        """
+        Args:
+            **inputs: Keyword arguments of core.solve_points; they can also be given later with update().
+        """
+        super().__init__()
+        node = self.node
+        node("cold", fluid_properties, ["fluid"])
+        node("hot", fluid_properties, ["hot_fluid"])
+        node(("internal_correlation", "external_correlation"), _resolve_correlations, ["correlation"])
+        node("wall_roughness", lambda material: material_properties(material)[1], ["material"])
+        node("wall", lambda wall, od, th, material: wall_resistance(od, th, material) if wall is None else wall,
+             ["wall_resistance", "outer_diameter", "thickness", "material"])
+        node("reason", self._validate, ["outer_diameter", "thickness", "length", "gap",
+                                        "flow_cold", "flow_hot", "T_cold_in", "T_hot_in", "hot"])
+        node("A", lambda od, length: np.pi * od * length, ["outer_diameter", "length"])
+        node("m_dot_cold", lambda cold, flow: (flow * cold["rho"]) / 60, ["cold", "flow_cold"])
+        node("m_dot_hot", lambda hot, flow: (flow * hot["rho"]) / 60, ["hot", "flow_hot"])
+        node(("Re_internal", "h_internal"), _internal_side,
+             ["cold", "m_dot_cold", "outer_diameter", "thickness", "length", "internal_correlation"])
+        node(("Re_external", "h_external"), _external_side,
+             ["hot", "m_dot_hot", "outer_diameter", "gap", "length", "external_correlation"])
+        node("U", _overall_coefficient, ["h_internal", "h_external", "outer_diameter", "thickness", "length", "wall",
+                                         "fouling_internal", "fouling_external"])
+        node(("dp_internal", "dp_external", "pumping_power"), _pressure_drops,
+             ["cold", "hot", "m_dot_cold", "m_dot_hot", "flow_cold", "flow_hot",
+              "outer_diameter", "thickness", "gap", "length", "wall_roughness"])
+        node("outlet", _outlet, ["cold", "hot", "m_dot_cold", "m_dot_hot", "T_cold_in", "T_hot_in",
+                                 "U", "A", "reason", "max_iter", "tol"])
+        self.update(**{"gap": 0.01, "max_iter": 5, "tol": None, "correlation": None, **inputs})
+
+    @staticmethod
+    def _validate(outer_diameter, thickness, length, gap, flow_cold, flow_hot, T_cold_in, T_hot_in, hot):
+        pipe_properties = {"outer_diameter": outer_diameter, "thickness": thickness, "length": length}
+        reason = validate_points(pipe_properties, gap, flow_cold, flow_hot, T_cold_in, T_hot_in)
+        return np.broadcast_to(reason, np.broadcast_shapes(reason.shape, np.shape(hot["cp"]))).copy()
+
+    def update(self, **inputs):
+        """
+        Change some inputs (same names as solve_points; pipe_properties is split into
+        outer_diameter, thickness, length, wall_resistance and the fouling resistances).
+
+        Returns:
+            ExchangerModel: self, to chain with points().
+        """
+        pipe_properties = inputs.pop("pipe_properties", None)
+        if pipe_properties is not None:
+            inputs.update(outer_diameter=pipe_properties["outer_diameter"], thickness=pipe_properties["thickness"],
+                          length=pipe_properties["length"], wall_resistance=pipe_properties.get("wall_resistance"),
+                          fouling_internal=pipe_properties.get("fouling_internal", 0.0),
+                          fouling_external=pipe_properties.get("fouling_external", 0.0))
+        for key in ("outer_diameter", "thickness", "length", "gap", "flow_cold", "flow_hot", "T_cold_in", "T_hot_in"):
+            if key in inputs:
+                inputs[key] = np.array(inputs[key], dtype=float)  # a copy: later in-place edits are seen as changes
+        self.set(**inputs)
+        return self
+
+    def _evaluate(self, producer):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"), profiling.span(f"model.{producer}", "simulation"):
+            super()._evaluate(producer)
+
+    def points(self):
+        """
+        Lazy view of the solve_points result columns: a column (and the nodes it needs)
+        is only computed when it is read.
+
+        Returns:
+            Mapping: Same keys and values as core.solve_points.
+        """
+        return ModelPoints(self)
+
+OUTLET_COLUMNS = ("T_out", "T_hot_out", "Q", "efficiency", "delta_T_lm", "residual", "iterations", "energy_balance_error", "reason", "valid")
+POINT_COLUMNS = ("T_out", "T_hot_out", "Q", "efficiency", "U", "Re_internal", "Re_external", "delta_T_lm", "h_internal", "h_external",
+                 "A", "dp_internal", "dp_external", "pumping_power", "residual", "iterations", "energy_balance_error",
+                 "reason", "valid")
+
+class ModelPoints(Mapping):
+    """Read-only mapping of the solve_points columns of an ExchangerModel, evaluated on access."""
+    def __init__(self, model):
+        self.model = model
+
+    def __getitem__(self, key):
+        if key in OUTLET_COLUMNS:
+            return self.model["outlet"][key]
+        if key not in POINT_COLUMNS:
+            raise KeyError(key)
+        return np.broadcast_to(self.model[key], self.model["reason"].shape)
+
+    def __iter__(self):
+        return iter(POINT_COLUMNS)
+
+    def __len__(self):
+        return len(POINT_COLUMNS)
@@ -0,0 +1,233 @@
+#online monitoring: per-sample prediction, sliding-window estimates and anomaly flags
+import collections
+import math
+import socket
+import time
+import numpy as np
+from core import HOT_OUTLET_DROP
+from model import ExchangerModel
+from replay import HISTORIAN_COLUMNS
+
+# Anomaly flags (bits), combined in the "flags" of Monitor.update
+RESIDUAL_SPIKE = 1     # residual more than threshold window standard deviations from the window mean
+RESIDUAL_DRIFT = 2     # window mean residual beyond drift_limit (°C)
+INVALID_SAMPLE = 4     # the model cannot solve the sample (reason != 0, see core.describe_reason)
+
+FLAG_NAMES = {RESIDUAL_SPIKE: "residual spike", RESIDUAL_DRIFT: "residual drift", INVALID_SAMPLE: "invalid sample"}
+
+def describe_flags(flags):
+    """Names of the anomaly flags set in flags."""
+    return [name for flag, name in FLAG_NAMES.items() if flags & flag]
+
+class RollingWindow:
+    """
+    Mean and standard deviation of the last size values, updated in O(1) per value
+    (Welford's update with removal of the oldest value).
+    """
+    def __init__(self, size):
+        self.values = collections.deque(maxlen=size)
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._pushes = 0
+
+    def push(self, value):
+        values = self.values
+        if len(values) == values.maxlen:
+            old, count = values[0], len(values)
+            mean = (count * self.mean - old) / (count - 1) if count > 1 else 0.0
+            self._m2 -= (old - self.mean) * (old - mean)
+            self.mean = mean
+        values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(values)
+        self._m2 += delta * (value - self.mean)
+        self._pushes += 1
+        if self._pushes % values.maxlen == 0:
+            # Rounding errors of the removals accumulate: recompute once per window (amortized O(1))
+            self.mean = math.fsum(values) / len(values)
+            self._m2 = math.fsum((x - self.mean) ** 2 for x in values)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def std(self):
+        return math.sqrt(max(self._m2, 0.0) / (len(self.values) - 1)) if len(self.values) > 1 else math.nan
+
+class Monitor:
+    """
+    Live comparison of measurements with the model, one sample at a time.
+
+    Each sample updates an ExchangerModel (only the nodes depending on the inputs that
+    changed are recomputed), then sliding windows of the residual, of the effective U
+    derived from the measured outlet and of the fouling resistance it implies.
+    """
+    def __init__(self, fluid, hot_fluid, material, pipe_properties, gap=0.01, window=60, threshold=4.0,
+                 drift_limit=1.0, warmup=10, max_iter=5, tol=None, correlation=None):
+        """
+        Args:
+            fluid (str): Cold fluid name.
+            hot_fluid (str): Hot fluid name.
+            material (str): Pipe material.
+            pipe_properties (dict): Pipe properties (outer_diameter, thickness, length), clean pipe.
+            gap (float): Gap between pipes (m).
+            window (int): Samples in the sliding windows.
+            threshold (float): Spike threshold, in window standard deviations of the residual.
+            drift_limit (float): Drift threshold on the window mean residual (°C).
+            warmup (int): Samples in the window before flags are raised.
+            max_iter (int): Fixed-point iterations of the outlet temperature.
+            tol (float, optional): Outlet iteration tolerance (°C).
+            correlation (str or dict, optional): Nusselt correlation(s), see core.solve_points.
+        """
+        self.model = ExchangerModel(fluid=fluid, hot_fluid=hot_fluid, material=material, pipe_properties=pipe_properties,
+                                    gap=gap, max_iter=max_iter, tol=tol, correlation=correlation)
+        self.residual, self.U, self.fouling = RollingWindow(window), RollingWindow(window), RollingWindow(window)
+        self.threshold, self.drift_limit, self.warmup = threshold, drift_limit, warmup
+        self.samples = 0
+        self.max_latency = 0.0
+
+    def _effective_U(self, T_cold_in, T_hot_in, T_cold_out):
+        # U that reproduces the measured outlet: the LMTD of the model inverted, with the same
+        # assumed hot outlet (core.solve_points), so that a clean pipe gives U_model back
+        m_dot_cold, cp, A = float(self.model["m_dot_cold"]), float(self.model["cold"]["cp"]), float(self.model["A"])
+        dT1, dT2 = T_hot_in - T_cold_out, T_hot_in - HOT_OUTLET_DROP - T_cold_in
+        if not (dT1 > 0 and dT2 > 0 and T_cold_out > T_cold_in):
+            return math.nan
+        lmtd = dT1 if abs(dT1 - dT2) < 1e-6 else (dT1 - dT2) / math.log(dT1 / dT2)
+        return m_dot_cold * cp * (T_cold_out - T_cold_in) / (A * lmtd)
+
+    def update(self, flow_cold, flow_hot, T_cold_in, T_hot_in, T_cold_out=math.nan):
+        """
+        Process one sample.
+
+        Args:
+            flow_cold (float): Cold fluid flow rate (L/min).
+            flow_hot (float): Hot fluid flow rate (L/min).
+            T_cold_in (float): Cold fluid inlet temperature (°C).
+            T_hot_in (float): Hot fluid inlet temperature (°C).
+            T_cold_out (float): Measured cold outlet temperature (°C), NaN if not measured.
+
+        Returns:
+            dict: "T_out_predicted", "residual" (predicted - measured), "U_model", "U_effective",
+            "fouling" (1/U_effective - 1/U_model, m²·K/W on the outer surface), the window values
+            "residual_mean", "residual_std", "U_mean", "fouling_mean", then "flags" (see
+            describe_flags), "reason" and "latency" (s).
+        """
+        start = time.perf_counter()
+        self.model.update(flow_cold=flow_cold, flow_hot=flow_hot, T_cold_in=T_cold_in, T_hot_in=T_hot_in)
+        outlet = self.model["outlet"]
+        predicted, reason, U_model = float(outlet["T_out"]), int(outlet["reason"]), float(self.model["U"])
+        residual = predicted - T_cold_out
+        flags = INVALID_SAMPLE if reason else 0
+        if math.isfinite(residual):
+            if len(self.residual) >= self.warmup and abs(residual - self.residual.mean) > self.threshold * self.residual.std:
+                flags |= RESIDUAL_SPIKE
+            self.residual.push(residual)
+            if len(self.residual) >= self.warmup and abs(self.residual.mean) > self.drift_limit:
+                flags |= RESIDUAL_DRIFT
+        U_effective = self._effective_U(T_cold_in, T_hot_in, T_cold_out) if reason == 0 else math.nan
+        fouling = 1 / U_effective - 1 / U_model if U_effective > 0 else math.nan
+        if math.isfinite(fouling):
+            self.U.push(U_effective)
+            self.fouling.push(fouling)
+        self.samples += 1
+        latency = time.perf_counter() - start
+        self.max_latency = max(self.max_latency, latency)
+        return {
+            "T_out_predicted": predicted,
+            "residual": residual,
+            "U_model": U_model,
+            "U_effective": U_effective,
+            "fouling": fouling,
+            "residual_mean": self.residual.mean if len(self.residual) else math.nan,
+            "residual_std": self.residual.std,
+            "U_mean": self.U.mean if len(self.U) else math.nan,
+            "fouling_mean": self.fouling.mean if len(self.fouling) else math.nan,
+            "flags": flags,
+            "reason": reason,
+            "latency": latency,
+        }
+
+    def run(self, samples):
+        """Process a stream of samples (dicts of update arguments), yielding the update results."""
+        for sample in samples:
+            yield self.update(**sample)
+
+# --- Sample sources ----------------------------------------------------------
+
+def parse_lines(lines, columns=None, delimiter=","):
+    """
+    Samples from CSV text lines, the first line being the header.
+
+    Args:
+        lines (iterable): Text lines (a file, tail_lines, socket_lines, ...).
+        columns (dict, optional): Column names overriding replay.HISTORIAN_COLUMNS.
+        delimiter (str): Field separator.
+
+    Yields:
+        dict: Monitor.update arguments; unparsable values become NaN.
+    """
+    lines = iter(lines)
+    header = [name.strip() for name in next(lines).rstrip("\r\n").split(delimiter)]
+    mapping = {key: name for key, name in dict(HISTORIAN_COLUMNS, **(columns or {})).items() if name in header}
+    missing = [key for key in HISTORIAN_COLUMNS if key != "T_cold_out" and key not in mapping]
+    if missing:
+        raise ValueError(f"Column(s) {', '.join(missing)} not found (header: {', '.join(header)}).")
+    indices = {key: header.index(name) for key, name in mapping.items()}
+    for line in lines:
+        fields = line.rstrip("\r\n").split(delimiter)
+        if len(fields) != len(header):
+            continue
+        sample = {}
+        for key, index in indices.items():
+            try:
+                sample[key] = float(fields[index])
+            except ValueError:
+                sample[key] = math.nan
+        yield sample
+
+def tail_lines(path, follow=True, poll=0.1):
+    """
+    Lines of a text file, then the lines appended to it (as tail -f), until follow is False
+    and the end of the file is reached. Incomplete last lines are held until completed.
+    """
+    with open(path, encoding="utf-8") as file:
+        pending = ""
+        while True:
+            line = file.readline()
+            if line:
+                pending += line
+                if pending.endswith("\n"):
+                    yield pending
+                    pending = ""
+            elif follow:
+                time.sleep(poll)
+            else:
+                if pending:
+                    yield pending
+                return
+
+def socket_lines(host, port, timeout=None):
+    """Lines received from a TCP server (one CSV line per sample, header first)."""
+    with socket.create_connection((host, port), timeout=timeout) as connection, \
+            connection.makefile("r", encoding="utf-8", newline="") as stream:
+        yield from stream
+
+def simulated_samples(fluid, hot_fluid, material, pipe_properties, samples=1000, gap=0.01, fouling_rate=1e-7,
+                      noise=0.05, interval=0.0, seed=0):
+    """
+    Stand-in plant: operating conditions wandering around a set point, with an internal
+    fouling resistance growing by fouling_rate per sample and measurement noise.
+
+    Yields:
+        dict: Monitor.update arguments.
+    """
+    rng = np.random.default_rng(seed)
+    plant = ExchangerModel(fluid=fluid, hot_fluid=hot_fluid, material=material, pipe_properties=pipe_properties, gap=gap)
+    for sample in range(samples):
+        inputs = {"flow_cold": 10 + rng.normal(0, 0.5), "flow_hot": 12 + rng.normal(0, 0.5),
+                  "T_cold_in": 15 + rng.normal(0, 0.2), "T_hot_in": 70 + rng.normal(0, 0.5)}
+        plant.update(fouling_internal=fouling_rate * sample, **inputs)
+        yield dict(inputs, T_cold_out=float(plant["outlet"]["T_out"]) + rng.normal(0, noise))
+        if interval:
+            time.sleep(interval)
@@ -0,0 +1,424 @@
+#networks of double-pipe exchangers (series, parallel, recycles) solved on batches of operating points
+import numpy as np
+import profiling
+from core import solve_points, validate_points, fluid_properties, INVALID_INLET, NON_FINITE, TEMPERATURE_CROSS
+from shell_tube import effectiveness
+
+SIDES = ("cold", "hot")
+
+class ExchangerNetwork:
+    """
+    Network of double-pipe exchangers connected by streams.
+
+    Every unit is solved with core.solve_points (film coefficients, U and A) and
+    the effectiveness-NTU relations (outlets and duty). Streams leaving a unit can be
+    split between several inlets (fractions of the outlet flow), several streams
+    entering an inlet are mixed (flow-weighted temperature, same fluid). External
+    feeds are given as floats or as arrays with one value per operating point, so
+    one solve covers a whole batch of operating points.
+
+    Acyclic parts are solved in topological order, all units of the same level
+    at once. Recycles (strongly connected groups of units) are solved by tearing
+    the streams that close the loops and iterating on them with Wegstein
+    acceleration, vectorized over the torn streams and the operating points.
+    """
+    def __init__(self):
+        self.units = []
+        self.edges = []
+        self.feeds = []
+        self._index = {}
+
+    def add_unit(self, name, fluid, hot_fluid, material, pipe_properties, gap=0.01):
+        """
+        Add an exchanger.
+
+        Args:
+            name (str): Unique unit name.
+            fluid (str): Cold fluid name.
+            hot_fluid (str): Hot fluid name.
+            material (str): Pipe material.
+            pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
+            gap (float): Gap between pipes (m).
+        """
+        if name in self._index:
+            raise ValueError(f"Unit '{name}' already exists.")
+        self._index[name] = len(self.units)
+        self.units.append({
+            "name": name,
+            "fluid": fluid.lower(),
+            "hot_fluid": hot_fluid.lower(),
+            "material": material,
+            "pipe_properties": dict(pipe_properties),
+            "gap": gap,
+        })
+
+    def _unit(self, name, side):
+        if name not in self._index:
+            raise ValueError(f"Unknown unit '{name}'.")
+        if side not in SIDES:
+            raise ValueError(f"Side must be 'cold' or 'hot', not '{side}'.")
+        return self._index[name]
+
+    def _side_fluid(self, index, side):
+        unit = self.units[index]
+        return unit["fluid"] if side == "cold" else unit["hot_fluid"]
+
+    def feed(self, unit, side, flow, T):
+        """
+        Feed an external stream into a unit inlet.
+
+        Args:
+            unit (str): Unit name.
+            side (str): "cold" or "hot".
+            flow (float or array): Flow rate (L/min), one value per operating point.
+            T (float or array): Temperature (°C), one value per operating point.
+        """
+        self.feeds.append((self._unit(unit, side), side, flow, T))
+
+    def connect(self, source, source_side, target, target_side, fraction=1.0):
+        """
+        Route (part of) a unit outlet to another unit inlet.
+
+        Args:
+            source (str): Unit whose outlet is routed.
+            source_side (str): "cold" or "hot" outlet.
+            target (str): Receiving unit.
+            target_side (str): "cold" or "hot" inlet.
+            fraction (float): Fraction of the outlet flow sent to the target.
+
+        Raises:
+            ValueError: If the fluids of both sides differ or the fraction is not in (0, 1].
+        """
+        src = self._unit(source, source_side)
+        dst = self._unit(target, target_side)
+        if self._side_fluid(src, source_side) != self._side_fluid(dst, target_side):
+            raise ValueError(
+                f"Cannot route the {source_side} stream of '{source}' ({self._side_fluid(src, source_side)}) "
+                f"into the {target_side} side of '{target}' ({self._side_fluid(dst, target_side)})."
+            )
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Split fraction must be in (0, 1], got {fraction}.")
+        self.edges.append((src, SIDES.index(source_side), dst, SIDES.index(target_side), fraction))
+
+    # --- Graph structure ------------------------------------------------------
+
+    def _check_splits(self):
+        totals = {}
+        for src, src_side, _, _, fraction in self.edges:
+            totals[src, src_side] = totals.get((src, src_side), 0.0) + fraction
+        for (src, src_side), total in totals.items():
+            if total > 1 + 1e-9:
+                raise ValueError(
+                    f"The {SIDES[src_side]} outlet of '{self.units[src]['name']}' is split into fractions summing to {total:.3f} > 1."
+                )
+
+    def _components(self):
+        # Strongly connected components in topological order (iterative Tarjan)
+        n = len(self.units)
+        successors = [[] for _ in range(n)]
+        for src, _, dst, _, _ in self.edges:
+            successors[src].append(dst)
+        index = [None] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack = []
+        components = []
+        counter = 0
+        for root in range(n):
+            if index[root] is not None:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                if child < len(successors[node]):
+                    work.append((node, child + 1))
+                    nxt = successors[node][child]
+                    if index[nxt] is None:
+                        work.append((nxt, 0))
+                    elif on_stack[nxt]:
+                        low[node] = min(low[node], index[nxt])
+                    continue
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+        components.reverse()
+        return components
+
+    @staticmethod
+    def _levels(nodes, edges):
+        # Longest-path levels of an acyclic subgraph; nodes are listed in topological order
+        level = {node: 0 for node in nodes}
+        predecessors = {node: [] for node in nodes}
+        for src, dst in edges:
+            predecessors[dst].append(src)
+        for node in nodes:
+            if predecessors[node]:
+                level[node] = 1 + max(level[p] for p in predecessors[node])
+        batches = {}
+        for node in nodes:
+            batches.setdefault(level[node], []).append(node)
+        return [batches[key] for key in sorted(batches)]
+
+    def _plan(self):
+        """
+        Order of evaluation: a list of steps, each ("batch", [units]) for acyclic
+        units solved together or ("recycle", [batches], torn outlets) for a loop.
+        """
+        components = self._components()
+        component_of = {}
+        for number, component in enumerate(components):
+            for unit in component:
+                component_of[unit] = number
+        self_loops = {src for src, _, dst, _, _ in self.edges if src == dst}
+        # Levels of the condensed graph, one node per component
+        condensed = {(component_of[src], component_of[dst]) for src, _, dst, _, _ in self.edges
+                     if component_of[src] != component_of[dst]}
+        steps = []
+        for group in self._levels(list(range(len(components))), condensed):
+            acyclic = [components[c][0] for c in group if len(components[c]) == 1 and components[c][0] not in self_loops]
+            if acyclic:
+                steps.append(("batch", acyclic))
+            for c in group:
+                component = components[c]
+                if len(component) > 1 or component[0] in self_loops:
+                    steps.append(("recycle",) + self._tear(component))
+        return steps
+
+    def _tear(self, component):
+        # Order the loop by depth-first search from its first unit; edges going back in
+        # that order are torn, the rest is an acyclic graph solved by levels
+        members = set(component)
+        successors = {unit: [] for unit in component}
+        for src, _, dst, _, _ in self.edges:
+            if src in members and dst in members:
+                successors[src].append(dst)
+        order = []
+        seen = set()
+        for root in sorted(component):
+            if root in seen:
+                continue
+            work = [(root, iter(successors[root]))]
+            seen.add(root)
+            while work:
+                node, children = work[-1]
+                for nxt in children:
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        work.append((nxt, iter(successors[nxt])))
+                        break
+                else:
+                    work.pop()
+                    order.append(node)
+        order.reverse()
+        position = {unit: i for i, unit in enumerate(order)}
+        torn = sorted({(src, src_side) for src, src_side, dst, _, _ in self.edges
+                       if src in members and dst in members and position[dst] <= position[src]})
+        forward = {(src, dst) for src, _, dst, _, _ in self.edges
+                   if src in members and dst in members and position[dst] > position[src]}
+        return self._levels(order, forward), torn
+
+    # --- Solver ---------------------------------------------------------------
+
+    @profiling.profiled("network.solve", "network")
+    def solve(self, max_iter=5, tol=None, tear_tol=1e-6, max_tear_iter=100, correlation=None):
+        """
+        Solve the network for every operating point of the feeds.
+
+        Args:
+            max_iter (int): Maximum fixed-point iterations per unit (see core.solve_points).
+            tol (float, optional): Outlet temperature tolerance per unit (°C).
+            tear_tol (float): Convergence tolerance on the torn streams (L/min and °C).
+            max_tear_iter (int): Maximum number of iterations of each recycle loop.
+            correlation (str or dict, optional): Nusselt correlation(s), see core.solve_points.
+
+        Returns:
+            dict: "units" (names) and arrays of shape (units, points): "flow_cold", "flow_hot",
+            "T_cold_in", "T_hot_in", "T_cold_out", "T_hot_out", "Q", "U", "efficiency",
+            "reason" and "valid"; plus "tear_iterations" and "tear_residual" of the loops.
+            Outlets follow from the counter-flow effectiveness-NTU relations with the U and A
+            of core.solve_points, so the duty closes the energy balance of both streams.
+        """
+        if not self.units:
+            raise ValueError("The network has no unit.")
+        self._check_splits()
+        n_units = len(self.units)
+        n_points = max([np.size(flow) for _, _, flow, _ in self.feeds] + [np.size(T) for _, _, _, T in self.feeds] + [1])
+
+        feed_flow = np.zeros((2, n_units, n_points))
+        feed_heat = np.zeros((2, n_units, n_points))
+        for unit, side, flow, T in self.feeds:
+            flow = np.broadcast_to(np.asarray(flow, dtype=float), (n_points,))
+            T = np.broadcast_to(np.asarray(T, dtype=float), (n_points,))
+            feed_flow[SIDES.index(side), unit] += flow
+            feed_heat[SIDES.index(side), unit] += flow * T
+
+        state = {
+            "flow_in": np.zeros((2, n_units, n_points)),
+            "T_in": np.full((2, n_units, n_points), np.nan),
+            "T_out": np.full((2, n_units, n_points), np.nan),
+            "Q": np.full((n_units, n_points), np.nan),
+            "U": np.full((n_units, n_points), np.nan),
+            "efficiency": np.full((n_units, n_points), np.nan),
+            "reason": np.zeros((n_units, n_points), dtype=np.int64),
+        }
+        edges = np.array([edge[:4] for edge in self.edges], dtype=np.int64).reshape(-1, 4)
+        fractions = np.array([edge[4] for edge in self.edges], dtype=float)
+        context = (feed_flow, feed_heat, edges, fractions, max_iter, tol, correlation)
+
+        tear_iterations = 0
+        tear_residual = 0.0
+        for step in self._plan():
+            if step[0] == "batch":
+                self._solve_batch(step[1], state, context)
+            else:
+                iterations, residual = self._solve_recycle(step[1], step[2], state, context, tear_tol, max_tear_iter)
+                tear_iterations = max(tear_iterations, iterations)
+                tear_residual = max(tear_residual, residual)
+
+        return {
+            "units": [unit["name"] for unit in self.units],
+            "flow_cold": state["flow_in"][0],
+            "flow_hot": state["flow_in"][1],
+            "T_cold_in": state["T_in"][0],
+            "T_hot_in": state["T_in"][1],
+            "T_cold_out": state["T_out"][0],
+            "T_hot_out": state["T_out"][1],
+            "Q": state["Q"],
+            "U": state["U"],
+            "efficiency": state["efficiency"],
+            "reason": state["reason"],
+            "valid": state["reason"] == 0,
+            "tear_iterations": tear_iterations,
+            "tear_residual": tear_residual,
+        }
+
+    def _solve_recycle(self, batches, torn, state, context, tear_tol, max_tear_iter):
+        # Wegstein iteration on the flow and temperature of the torn outlets
+        torn_units = np.array([unit for unit, _ in torn])
+        torn_sides = np.array([side for _, side in torn])
+
+        def current():
+            # Torn outlet flows equal the inlet flows of the same side
+            return np.concatenate([state["flow_in"][torn_sides, torn_units], state["T_out"][torn_sides, torn_units]])
+
+        def assign(x):
+            n = len(torn)
+            state["flow_in"][torn_sides, torn_units] = x[:n]
+            state["T_out"][torn_sides, torn_units] = x[n:]
+
+        # Start the torn streams from the total feed of their side (flow-weighted temperature):
+        # a zero flow or a NaN temperature would leave the units downstream of a tear unsolved
+        feed_flow, feed_heat = context[:2]
+        total_flow, total_heat = feed_flow.sum(axis=1), feed_heat.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            feed_T = np.where(total_flow > 0, total_heat / np.where(total_flow > 0, total_flow, 1), np.nan)
+        assign(np.concatenate([total_flow[torn_sides], feed_T[torn_sides]]))
+        x = current()
+        x_prev = g_prev = None
+        residual = np.inf
+        iterations = 0
+        while iterations < max_tear_iter:
+            for batch in batches:
+                self._solve_batch(batch, state, context)
+            g = current()
+            iterations += 1
+            with np.errstate(invalid="ignore"):
+                change = np.abs(g - x)
+            # A torn stream that is not finite (an upstream unit failed) has not converged
+            residual = float(np.max(change, initial=0.0)) if np.isfinite(change).all() else np.inf
+            if residual <= tear_tol:
+                break
+            if x_prev is None:
+                x_next = g
+            else:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    slope = (g - g_prev) / (x - x_prev)
+                    q = np.clip(slope / (slope - 1), -5.0, 0.0)
+                q = np.where(np.isfinite(q), q, 0.0)
+                x_next = q * x + (1 - q) * g
+            x_prev, g_prev, x = x, g, x_next
+            assign(x)
+        return iterations, residual
+
+    def _solve_batch(self, batch, state, context):
+        feed_flow, feed_heat, edges, fractions, max_iter, tol, correlation = context
+        units = np.asarray(batch)
+        local = np.full(len(self.units), -1)
+        local[units] = np.arange(len(units))
+
+        # Mix the feeds and every stream routed into the inlets of the batch
+        for side in range(2):
+            flow = feed_flow[side, units].copy()
+            heat = feed_heat[side, units].copy()
+            incoming = (local[edges[:, 2]] >= 0) & (edges[:, 3] == side) if len(edges) else np.zeros(0, dtype=bool)
+            if incoming.any():
+                src, src_side, dst = edges[incoming, 0], edges[incoming, 1], local[edges[incoming, 2]]
+                part = fractions[incoming, None] * state["flow_in"][src_side, src]
+                with np.errstate(invalid="ignore"):
+                    part_heat = np.where(part > 0, part * state["T_out"][src_side, src], 0.0)
+                np.add.at(flow, dst, part)
+                np.add.at(heat, dst, part_heat)
+            state["flow_in"][side, units] = flow
+            with np.errstate(divide="ignore", invalid="ignore"):
+                state["T_in"][side, units] = np.where(flow > 0, heat / flow, np.nan)
+
+        # One solve_points call per (fluid, hot fluid, material) group
+        groups = {}
+        for unit in batch:
+            spec = self.units[unit]
+            groups.setdefault((spec["fluid"], spec["hot_fluid"], spec["material"]), []).append(unit)
+        for (fluid, hot_fluid, material), members in groups.items():
+            members = np.asarray(members)
+            pipe = {
+                key: np.array([self.units[unit]["pipe_properties"][key] for unit in members], dtype=float)[:, None]
+                for key in ("outer_diameter", "thickness", "length")
+            }
+            gap = np.array([self.units[unit]["gap"] for unit in members], dtype=float)[:, None]
+            flow_cold, flow_hot = state["flow_in"][0, members], state["flow_in"][1, members]
+            T_cold_in, T_hot_in = state["T_in"][0, members], state["T_in"][1, members]
+            points = solve_points(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, pipe, gap, max_iter, tol, correlation)
+
+            # The outlet checks of solve_points concern its own LMTD duty, not the one below, and
+            # effectiveness-NTU only needs the hot inlet above the cold inlet (no assumed approach)
+            reason = validate_points(pipe, gap, flow_cold, flow_hot, T_cold_in, T_hot_in, approach=0)
+            bad_inlet = ((flow_cold > 0) & np.isnan(T_cold_in)) | ((flow_hot > 0) & np.isnan(T_hot_in))
+            reason = np.where(bad_inlet, INVALID_INLET, reason)
+
+            # solve_points gets its duty from an LMTD with an assumed hot outlet; the outlets of a network
+            # unit follow from its U * A and both heat capacity rates (counter-flow
+            # effectiveness-NTU), so both energy balances hold whatever the hot flow
+            cold, hot = fluid_properties(fluid), fluid_properties(hot_fluid)
+            C_cold = flow_cold * cold["rho"] / 60 * cold["cp"]
+            C_hot = flow_hot * hot["rho"] / 60 * hot["cp"]
+            C_min = np.minimum(C_cold, C_hot)
+            C_max = np.maximum(C_cold, C_hot)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                eps = effectiveness(points["U"] * points["A"] / C_min, C_min / C_max, 1)
+                Q = eps * C_min * (T_hot_in - T_cold_in)
+                T_cold_out = T_cold_in + Q / C_cold
+                T_hot_out = T_hot_in - Q / C_hot
+                efficiency = Q / (C_cold * (T_hot_in - T_cold_in))
+            reason = np.where((reason == 0) & ~(T_hot_out > T_cold_in), TEMPERATURE_CROSS, reason)
+            reason = np.where((reason == 0) & ~np.isfinite(T_cold_out), NON_FINITE, reason)
+            valid = reason == 0
+
+            state["T_out"][0, members] = np.where(valid, T_cold_out, np.nan)
+            state["T_out"][1, members] = np.where(valid, T_hot_out, np.nan)
+            state["Q"][members] = np.where(valid, Q, np.nan)
+            state["U"][members] = points["U"]
+            state["efficiency"][members] = np.where(valid, efficiency, np.nan)
+            state["reason"][members] = reason
@@ -1,16 +1,80 @@
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
 from pathlib import Path
+import profiling
 
+def draw_results(ax, tp_name, results):
+    """
+    Draw simulation results on an existing Matplotlib axes.
+
+    Args:
+        ax (matplotlib.axes.Axes): Axes to draw on (cleared first).
+        tp_name (str): Name of the TP (e.g., "TP1").
+        results (dict): Simulation results.
+    """
+    ax.clear()
+
+    if tp_name == "TP1":
+        ax.plot(results["flow_rates"], results["T_out"], 'b-', label="Outlet Temperature")
+        ax.set_xlabel("Cold Fluid Flow Rate (L/min)")
+        ax.set_ylabel("Outlet Temperature (°C)")
+        ax.set_title("Effect of Flow Rate on Outlet Temperature")
+    elif tp_name == "TP2":
+        ax.plot(results["T_hot_in"], results["T_out"], 'r-', label="Outlet Temperature")
+        ax.set_xlabel("Hot Fluid Inlet Temperature (°C)")
+        ax.set_ylabel("Outlet Temperature (°C)")
+        ax.set_title("Effect of Hot Fluid Temperature on Outlet Temperature")
+    elif tp_name == "TP3":
+        ax.bar(results["hot_fluids"], results["T_out"], label="Outlet Temperature")
+        ax.set_xlabel("Hot Fluid")
+        ax.set_ylabel("Outlet Temperature (°C)")
+        ax.set_title("Effect of Hot Fluid on Outlet Temperature")
+        ax.tick_params(axis="x", labelrotation=45)
+    elif tp_name == "TP4":
+        ax.plot(results["dimensions"], results["T_out"], 'g-', label="Outlet Temperature")
+        ax.set_xlabel(f"Pipe {results.get('dimension_type', 'Dimension')} (m)")
+        ax.set_ylabel("Outlet Temperature (°C)")
+        ax.set_title(f"Effect of Pipe {results.get('dimension_type', 'Dimension')} on Outlet Temperature")
+
+    ax.grid(True)
+    ax.legend()
+
+def draw_profiles(ax, profiles, index=None, positions=100, length=1.0):
+    """
+    Draw axial temperature profiles on an existing Matplotlib axes, expanding only the
+    points drawn.
+
+    Args:
+        ax (matplotlib.axes.Axes): Axes to draw on (cleared first).
+        profiles (profiles.AxialProfiles): The "profiles" of a result dict.
+        index (list, optional): Points to draw, five evenly spaced points by default.
+        positions (int): Positions along the pipe.
+        length (float): Pipe length (m), to label the axis in meters.
+    """
+    ax.clear()
+    if index is None:
+        index = np.unique(np.linspace(0, len(profiles) - 1, min(5, len(profiles))).astype(int))
+    x, T_cold, T_hot = profiles.expand(positions, index)
+    for k, point in enumerate(index):
+        line, = ax.plot(x * length, T_hot[k], "-", label=f"Point {point}")
+        ax.plot(x * length, T_cold[k], "--", color=line.get_color())
+    ax.set_xlabel("Position from the cold inlet (m)" if length != 1.0 else "Position from the cold inlet (fraction of the length)")
+    ax.set_ylabel("Temperature (°C)")
+    ax.set_title("Axial temperature profiles (hot: solid, cold: dashed)")
+    ax.grid(True)
+    ax.legend()
+
+@profiling.profiled("generate_plot", "plot")
 def generate_plot(tp_name, results, output_dir, filename=None):
     """
     Generate a plot of simulation results and save it as a PNG file.
-    
+
     Args:
         tp_name (str): Name of the TP (e.g., "TP1").
         results (dict): Simulation results.
         output_dir (str or Path): Directory to save the plot.
         filename (str, optional): Custom filename for the plot (e.g., "graphe_tp1.png").
-    
+
     Returns:
         str: Path to the generated PNG file.
     """
@@ -19,35 +83,13 @@ def generate_plot(tp_name, results, output_dir, filename=None):
     if filename is None:
         filename = f"{tp_name.lower()}_plot.png"
     plo_path = output_dir / filename
-    
-    plt.figure(figsize=(8, 6))
-    
-    if tp_name == "TP1":
-        plt.plot(results["flow_rates"], results["T_out"], 'b-', label="Outlet Temperature")
-        plt.xlabel("Cold Fluid Flow Rate (L/min)")
-        plt.ylabel("Outlet Temperature (°C)")
-        plt.title("Effect of Flow Rate on Outlet Temperature")
-    elif tp_name == "TP2":
-        plt.plot(results["T_hot_in"], results["T_out"], 'r-', label="Outlet Temperature")
-        plt.xlabel("Hot Fluid Inlet Temperature (°C)")
-        plt.ylabel("Outlet Temperature (°C)")
-        plt.title("Effect of Hot Fluid Temperature on Outlet Temperature")
-    elif tp_name == "TP3":
-        plt.bar(results["hot_fluids"], results["T_out"])
-        plt.xlabel("Hot Fluid")
-        plt.ylabel("Outlet Temperature (°C)")
-        plt.title("Effect of Hot Fluid on Outlet Temperature")
-        plt.xticks(rotation=45)
-    elif tp_name == "TP4":
-        plt.plot(results["dimensions"], results["T_out"], 'g-', label="Outlet Temperature")
-        plt.xlabel(f"Pipe {results.get('dimension_type', 'Dimension')} (m)")
-        plt.ylabel("Outlet Temperature (°C)")
-        plt.title(f"Effect of Pipe {results.get('dimension_type', 'Dimension')} on Outlet Temperature")
-    
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(plo_path, dpi=300)
-    plt.close()
-    
-    return str(plo_path)
\ No newline at end of file
+
+    # Figure is used directly (no pyplot state) so plots can be built off the GUI thread
+    with profiling.span("generate_plot.draw", "plot"):
+        fig = Figure(figsize=(8, 6))
+        draw_results(fig.add_subplot(), tp_name, results)
+        fig.tight_layout()
+    with profiling.span("generate_plot.savefig", "plot"):
+        fig.savefig(plo_path, dpi=300)
+
+    return str(plo_path)
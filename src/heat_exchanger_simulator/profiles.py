@@ -0,0 +1,122 @@
+#axial temperature profiles T(x) along the exchanger
+import numpy as np
+
+def axial_profiles(T_cold_in, T_cold_out, T_hot_in, T_hot_out, x):
+    """
+    Cold and hot temperatures along a counter-flow exchanger from its end temperatures.
+
+    Both temperatures change linearly with the heat exchanged, so their difference varies
+    exponentially along the pipe, from T_hot_out - T_cold_in at the cold inlet (x = 0) to
+    T_hot_in - T_cold_out at the cold outlet (x = 1): the profile behind the log-mean
+    temperature difference of the model.
+
+    Args:
+        T_cold_in (float or array): Cold fluid inlet temperature (°C).
+        T_cold_out (float or array): Cold fluid outlet temperature (°C).
+        T_hot_in (float or array): Hot fluid inlet temperature (°C), entering at x = 1.
+        T_hot_out (float or array): Hot fluid outlet temperature (°C), leaving at x = 0.
+        x (float or array): Position along the pipe, 0 (cold inlet) to 1 (cold outlet);
+            broadcast against the temperatures (e.g. points[:, None] and x[None, :]).
+
+    Returns:
+        tuple: (T_cold, T_hot) arrays (°C).
+    """
+    T_cold_in, T_cold_out, T_hot_in, T_hot_out, x = (np.asarray(v, dtype=float) for v in (T_cold_in, T_cold_out, T_hot_in, T_hot_out, x))
+    dT_inlet, dT_outlet = T_hot_out - T_cold_in, T_hot_in - T_cold_out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = dT_outlet / dT_inlet
+        # Fraction of the heat exchanged between x = 0 and x; linear when both ends have the same ΔT
+        exponential = (ratio ** x - 1) / (ratio - 1)
+        fraction = np.where(np.abs(ratio - 1) < 1e-9, x, exponential)
+    T_cold = T_cold_in + (T_cold_out - T_cold_in) * fraction
+    T_hot = T_hot_out + (T_hot_in - T_hot_out) * fraction
+    return T_cold, T_hot
+
+class AxialProfiles:
+    """
+    Cold and hot temperature profiles of a batch of points, stored compactly and expanded on demand.
+
+    With grid=None the profiles are kept in analytic form: the end temperatures and the
+    exponent ln(ΔT_outlet / ΔT_inlet) they fix (see axial_profiles), 5 numbers per point
+    whatever the resolution asked later. End temperatures closing the energy balance of
+    both streams (the "T_hot_out" of core.solve_points) keep it along the whole pipe. With a grid
+    size they are sampled once on that many uniform positions and stored as float32.
+    Either way no (points × positions) float64 array exists until expand() is called,
+    which can be restricted to the points being plotted.
+    """
+    def __init__(self, T_cold_in, T_cold_out, T_hot_in, T_hot_out, grid=None, dtype=np.float32, chunk=1 << 20):
+        """
+        Args:
+            T_cold_in, T_cold_out, T_hot_in, T_hot_out (array): End temperatures of every point (°C).
+            grid (int, optional): Sample on grid positions instead of keeping the analytic form.
+            dtype: Storage type of the sampled profiles.
+            chunk (int): Values computed at once while sampling (bounds the float64 temporaries).
+        """
+        T_cold_in, T_cold_out, T_hot_in, T_hot_out = (np.asarray(v) for v in (T_cold_in, T_cold_out, T_hot_in, T_hot_out))
+        # float32 end temperatures (precision="float32" sweeps) keep float32 coefficients
+        precision = np.result_type(T_cold_in, T_cold_out, T_hot_in, T_hot_out, np.float32)
+        T_cold_in, T_cold_out, T_hot_in, T_hot_out = np.broadcast_arrays(
+            *(np.ravel(v.astype(precision, copy=False)) for v in (T_cold_in, T_cold_out, T_hot_in, T_hot_out))
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.log((T_hot_in - T_cold_out) / (T_hot_out - T_cold_in))
+        self.coefficients = np.stack([T_cold_in, T_cold_out - T_cold_in, T_hot_out, T_hot_in - T_hot_out, rate])
+        self.grid = grid
+        if grid is not None:
+            self.samples = np.empty((2, len(self), grid), dtype=dtype)
+            rows = max(1, chunk // grid)
+            x = np.linspace(0, 1, grid)
+            for start in range(0, len(self), rows):
+                index = slice(start, start + rows)
+                self.samples[0, index], self.samples[1, index] = self._analytic(x, index)
+            self.coefficients = None
+
+    def __len__(self):
+        return self.coefficients.shape[1] if self.coefficients is not None else self.samples.shape[1]
+
+    @property
+    def nbytes(self):
+        """int: Memory used by the stored profiles."""
+        return self.coefficients.nbytes if self.coefficients is not None else self.samples.nbytes
+
+    def _analytic(self, x, index):
+        cold_in, cold_rise, hot_out, hot_rise, rate = (c[:, None] for c in self.coefficients[:, index])
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            # Fraction of the heat exchanged between 0 and x, linear when rate -> 0
+            fraction = np.where(np.abs(rate) < 1e-9, x, np.expm1(rate * x) / np.expm1(rate))
+        return cold_in + cold_rise * fraction, hot_out + hot_rise * fraction
+
+    def expand(self, x=100, index=None):
+        """
+        Profiles as arrays.
+
+        Args:
+            x (int or array): Number of uniform positions, or positions between 0 (cold inlet)
+                and 1 (cold outlet).
+            index (int, slice or array, optional): Points to expand (all by default).
+
+        Returns:
+            tuple: (x, T_cold, T_hot), the temperatures with shape (points, positions), float64.
+        """
+        x = np.linspace(0, 1, x) if np.ndim(x) == 0 else np.asarray(x, dtype=float)
+        index = slice(None) if index is None else np.atleast_1d(index) if np.ndim(index) == 0 else index
+        if self.coefficients is not None:
+            T_cold, T_hot = self._analytic(x, index)
+            return x, T_cold, T_hot
+        # Linear interpolation between the stored samples
+        position = np.clip(x, 0, 1) * (self.grid - 1)
+        left = np.minimum(position.astype(np.int64), self.grid - 2) if self.grid > 1 else np.zeros(len(x), dtype=np.int64)
+        weight = position - left
+        samples = self.samples[:, index].astype(float)
+        right = np.minimum(left + 1, self.grid - 1)
+        T_cold, T_hot = samples[..., left] * (1 - weight) + samples[..., right] * weight
+        return x, T_cold, T_hot
+
+    def take(self, indices):
+        """Profiles of some points only (a new AxialProfiles)."""
+        subset = object.__new__(AxialProfiles)
+        subset.grid = self.grid
+        subset.coefficients = None if self.coefficients is None else self.coefficients[:, indices]
+        if self.coefficients is None:
+            subset.samples = self.samples[:, indices]
+        return subset
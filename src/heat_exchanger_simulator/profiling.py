@@ -0,0 +1,235 @@
+#opt-in timing of the simulation pipeline stages (Chrome trace and text summary)
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+_tracer = None
+
+class _NullSpan:
+    """Context manager doing nothing, returned by span() while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """
+    Collect timing spans, call counts and allocated memory blocks per stage.
+
+    Aggregated statistics are kept for every span; individual events (for the
+    Chrome trace) are kept up to max_events so long sweeps stay bounded in memory.
+    """
+    def __init__(self, track_allocations=True, max_events=100_000):
+        """
+        Args:
+            track_allocations (bool): Count net allocated memory blocks per stage.
+            max_events (int): Maximum number of events kept for the Chrome trace.
+        """
+        self.track_allocations = track_allocations
+        self.max_events = max_events
+        self.events = []
+        self.dropped_events = 0
+        self.stats = {}
+        self.origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def mark(self):
+        """
+        Take a time (and allocation) mark.
+
+        Returns:
+            tuple: (time in ns, allocated blocks).
+        """
+        blocks = sys.getallocatedblocks() if self.track_allocations else 0
+        return time.perf_counter_ns(), blocks
+
+    def record(self, name, start, end, category="stage"):
+        """
+        Record a finished span between two marks.
+
+        Args:
+            name (str): Stage name.
+            start (tuple): Mark taken at the start of the stage.
+            end (tuple): Mark taken at the end of the stage.
+            category (str): Category shown in the trace viewer.
+        """
+        duration = end[0] - start[0]
+        blocks = end[1] - start[1]
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = {"calls": 0, "total_ns": 0, "max_ns": 0, "alloc_blocks": 0}
+            stat["calls"] += 1
+            stat["total_ns"] += duration
+            stat["max_ns"] = max(stat["max_ns"], duration)
+            stat["alloc_blocks"] += blocks
+            if len(self.events) < self.max_events:
+                self.events.append((name, category, start[0], duration, threading.get_ident(), blocks))
+            else:
+                self.dropped_events += 1
+
+    def lap(self, name, start, category="stage"):
+        """
+        Record the stage that started at `start` and return a mark for the next stage.
+
+        Args:
+            name (str): Stage name.
+            start (tuple): Mark taken at the start of the stage.
+            category (str): Category shown in the trace viewer.
+
+        Returns:
+            tuple: New mark.
+        """
+        end = self.mark()
+        self.record(name, start, end, category)
+        return end
+
+    def span(self, name, category="stage"):
+        """
+        Context manager timing its block as one stage.
+
+        Args:
+            name (str): Stage name.
+            category (str): Category shown in the trace viewer.
+        """
+        return _Span(self, name, category)
+
+    def to_chrome_trace(self):
+        """
+        Events in the Chrome trace event format (chrome://tracing, Perfetto).
+
+        Returns:
+            dict: Trace document.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {"alloc_blocks": blocks},
+            }
+            for name, category, start, duration, tid, blocks in self.events
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_events": self.dropped_events}}
+
+    def export_chrome_trace(self, path):
+        """
+        Write the Chrome trace JSON file.
+
+        Args:
+            path (str or Path): Output file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+    def summary(self):
+        """
+        Plain-text table of the stages sorted by total time.
+
+        Returns:
+            str: Summary table.
+        """
+        lines = [f"{'stage':<40} {'calls':>9} {'total (ms)':>11} {'mean (us)':>11} {'max (us)':>11} {'alloc blocks':>13}"]
+        for name, stat in sorted(self.stats.items(), key=lambda item: item[1]["total_ns"], reverse=True):
+            lines.append(
+                f"{name:<40} {stat['calls']:>9} {stat['total_ns'] / 1e6:>11.3f} "
+                f"{stat['total_ns'] / stat['calls'] / 1e3:>11.2f} {stat['max_ns'] / 1e3:>11.2f} {stat['alloc_blocks']:>13}"
+            )
+        if self.dropped_events:
+            lines.append(f"({self.dropped_events} events not kept in the trace, statistics are complete)")
+        return "\n".join(lines)
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "start")
+
+    def __init__(self, tracer, name, category):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = self.tracer.mark()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, self.tracer.mark(), self.category)
+        return False
+
+def enable(track_allocations=True, max_events=100_000):
+    """
+    Start profiling with a new tracer.
+
+    Args:
+        track_allocations (bool): Count net allocated memory blocks per stage.
+        max_events (int): Maximum number of events kept for the Chrome trace.
+
+    Returns:
+        Tracer: The active tracer.
+    """
+    global _tracer
+    _tracer = Tracer(track_allocations, max_events)
+    return _tracer
+
+def disable():
+    """
+    Stop profiling.
+
+    Returns:
+        Tracer: The tracer that was active (or None).
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def tracer():
+    """
+    Active tracer, or None when profiling is disabled. Hot loops fetch it once
+    and guard their marks with `if tracer:` so the disabled cost is one test.
+
+    Returns:
+        Tracer: Active tracer or None.
+    """
+    return _tracer
+
+def span(name, category="stage"):
+    """
+    Context manager timing a stage (a shared no-op while profiling is disabled).
+
+    Args:
+        name (str): Stage name.
+        category (str): Category shown in the trace viewer.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category)
+
+def profiled(name, category="stage"):
+    """
+    Decorator timing every call of a function as one stage.
+
+    Args:
+        name (str): Stage name.
+        category (str): Category shown in the trace viewer.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _Span(_tracer, name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
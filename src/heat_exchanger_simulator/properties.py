@@ -0,0 +1,236 @@
+#fluid and material property database (CSV/JSON sources compiled to a .npz cache)
+import csv
+import functools
+import json
+import os
+from pathlib import Path
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_SOURCES = (DATA_DIR / "fluids.csv", DATA_DIR / "fluid_tables.csv", DATA_DIR / "materials.csv", DATA_DIR / "mixtures.csv")
+DEFAULT_CACHE = DATA_DIR / "properties.npz"
+# Extra property files (os.pathsep separated), loaded after the bundled ones
+SOURCES_ENV = "HX_PROPERTY_DATA"
+
+FLUID_PROPERTIES = ("specific_heat_capacity", "density", "viscosity", "thermal_conductivity")
+MATERIAL_PROPERTIES = ("thermal_conductivity", "roughness")
+CACHE_VERSION = 2
+
+def _rows(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(line for line in file if line.strip() and not line.startswith("#"))
+
+def _number(value, what, allow_zero=False, allow_negative=False):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{what}: '{value}' is not a number.")
+    if not np.isfinite(number) or (number < 0 and not allow_negative) or (number == 0 and not allow_zero):
+        raise ValueError(f"{what}: {value} is out of range.")
+    return number
+
+def _name(value, what):
+    name = str(value or "").strip().lower()
+    if not name:
+        raise ValueError(f"{what}: missing name.")
+    return name
+
+def _pair(value, what):
+    """Normalized "base+additive" name of a mixture table."""
+    components = [_name(component, what) for component in str(value or "").split("+")]
+    if len(components) != 2:
+        raise ValueError(f"{what}: mixture '{value}' must be written 'base+additive'.")
+    return "+".join(components)
+
+def _read_source(path):
+    """Parse one source into (fluids, tables, materials, mixtures) dicts keyed by name."""
+    fluids, tables, materials, mixtures = {}, {}, {}, {}
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        for name, entry in data.get("fluids", {}).items():
+            name = _name(name, f"{path}")
+            fluids[name] = {key: entry[key] for key in FLUID_PROPERTIES if key in entry}
+            if "table" in entry:
+                tables[name] = entry["table"]
+        for name, entry in data.get("materials", {}).items():
+            materials[_name(name, f"{path}")] = entry
+        for name, entry in data.get("mixtures", {}).items():
+            mixtures[_pair(name, f"{path}")] = entry
+        return fluids, tables, materials, mixtures
+
+    rows = list(_rows(path))
+    columns = set(rows[0]) if rows else set()
+    if "temperature" in columns or "fraction" in columns:
+        # Long format: one row per (fluid, temperature) or (mixture, additive mass fraction)
+        axis, target, parse = ("temperature", tables, _name) if "temperature" in columns else ("fraction", mixtures, _pair)
+        for number, row in enumerate(rows, start=1):
+            table = target.setdefault(parse(row.get("name"), f"{path} line {number}"), {})
+            for key in (axis,) + FLUID_PROPERTIES:
+                table.setdefault(key, []).append(row.get(key))
+        return fluids, tables, materials, mixtures
+    target, keys = (materials, MATERIAL_PROPERTIES) if "roughness" in columns else (fluids, FLUID_PROPERTIES)
+    for number, row in enumerate(rows, start=1):
+        name = _name(row.get("name"), f"{path} line {number}")
+        if name in target:
+            raise ValueError(f"{path}: '{name}' is listed twice.")
+        target[name] = {key: row.get(key) for key in keys}
+    return fluids, tables, materials, mixtures
+
+def compile_database(sources=DEFAULT_SOURCES):
+    """
+    Read and validate property sources into flat arrays.
+
+    CSV files are recognized by their columns: fluids (name + FLUID_PROPERTIES), temperature
+    tables (name, temperature + FLUID_PROPERTIES, one row per point), mixture tables (name
+    "base+additive", fraction = additive mass fraction + FLUID_PROPERTIES) or materials (name,
+    thermal_conductivity, roughness). JSON files hold {"fluids": {name: {..., "table": {...}}},
+    "materials": {name: {...}}, "mixtures": {"base+additive": {"fraction": [...], ...}}}.
+    Later sources override earlier ones with the same name.
+
+    Args:
+        sources (list): Property files.
+
+    Returns:
+        dict: "fluids" and "materials" (name arrays), one array per property, the temperature
+        tables stored end to end ("table_offsets", "table_temperature", "table_<property>") and
+        the mixture tables in the same layout ("mixtures", "mixture_offsets", "mixture_fraction", ...).
+
+    Raises:
+        ValueError: If a value is missing or out of range, or a table is not sorted.
+    """
+    fluids, tables, materials, mixtures = {}, {}, {}, {}
+    for path in sources:
+        source_fluids, source_tables, source_materials, source_mixtures = _read_source(path)
+        fluids.update(source_fluids)
+        tables.update(source_tables)
+        materials.update(source_materials)
+        mixtures.update(source_mixtures)
+
+    database = {"fluids": np.array(list(fluids), dtype=str), "materials": np.array(list(materials), dtype=str)}
+    for key in FLUID_PROPERTIES:
+        database[key] = np.array([_number(entry.get(key), f"Fluid '{name}' {key}") for name, entry in fluids.items()])
+    for key in MATERIAL_PROPERTIES:
+        database[f"material_{key}"] = np.array(
+            [_number(entry.get(key), f"Material '{name}' {key}", allow_zero=key == "roughness") for name, entry in materials.items()]
+        )
+
+    unknown = sorted(set(tables) - set(fluids))
+    unknown += sorted(pair for pair in mixtures if any(name not in fluids for name in pair.split("+")))
+    if unknown:
+        raise ValueError(f"Tables for unknown fluid(s): {', '.join(unknown)}.")
+    database.update(_pack_tables("table", "temperature", list(fluids), tables))
+    database["mixtures"] = np.array(list(mixtures), dtype=str)
+    database.update(_pack_tables("mixture", "fraction", list(mixtures), mixtures))
+    return database
+
+def _pack_tables(prefix, axis, names, tables):
+    """Store one table per name end to end, with offsets (empty tables for names without one)."""
+    offsets = [0]
+    columns = {key: [] for key in (axis,) + FLUID_PROPERTIES}
+    for name in names:
+        table = tables.get(name, {})
+        positions = [_number(x, f"'{name}' table {axis}", True, axis == "temperature") for x in table.get(axis, [])]
+        if np.any(np.diff(positions) <= 0):
+            raise ValueError(f"'{name}': table {axis} values must be strictly increasing.")
+        if axis == "fraction" and positions and not 0 < positions[0] <= positions[-1] < 1:
+            raise ValueError(f"'{name}': mixture fractions must be between 0 and 1 (pure components are added automatically).")
+        columns[axis] += positions
+        for key in FLUID_PROPERTIES:
+            values = table.get(key, [])
+            if len(values) != len(positions):
+                raise ValueError(f"'{name}': table column {key} has {len(values)} values for {len(positions)} rows.")
+            columns[key] += [_number(value, f"'{name}' table {key}") for value in values]
+        offsets.append(len(columns[axis]))
+    packed = {f"{prefix}_offsets": np.array(offsets, dtype=np.int64)}
+    for key, values in columns.items():
+        packed[f"{prefix}_{key}"] = np.array(values, dtype=float)
+    return packed
+
+def _signature(sources):
+    return np.array([[os.stat(path).st_mtime_ns, os.stat(path).st_size] for path in sources], dtype=np.int64).reshape(-1, 2)
+
+def _read_cache(cache_path, sources):
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            if (int(cache["version"]) != CACHE_VERSION
+                    or cache["sources"].tolist() != [str(path) for path in sources]
+                    or not np.array_equal(cache["signature"], _signature(sources))):
+                return None
+            return {key: cache[key] for key in cache.files if key not in ("version", "sources", "signature")}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _write_cache(cache_path, sources, database):
+    temporary = Path(f"{cache_path}.{os.getpid()}.tmp")
+    try:
+        with open(temporary, "wb") as file:
+            np.savez(file, version=CACHE_VERSION, sources=np.array([str(path) for path in sources], dtype=str),
+                     signature=_signature(sources), **database)
+        os.replace(temporary, cache_path)
+    except OSError:
+        # Read-only installation: the database is simply compiled again next time
+        temporary.unlink(missing_ok=True)
+
+def default_sources():
+    """Bundled property files followed by the ones listed in HX_PROPERTY_DATA."""
+    extra = [path for path in os.environ.get(SOURCES_ENV, "").split(os.pathsep) if path]
+    return tuple(str(Path(path).resolve()) for path in (*DEFAULT_SOURCES, *extra))
+
+@functools.lru_cache(maxsize=None)
+def load_database(sources=None, cache_path=DEFAULT_CACHE, rebuild=False):
+    """
+    Property database, read from the .npz cache when it is newer than the sources.
+
+    The sources are only parsed and validated when one of them changed (modification time
+    or size), then the compiled arrays are saved to cache_path for the next runs.
+
+    Args:
+        sources (tuple, optional): Property files, default_sources() by default.
+        cache_path (str or Path, optional): Compiled cache, None to disable it.
+        rebuild (bool): Ignore an existing cache.
+
+    Returns:
+        dict: See compile_database. The arrays are read-only (shared by every caller).
+    """
+    sources = default_sources() if sources is None else tuple(str(Path(path).resolve()) for path in sources)
+    database = None
+    if cache_path is not None and not rebuild:
+        database = _read_cache(cache_path, sources)
+    if database is None:
+        database = compile_database(sources)
+        if cache_path is not None:
+            _write_cache(cache_path, sources, database)
+    for array in database.values():
+        array.flags.writeable = False
+    return database
+
+def property_at(fluid, key, T, database=None):
+    """
+    Fluid property at a temperature, interpolated in the fluid's table.
+
+    Outside the table the end values are used; fluids without a table return their
+    reference value.
+
+    Args:
+        fluid (str): Fluid name.
+        key (str): A property of FLUID_PROPERTIES.
+        T (float or array): Temperature (°C).
+        database (dict, optional): See load_database.
+
+    Returns:
+        float or numpy.ndarray: Property value(s), same units as the sources.
+
+    Raises:
+        ValueError: If the fluid is unknown.
+    """
+    database = database or load_database()
+    names = database["fluids"].tolist()
+    if fluid.lower() not in names:
+        raise ValueError(f"Unknown fluid '{fluid}'.")
+    index = names.index(fluid.lower())
+    start, end = database["table_offsets"][index], database["table_offsets"][index + 1]
+    if start == end:
+        return np.full(np.shape(T), database[key][index])[()]
+    return np.interp(T, database["table_temperature"][start:end], database[f"table_{key}"][start:end])
@@ -0,0 +1,344 @@
+#local SQLite registry of simulation runs: normalized parameters, summary metrics and result stores
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from export import _columns, _pyarrow, export_results
+from mixtures import is_mixture, parse_mixture
+
+DEFAULT_DIR = Path(__file__).resolve().parent / "runs"
+# Registry database used by the GUI (default: runs/runs.sqlite next to this file)
+REGISTRY_ENV = "HX_RUN_REGISTRY"
+
+# Swept column of each TP: the optimal point is its value where T_out is highest
+AXES = {"TP1": "flow_rates", "TP2": "T_hot_in", "TP3": "hot_fluids", "TP4": "dimensions"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,             -- Unix time
+    tp TEXT NOT NULL,
+    material TEXT,
+    material_family TEXT,              -- material without its grade, "copper" for "copper (pure)"
+    fluid TEXT,                        -- cold fluid
+    hot_fluid TEXT,                    -- NULL when several hot fluids are compared (TP3)
+    parameters TEXT NOT NULL,          -- normalized JSON
+    parameters_hash TEXT NOT NULL,     -- identical setups share it
+    points INTEGER NOT NULL,
+    valid_points INTEGER NOT NULL,
+    max_T_out REAL,
+    optimal_value,                     -- swept value at max_T_out (number, or fluid name for TP3)
+    efficiency_max REAL,
+    efficiency_at_optimum REAL,
+    Q_min REAL,
+    Q_max REAL,
+    store TEXT                         -- full results (see RunRegistry.load_results)
+);
+CREATE TABLE IF NOT EXISTS run_fluids (
+    fluid TEXT NOT NULL,               -- fluid name, and each component of a mixture
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    role TEXT NOT NULL,                -- "cold" or "hot"
+    PRIMARY KEY (fluid, run_id, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_material ON runs(material, efficiency_max);
+CREATE INDEX IF NOT EXISTS runs_material_family ON runs(material_family, efficiency_max);
+CREATE INDEX IF NOT EXISTS runs_tp ON runs(tp, created);
+CREATE INDEX IF NOT EXISTS runs_efficiency ON runs(efficiency_max);
+CREATE INDEX IF NOT EXISTS runs_T_out ON runs(max_T_out);
+CREATE INDEX IF NOT EXISTS runs_parameters ON runs(parameters_hash);
+CREATE INDEX IF NOT EXISTS run_fluids_run ON run_fluids(run_id);
+"""
+
+def default_path():
+    """Registry database of the GUI: $HX_RUN_REGISTRY, or runs/runs.sqlite next to this file."""
+    return Path(os.environ.get(REGISTRY_ENV) or DEFAULT_DIR / "runs.sqlite")
+
+def _normalize(value):
+    # JSON-friendly value: numbers as floats, names lowercased, arrays as lists
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        return text.lower()
+
+def normalize_parameters(parameters):
+    """
+    Canonical form of run parameters, so that identical setups compare equal.
+
+    Args:
+        parameters (dict): Run parameters, e.g. the GUI fields (strings) or keyword arguments.
+
+    Returns:
+        tuple: (JSON text with sorted keys, its SHA-1 hash).
+    """
+    text = json.dumps(_normalize(parameters), sort_keys=True, separators=(",", ":"))
+    return text, hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def material_family(name):
+    """
+    Material without its grade: "copper (pure)" and "copper (annealed)" are both "copper".
+
+    Args:
+        name (str): Material name, as listed in materials.csv.
+
+    Returns:
+        str: Lowercase family name (the name itself when it has no grade).
+    """
+    return str(name).strip().lower().split(" (")[0]
+
+def _fluid_names(name):
+    # A mixture is found by its full name and by each of its components
+    name = str(name).strip().lower()
+    if not is_mixture(name):
+        return [name]
+    base, additive, _ = parse_mixture(name)
+    return [name, base, additive]
+
+def summarize(tp_name, results):
+    """
+    Summary metrics of a sweep.
+
+    Args:
+        tp_name (str): Name of the TP ("TP1" to "TP4").
+        results (dict): Simulation results.
+
+    Returns:
+        dict: "points", "valid_points", "max_T_out" (°C), "optimal_value" (swept value at
+        max_T_out), "efficiency_max", "efficiency_at_optimum", "Q_min" and "Q_max" (W);
+        NaN metrics are None.
+    """
+    T_out = np.asarray(results["T_out"], dtype=float)
+    efficiency = np.asarray(results["efficiency"], dtype=float)
+    Q = np.asarray(results["Q"], dtype=float)
+    number = lambda value: float(value) if np.isfinite(value) else None
+    summary = {"points": len(T_out), "valid_points": int(np.count_nonzero(results["valid"]))}
+    if not np.isfinite(T_out).any():
+        return dict(summary, max_T_out=None, optimal_value=None, efficiency_max=None, efficiency_at_optimum=None, Q_min=None, Q_max=None)
+    optimum = int(np.nanargmax(T_out))
+    axis = results.get(AXES.get(tp_name))
+    optimal_value = None if axis is None else axis[optimum]
+    return dict(
+        summary,
+        max_T_out=number(T_out[optimum]),
+        optimal_value=optimal_value if isinstance(optimal_value, str) or optimal_value is None else float(optimal_value),
+        efficiency_max=number(np.nanmax(efficiency)),
+        efficiency_at_optimum=number(efficiency[optimum]),
+        Q_min=number(np.nanmin(Q)),
+        Q_max=number(np.nanmax(Q)),
+    )
+
+class RunRegistry:
+    """
+    Indexed SQLite database of past simulation runs.
+
+    Each run stores its normalized parameters, summary metrics (see summarize) and the
+    path of its full results, written next to the database. Queries on the material,
+    fluids, TP and metrics go through indexes and take milliseconds over tens of
+    thousands of runs.
+    """
+    def __init__(self, path=None, store_dir=None, store_format=None):
+        """
+        Args:
+            path (str, optional): Database file (see default_path), ":memory:" for a temporary one.
+            store_dir (str, optional): Directory of the result stores, "<database name>_results"
+                next to the database by default; no stores are written for ":memory:".
+            store_format (str, optional): ".parquet" (needs pyarrow, the default when installed),
+                ".feather" or ".npz".
+        """
+        path = default_path() if path is None else path
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            store_dir = Path(path).with_name(Path(path).stem + "_results") if store_dir is None else Path(store_dir)
+        self.path = path
+        self.store_dir = store_dir
+        if store_format is None:
+            try:
+                _pyarrow()
+                store_format = ".parquet"
+            except ImportError:
+                store_format = ".npz"
+        self.store_format = store_format
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if str(path) != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        self._add_material_family()
+        self.connection.executescript(SCHEMA)
+
+    def _add_material_family(self):
+        # Databases written before material_family existed get the column and its values
+        columns = [row["name"] for row in self.connection.execute("PRAGMA table_info(runs)")]
+        if columns and "material_family" not in columns:
+            self.connection.create_function("material_family", 1, material_family, deterministic=True)
+            with self.connection:
+                self.connection.execute("ALTER TABLE runs ADD COLUMN material_family TEXT")
+                self.connection.execute("UPDATE runs SET material_family = material_family(material) WHERE material IS NOT NULL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def register(self, tp_name, parameters, results, store=True, created=None):
+        """
+        Record a run.
+
+        Args:
+            tp_name (str): Name of the TP ("TP1" to "TP4").
+            parameters (dict): Run parameters ("fluid", "hot_fluid" and "material" are indexed).
+            results (dict): Simulation results.
+            store (bool): Also write the full results to the store directory.
+            created (float, optional): Unix time of the run, now by default.
+
+        Returns:
+            int: Run id.
+        """
+        text, digest = normalize_parameters(parameters)
+        normalized = json.loads(text)
+        summary = summarize(tp_name, results)
+        material = normalized.get("material")
+        hot_fluids = results["hot_fluids"] if "hot_fluids" in results else [normalized.get("hot_fluid")]
+        fluids = {(name, "cold") for name in _fluid_names(normalized["fluid"])} if "fluid" in normalized else set()
+        fluids |= {(name, "hot") for fluid in hot_fluids if fluid is not None for name in _fluid_names(fluid)}
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (created, tp, material, material_family, fluid, hot_fluid, parameters, parameters_hash, points, "
+                "valid_points, max_T_out, optimal_value, efficiency_max, efficiency_at_optimum, Q_min, Q_max) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time() if created is None else created, tp_name.upper(), material,
+                 None if material is None else material_family(material), normalized.get("fluid"),
+                 normalized.get("hot_fluid") if "hot_fluids" not in results else None, text, digest, summary["points"],
+                 summary["valid_points"], summary["max_T_out"], summary["optimal_value"], summary["efficiency_max"],
+                 summary["efficiency_at_optimum"], summary["Q_min"], summary["Q_max"]),
+            ).lastrowid
+            self.connection.executemany("INSERT INTO run_fluids (fluid, run_id, role) VALUES (?, ?, ?)",
+                                        [(name, run_id, role) for name, role in sorted(fluids)])
+            if store and self.store_dir is not None:
+                path = Path(self.store_dir) / f"run_{run_id}{self.store_format}"
+                self._write_store(results, path)
+                self.connection.execute("UPDATE runs SET store = ? WHERE id = ?", (str(path), run_id))
+        return run_id
+
+    def _write_store(self, results, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.store_format == ".npz":
+            np.savez(path, **{key: np.asarray(value) for key, value in _columns(results)[0].items()})
+        else:
+            export_results(results, path)
+
+    def find(self, tp=None, material=None, fluid=None, hot_fluid=None, min_efficiency=None, min_T_out=None,
+             since=None, where=None, params=(), order_by="created DESC", limit=None):
+        """
+        Runs matching all the given filters, newest first.
+
+        Args:
+            tp (str, optional): TP name.
+            material (str, optional): Pipe material, either a full name ("copper (pure)") or
+                a family ("copper" matches every copper grade).
+            fluid (str, optional): A cold or hot fluid of the run (mixture components match too).
+            hot_fluid (str, optional): A hot fluid of the run.
+            min_efficiency (float, optional): Lowest accepted efficiency_max (exclusive).
+            min_T_out (float, optional): Lowest accepted max_T_out (°C, exclusive).
+            since (float, optional): Only runs created after this Unix time.
+            where (str, optional): Extra SQL condition on the runs columns, e.g. "Q_max < ?".
+            params (tuple): Values of the ? placeholders of where.
+            order_by (str): SQL ordering of the runs columns.
+            limit (int, optional): Maximum number of runs.
+
+        Returns:
+            list: One dict per run (the runs columns, "parameters" decoded).
+        """
+        conditions, values = [], []
+        if tp is not None:
+            conditions.append("tp = ?")
+            values.append(tp.upper())
+        if material is not None:
+            name = material.strip().lower()
+            # Both columns are indexed, SQLite answers the OR with the two indexes
+            conditions.append("(material = ? OR material_family = ?)")
+            values += [name, name]
+        for name, role in ((fluid, None), (hot_fluid, "hot")):
+            if name is not None:
+                conditions.append("id IN (SELECT run_id FROM run_fluids WHERE fluid = ?" + (" AND role = ?)" if role else ")"))
+                values += [name.strip().lower()] + ([role] if role else [])
+        for column, bound in (("efficiency_max", min_efficiency), ("max_T_out", min_T_out), ("created", since)):
+            if bound is not None:
+                conditions.append(f"{column} > ?")
+                values.append(bound)
+        if where:
+            conditions.append(f"({where})")
+            values += list(params)
+        sql = "SELECT * FROM runs" + (" WHERE " + " AND ".join(conditions) if conditions else "") + f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            values.append(int(limit))
+        return [self._run(row) for row in self.connection.execute(sql, values)]
+
+    @staticmethod
+    def _run(row):
+        run = dict(row)
+        run["parameters"] = json.loads(run["parameters"])
+        return run
+
+    def get(self, run_id):
+        """
+        One run.
+
+        Raises:
+            KeyError: If there is no run with this id.
+        """
+        row = self.connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(run_id)
+        return self._run(row)
+
+    def load_results(self, run_id):
+        """
+        Full results of a run.
+
+        Returns:
+            pandas.DataFrame: One row per point.
+
+        Raises:
+            KeyError: If the run does not exist.
+            FileNotFoundError: If the run has no result store (or it was deleted).
+        """
+        store = self.get(run_id)["store"]
+        if store is None or not Path(store).exists():
+            raise FileNotFoundError(f"Run {run_id} has no result store.")
+        if store.endswith(".npz"):
+            with np.load(store) as data:
+                return pd.DataFrame({key: data[key] for key in data.files})
+        return pd.read_parquet(store) if store.endswith(".parquet") else pd.read_feather(store)
+
+    def delete(self, run_id):
+        """Remove a run and its result store."""
+        store = self.get(run_id)["store"]
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        if store:
+            Path(store).unlink(missing_ok=True)
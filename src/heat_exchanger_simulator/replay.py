@@ -0,0 +1,169 @@
+#replay of plant historian data (CSV) through the batch engine, chunk by chunk
+import time
+import warnings
+import numpy as np
+import profiling
+from core import _precision, solve_points
+
+# Model input -> default historian column; T_cold_out (measured outlet) is optional
+HISTORIAN_COLUMNS = {
+    "flow_cold": "flow_cold",
+    "flow_hot": "flow_hot",
+    "T_cold_in": "T_cold_in",
+    "T_hot_in": "T_hot_in",
+    "T_cold_out": "T_cold_out",
+}
+
+OUTPUT_DTYPE = np.dtype([
+    ("row", "<i8"),                  # data row of the input file (0 = first row after the header)
+    ("T_out_measured", "<f8"),
+    ("T_out_predicted", "<f8"),
+    ("residual", "<f8"),             # predicted - measured (°C)
+    ("Q", "<f8"),
+    ("reason", "<i4"),               # see core.describe_reason
+])
+
+class _CsvWriter:
+    def __init__(self, path, dtype=OUTPUT_DTYPE):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.names = dtype.names
+        self.file.write(",".join(self.names) + "\n")
+        self.line = (",".join("{:.6g}" if dtype[name].kind == "f" else "{}" for name in self.names) + "\n").format
+
+    def write(self, records):
+        columns = [records[name].tolist() for name in self.names]
+        self.file.write("".join(map(self.line, *columns)))
+
+    def close(self):
+        self.file.close()
+
+class _NpyWriter:
+    # .npy file whose row count is only known at the end: the header is written with room
+    # for any count, then rewritten in place
+    HEADER_SIZE = 256
+
+    def __init__(self, path, dtype=OUTPUT_DTYPE):
+        self.file = open(path, "wb")
+        self.dtype = dtype
+        self.rows = 0
+        self._header()
+
+    def _header(self):
+        header = repr({"descr": self.dtype.descr, "fortran_order": False, "shape": (self.rows,)})
+        header = header.ljust(self.HEADER_SIZE - 10 - 1) + "\n"
+        self.file.seek(0)
+        self.file.write(b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1"))
+
+    def write(self, records):
+        self.file.write(records.tobytes())
+        self.rows += len(records)
+
+    def close(self):
+        self._header()
+        self.file.close()
+
+def _record_dtype(dtype, precision):
+    # Record layout with the floating fields stored in the given precision (see core.PRECISIONS)
+    float_type = np.dtype(_precision(precision)).newbyteorder("<")
+    return np.dtype([(name, float_type if dtype[name].kind == "f" else dtype[name]) for name in dtype.names])
+
+def _writer(path, dtype=OUTPUT_DTYPE):
+    # ".npy" binary records, CSV otherwise
+    return _NpyWriter(path, dtype) if str(path).lower().endswith(".npy") else _CsvWriter(path, dtype)
+
+def _columns(path, columns, delimiter):
+    with open(path, encoding="utf-8") as file:
+        header = [name.strip() for name in file.readline().rstrip("\r\n").split(delimiter)]
+    mapping = dict(HISTORIAN_COLUMNS, **(columns or {}))
+    missing = [name for key, name in mapping.items() if key != "T_cold_out" and name not in header]
+    if missing:
+        raise ValueError(f"Column(s) {', '.join(missing)} not found in {path} (header: {', '.join(header)}).")
+    measured = mapping["T_cold_out"] in header
+    keys = [key for key in HISTORIAN_COLUMNS if key != "T_cold_out" or measured]
+    return keys, [header.index(mapping[key]) for key in keys]
+
+def replay_historian(input_path, output_path, fluid, hot_fluid, material, pipe_properties, gap=0.01,
+                     columns=None, chunk_rows=65_536, delimiter=",", max_iter=5, tol=None, correlation=None,
+                     precision="float64"):
+    """
+    Run historian data through the model and stream predictions and residuals to a file.
+
+    The input is read chunk_rows rows at a time and every chunk is solved as one batch,
+    so memory does not depend on the file size. Rows that cannot be solved (invalid flow,
+    temperature cross, ...) are written with NaN predictions and their reason code.
+
+    Args:
+        input_path (str): Historian CSV file with a header line. Missing values must be
+            written nan (those rows are reported as invalid), not left empty.
+        output_path (str): Output file: ".npy" (binary records, fastest, np.load(path, mmap_mode="r"))
+            or anything else for CSV. The fields are those of OUTPUT_DTYPE.
+        fluid (str): Cold fluid name.
+        hot_fluid (str): Hot fluid name.
+        material (str): Pipe material.
+        pipe_properties (dict): Pipe properties (outer_diameter, thickness, length).
+        gap (float): Gap between pipes (m).
+        columns (dict, optional): Historian column names, overriding HISTORIAN_COLUMNS
+            (e.g. {"T_hot_in": "TI-204"}). Without a measured outlet column the residuals are NaN.
+        chunk_rows (int): Rows per batch.
+        delimiter (str): Field separator.
+        max_iter (int): Maximum fixed-point iterations per row.
+        tol (float, optional): Stop iterating a row once its outlet temperature moves less than tol (°C).
+        correlation (str or dict, optional): Nusselt correlation(s), see core.solve_points.
+        precision (str): "float64", or "float32" to solve the chunks and store the floating
+            fields in single precision (half the output size), see core.solve_points.
+
+    Returns:
+        dict: "rows", "valid" (rows solved), "measured" (rows with a finite residual),
+        "residual_mean", "residual_rms", "residual_max" (largest |residual|, °C) and "rows_per_second".
+    """
+    keys, indices = _columns(input_path, columns, delimiter)
+    dtype = _record_dtype(OUTPUT_DTYPE, precision)
+    writer = _writer(output_path, dtype)
+    rows = valid = measured = 0
+    residual_sum = residual_squares = residual_max = 0.0
+    start = time.perf_counter()
+    try:
+        with open(input_path, encoding="utf-8") as file:
+            file.readline()
+            while True:
+                with profiling.span("replay.read", "replay"), warnings.catch_warnings():
+                    warnings.simplefilter("ignore")  # "input contained no data" at the end of the file
+                    data = np.loadtxt(file, delimiter=delimiter, usecols=indices, max_rows=chunk_rows, ndmin=2)
+                if len(data) == 0:
+                    break
+                inputs = dict(zip(keys, data.T))
+                with profiling.span("replay.solve", "replay"):
+                    points = solve_points(fluid, hot_fluid, material, inputs["flow_cold"], inputs["flow_hot"],
+                                          inputs["T_cold_in"], inputs["T_hot_in"], pipe_properties, gap,
+                                          max_iter, tol, correlation, precision)
+                records = np.empty(len(data), dtype=dtype)
+                records["row"] = np.arange(rows, rows + len(data))
+                records["T_out_measured"] = inputs.get("T_cold_out", np.nan)
+                records["T_out_predicted"] = points["T_out"]
+                records["residual"] = records["T_out_predicted"] - records["T_out_measured"]
+                records["Q"] = points["Q"]
+                records["reason"] = points["reason"]
+                with profiling.span("replay.write", "replay"):
+                    writer.write(records)
+
+                # Statistics accumulated in float64 whatever the stored precision
+                residual = records["residual"][np.isfinite(records["residual"])].astype(float)
+                rows += len(data)
+                valid += int(points["valid"].sum())
+                measured += len(residual)
+                residual_sum += float(residual.sum())
+                residual_squares += float(residual @ residual)
+                if len(residual):
+                    residual_max = max(residual_max, float(np.abs(residual).max()))
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "valid": valid,
+        "measured": measured,
+        "residual_mean": residual_sum / measured if measured else float("nan"),
+        "residual_rms": (residual_squares / measured) ** 0.5 if measured else float("nan"),
+        "residual_max": residual_max if measured else float("nan"),
+        "rows_per_second": rows / elapsed if elapsed > 0 else float("inf"),
+    }
@@ -1,39 +1,32 @@
 import time
 import os
+import io
+import hashlib
+import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 from plotting import generate_plot
-import tkinter as tk
-from tkinter import filedialog, messagebox
+import profiling
 from utils import specific_heat_capacity
+from report_native import render_html, render_pdf
+from report_content import (EQUATIONS, EQUATIONS_TEXT, MISSING_RESULTS_TEXT, OPTIMAL_RESULTS_TEXT, SETUP_TEXT,
+                            conclusion_text, figure_caption, introduction_text, optimal_results,
+                            parameter_items, qualitative_analysis_text, report_title)
 
 
-def demander_nom_fichier(tp_name, results, params):
-    def valider(tp_name, results, params):
-        nonlocal nom_de_fichier
-        nom_de_fichier = entry.get()
-        no.destroy()  # Ferme la fenêtre une fois validé
-        save_folder(tp_name, results, params,nom_de_fichier)
-
-
-    nom_de_fichier = None  # Valeur par défaut
-    no = tk.Tk()
-    no.geometry("400x250")
-    no.title("Nom du fichier")
-
-    label = tk.Label(no, text="Entrez le nom du fichier (sans extension) :")
-    label.pack(pady=10)
-
-    entry = tk.Entry(no, width=40)
-    entry.pack(pady=10)
-
-    bouton_valider = tk.Button(no, text="Valider", command=lambda :valider(tp_name, results, params))
-    bouton_valider.pack(pady=10)
-
-    no.mainloop()
+def latex_escape(text):
+    """
+    Escape the characters of plain report text that are special in LaTeX.
 
+    Args:
+        text (str): Plain text.
 
+    Returns:
+        str: LaTeX-safe text.
+    """
+    return str(text).replace('%', '\\%').replace('#', '\\#')
 
 def ecriture_graphique(file, tp_name, results, plo_path):
     """
@@ -45,7 +38,7 @@ def ecriture_graphique(file, tp_name, results, plo_path):
         results (dict): Simulation results.
         plo_path (str): Path to the PNG plot.
     """
-    caption = f"Simulation results for {tp_name} [H]"
+    caption = f"{figure_caption(tp_name)} [H]"
     label = f"fig:{tp_name.lower()}_results"
     file.write(f'''\\begin{{figure}}[htb!]
         \\centering
@@ -63,61 +56,23 @@ def ecriture_results(file, tp_name, results):
         tp_name (str): Name of the TP.
         results (dict): Simulation results.
     """
-    required_keys = ["T_out", "Q", "efficiency", "U", "delta_T_lm", "h_internal", "h_external", "A"]
-    if not all(key in results for key in required_keys):
+    optimal = optimal_results(results)
+    if optimal is None:
         file.write(f'''\\subsection{{Optimal Results}}
-Les résultats optimaux n'ont pas pu être calculés en raison de données manquantes.
+{MISSING_RESULTS_TEXT}
 ''')
         return
 
-    max_T_out_idx = np.argmax(results["T_out"])
-    T_out = round(results["T_out"][max_T_out_idx], 2)
-    Q = round(results["Q"][max_T_out_idx], 2)
-    efficiency = round(results["efficiency"][max_T_out_idx] * 100, 2)
-    U = round(results["U"][max_T_out_idx], 2)
-    delta_T_lm = round(results["delta_T_lm"][max_T_out_idx], 2)
-    h_internal = round(results["h_internal"][max_T_out_idx], 2)
-    h_external = round(results["h_external"][max_T_out_idx], 2)
-    A = round(results["A"][max_T_out_idx], 4)
-
+    items = "\n".join(f"    \\item {sentence}: {value} {latex_escape(unit)}" for sentence, value, unit in optimal)
     file.write(f'''\\subsection{{Optimal Results}}
-For the optimal parameters maximizing the outlet temperature, the simulation yields the following results:
+{OPTIMAL_RESULTS_TEXT}
 \\begin{{itemize}}
-    \\item The outlet temperature is: {T_out} °C
-    \\item The heat transferred is: {Q} W
-    \\item The efficiency is: {efficiency} \\%
-    \\item The overall heat transfer coefficient (U) is: {U} W/m²·K
-    \\item The logarithmic mean temperature difference (LMTD) is: {delta_T_lm} °C
-    \\item The internal convection coefficient is: {h_internal} W/m²·K
-    \\item The external convection coefficient is: {h_external} W/m²·K
-    \\item The heat transfer surface area is: {A} m²
+{items}
 \\end{{itemize}}\n''')
 
     # Qualitative Analysis
     file.write(f'''\\subsection{{Qualitative Analysis}}\n''')
-    if tp_name == "TP1":
-        analysis = (
-            "The results show that increasing the cold fluid flow rate enhances the heat transfer rate due to a higher internal convection coefficient, driven by an increased Reynolds number. "
-            "However, beyond a certain point, the outlet temperature decreases because the fluid spends less time in the exchanger, reducing the heat absorbed. "
-            "The optimal flow rate balances these effects, maximizing the outlet temperature while maintaining efficient heat transfer."
-        )
-    elif tp_name == "TP2":
-        analysis = (
-            "Higher hot fluid inlet temperatures increase the outlet temperature and heat transfer rate by enlarging the logarithmic mean temperature difference, which drives heat transfer. "
-            "The efficiency may slightly decrease at very high temperatures due to a larger maximum possible heat transfer, but the overall performance improves with greater temperature gradients."
-        )
-    elif tp_name == "TP3":
-        analysis = (
-            "Different hot fluids affect performance through their thermophysical properties, such as specific heat capacity and viscosity. "
-            "Fluids with higher specific heat capacities transfer more heat, increasing the outlet temperature and heat transfer rate. "
-            "The choice of fluid significantly influences the exchanger's effectiveness, with optimal fluids balancing high heat capacity and favorable flow characteristics."
-        )
-    elif tp_name == "TP4":
-        analysis = (
-            "Varying pipe dimensions impacts the heat transfer surface area and flow dynamics. Longer pipes or larger diameters increase the surface area, enhancing heat transfer and outlet temperature."
-            "However, larger diameters may reduce flow velocity, affecting convection coefficients. The optimal dimension maximizes heat transfer while maintaining efficient flow regimes."
-        )
-    file.write(f'{analysis}\n')
+    file.write(f'{qualitative_analysis_text(tp_name)}\n')
 
 def ecriture_equation(file, tp_name):
     """
@@ -127,38 +82,18 @@ def ecriture_equation(file, tp_name):
         file: Open LaTeX file.
         tp_name (str): Name of the TP.
     """
-    file.write(f'''The simulation relies on the following key equations to model the heat exchanger's performance:
-
-\\begin{{itemize}}
-    \\item \\textbf{{Heat transfer by the cold fluid}}:
-    \\begin{{equation}}\\label{{eq:{tp_name.lower()}_heat_transfer}}
-    Q = \\dot{{m}} \\cdot c_p \\cdot (T_{{out}} - T_{{in}})
-    \\end{{equation}}
-    This equation calculates the heat transfer rate ($Q$) based on the mass flow rate ($\\dot{{m}}$), specific heat capacity ($c_p$), and temperature difference between the outlet ($T_{{out}}$) and inlet ($T_{{in}}$) of the cold fluid. It quantifies the energy absorbed by the cold fluid.
-
-    \\item \\textbf{{Overall heat transfer}}:
-    \\begin{{equation}}\\label{{eq:{tp_name.lower()}_overall_transfer}}
-    Q = U \\cdot A \\cdot \\Delta T_{{lm}}
+    blocks = []
+    for title, label, expression, explanation in EQUATIONS:
+        blocks.append(f'''    \\item \\textbf{{{title}}}:
+    \\begin{{equation}}\\label{{eq:{tp_name.lower()}_{label}}}
+    {expression}
     \\end{{equation}}
-    This equation computes the heat transfer rate ($Q$) using the overall heat transfer coefficient ($U$), the heat transfer surface area ($A$), and the logarithmic mean temperature difference ($\\Delta T_{{lm}}$). It describes the total heat exchanged between the fluids.
+    {explanation}''')
+    equations_block = "\n\n".join(blocks)
+    file.write(f'''{EQUATIONS_TEXT}
 
-    \\item \\textbf{{Logarithmic mean temperature difference (LMTD)}}:
-    \\begin{{equation}}\\label{{eq:{tp_name.lower()}_lmtd}}
-    \\Delta T_{{lm}} = \\frac{{\\Delta T_1 - \\Delta T_2}}{{\\ln(\\Delta T_1 / \\Delta T_2)}}
-    \\end{{equation}}
-    The LMTD accounts for the temperature gradient along the exchanger, where $\\Delta T_1$ and $\\Delta T_2$ are the temperature differences at the two ends. It is critical for calculating the driving force for heat transfer in counter-flow exchangers.
-
-    \\item \\textbf{{Reynolds number}}:
-    \\begin{{equation}}\\label{{eq:{tp_name.lower()}_reynolds}}
-    Re = \\frac{{\\rho v D}}{{\\mu}}
-    \\end{{equation}}
-    The Reynolds number ($Re$) determines the flow regime (laminar or turbulent) using fluid density ($\\rho$), velocity ($v$), characteristic length ($D$), and dynamic viscosity ($\\mu$). It influences the convection coefficients and heat transfer efficiency.
-
-    \\item \\textbf{{Nusselt number (Dittus-Boelter correlation)}}:
-    \\begin{{equation}}\\label{{eq:{tp_name.lower()}_nusselt}}
-    Nu = 0.023 \\cdot Re^{{0.8}} \\cdot Pr^{{0.4}}
-    \\end{{equation}}
-    The Nusselt number ($Nu$) relates to the convection coefficient ($h$) via $h = Nu \\cdot k / D$, where $k$ is the thermal conductivity and $D$ is the diameter. The Dittus-Boelter correlation is used for turbulent flow to estimate $h$, which affects $U$.
+\\begin{{itemize}}
+{equations_block}
 \\end{{itemize}}\n''')
 
 def ecriture_itemiz(file, params, results):
@@ -170,73 +105,11 @@ def ecriture_itemiz(file, params, results):
         params (dict): Simulation parameters.
         results (dict): Simulation results.
     """
-    # Default values
-    defaults = {
-        'fluid': 'water',
-        'hot_fluid': 'water',
-        'material': 'stainless steel',
-        'T_cold_in': 20,
-        'T_hot_in': 50,
-        'pipe_length': 2,
-        'pipe_diameter': 0.1,
-        'pipe_thickness': 0.005,
-        'gap': 0.01,
-        'flow_cold': 10,
-        'flow_hot': 10,
-        'T_hot_start': 50,
-        'T_hot_end': 100,
-        'T_hot_steps': 20,
-        'flow_start': 5,
-        'flow_end': 15,
-        'flow_steps': 10,
-        'dim_start': 0.05,
-        'dim_end': 0.15,
-        'dim_steps': 10,
-        'dimension_type': 'length'
-    }
-    
-    # Nettoyer les paramètres pour éviter les caractères problématiques
-    safe_params = {k: str(params.get(k, defaults.get(k, 'N/A'))).replace('_', ' ').replace('%', '\\%').replace('#', '\\#') for k in defaults.keys()}
-    
-    items = [
-        f"\\item Cold Fluid: {safe_params['fluid']}{' (default)' if 'fluid' not in params else ''}",
-        f"\\item Hot Fluid: {safe_params['hot_fluid']}{' (default)' if 'hot_fluid' not in params else ''}",
-        f"\\item Material: {safe_params['material']}{' (default)' if 'material' not in params else ''}",
-        f"\\item Cold Inlet Temperature: {safe_params['T_cold_in']} °C{' (default)' if 'T_cold_in' not in params else ''}",
-        f"\\item Hot Inlet Temperature: {safe_params['T_hot_in']} °C{' (default)' if 'T_hot_in' not in params else ''}",
-        f"\\item Pipe Length: {safe_params['pipe_length']} m{' (default)' if 'pipe_length' not in params else ''}",
-        f"\\item Pipe Diameter: {safe_params['pipe_diameter']} m{' (default)' if 'pipe_diameter' not in params else ''}",
-        f"\\item Pipe Thickness: {safe_params['pipe_thickness']} m{' (default)' if 'pipe_thickness' not in params else ''}",
-        f"\\item Gap: {safe_params['gap']} m{' (default)' if 'gap' not in params else ''}",
-    ]
-    
-    if "flow_start" in params or 'flow_start' in safe_params:
-        items.append(f"\\item Start Flow Rate: {safe_params['flow_start']} L/min{' (default)' if 'flow_start' not in params else ''}")
-        items.append(f"\\item End Flow Rate: {safe_params['flow_end']} L/min{' (default)' if 'flow_end' not in params else ''}")
-        items.append(f"\\item Flow Steps: {safe_params['flow_steps']}{' (default)' if 'flow_steps' not in params else ''}")
-    if "flow_cold" in params or 'flow_cold' in safe_params:
-        items.append(f"\\item Cold Flow Rate: {safe_params['flow_cold']} L/min{' (default)' if 'flow_cold' not in params else ''}")
-    if "flow_hot" in params or 'flow_hot' in safe_params:
-        items.append(f"\\item Hot Flow Rate: {safe_params['flow_hot']} L/min{' (default)' if 'flow_hot' not in params else ''}")
-    if "T_hot_start" in params or 'T_hot_start' in safe_params:
-        items.append(f"\\item Start Hot Temperature: {safe_params['T_hot_start']} °C{' (default)' if 'T_hot_start' not in params else ''}")
-        items.append(f"\\item End Hot Temperature: {safe_params['T_hot_end']} °C{' (default)' if 'T_hot_end' not in params else ''}")
-        items.append(f"\\item Hot Temperature Steps: {safe_params['T_hot_steps']}{' (default)' if 'T_hot_steps' not in params else ''}")
-    if "dimension_type" in params or 'dimension_type' in safe_params:
-        items.append(f"\\item Dimension Type: {safe_params['dimension_type']}{' (default)' if 'dimension_type' not in params else ''}")
-        items.append(f"\\item Start Dimension: {safe_params['dim_start']} m{' (default)' if 'dim_start' not in params else ''}")
-        items.append(f"\\item End Dimension: {safe_params['dim_end']} m{' (default)' if 'dim_end' not in params else ''}")
-        items.append(f"\\item Dimension Steps: {safe_params['dim_steps']}{' (default)' if 'dim_steps' not in params else ''}")
-
-    items.extend([
-        f"\\item Average Overall Heat Transfer Coefficient (U): {round(np.mean(results.get('U', [0])), 2)} W/m²·K",
-        f"\\item Average Internal Reynolds Number: {round(np.mean(results.get('Re_internal', [0])), 2)} ({results.get('Re_internal_regime', ['Unknown'])[0]})",
-        f"\\item Average External Reynolds Number: {round(np.mean(results.get('Re_external', [0])), 2)} ({results.get('Re_external_regime', ['Unknown'])[0]})"
-    ])
-
+    items = [f"\\item {latex_escape(item)}" for item in parameter_items(params, results)]
+    items_block = "\n".join(items)
     file.write(f'''\\begin{{itemize}}
     \\setlength\\itemsep{{-0.5em}}
-    {"\n".join(items)}
+    {items_block}
     \\end{{itemize}}\n''')
 
 def ecriture_introduction(file, tp_name):
@@ -247,37 +120,7 @@ def ecriture_introduction(file, tp_name):
         file: Open LaTeX file.
         tp_name (str): Name of the TP.
     """
-    context = (
-        "Heat exchangers are essential devices in industrial and engineering applications, facilitating efficient thermal energy transfer between two fluids without mixing. "
-        "Widely used in power plants, HVAC systems, and chemical processing, they optimize energy efficiency by leveraging temperature gradients. "
-        "This simulation focuses on a counter-flow concentric tube heat exchanger, where fluids flow in opposite directions to maximize heat transfer efficiency."
-    )
-    
-    if tp_name == "TP1":
-        objective = (
-            "The objective of TP1 is to study the effect of the cold fluid flow rate on the heat exchanger's performance. "
-            "By varying the flow rate while keeping other parameters constant (e.g., pipe dimensions, fluid properties, hot fluid conditions), we aim to evaluate its impact on the outlet temperature, heat transfer rate, and efficiency. "
-            "This experiment highlights the trade-off between enhanced convection at higher flow rates and reduced residence time, which affects the heat absorbed."
-        )
-    elif tp_name == "TP2":
-        objective = (
-            "The objective of TP2 is to investigate the influence of the hot fluid inlet temperature on the heat exchanger's performance. "
-            "By adjusting the inlet temperature with fixed flow rates and pipe geometry, we seek to assess its effect on the outlet temperature, heat transfer rate, and efficiency. "
-            "This experiment emphasizes the role of the temperature difference as the primary driving force for heat transfer."
-        )
-    elif tp_name == "TP3":
-        objective = (
-            "The objective of TP3 is to analyze the impact of different hot fluids on the heat exchanger's performance. "
-            "By testing fluids with varying thermophysical properties (e.g., specific heat capacity, viscosity), we aim to identify which fluid maximizes the outlet temperature and heat transfer rate. "
-            "This experiment underscores the critical role of fluid selection in optimizing heat exchanger design."
-        )
-    elif tp_name == "TP4":
-        objective = (
-            "The objective of TP4 is to examine the effect of pipe dimensions (length or diameter) on the heat exchanger's performance. "
-            "By varying one dimension while keeping other parameters constant, we aim to understand its influence on the outlet temperature, heat transfer rate, and efficiency. "
-            "This experiment illustrates the importance of geometry in enhancing heat transfer efficiency."
-        )
-    
+    context, objective = introduction_text(tp_name)
     file.write(f'''\\section{{Introduction}}
 {context}
 
@@ -292,64 +135,51 @@ def ecriture_conclusion(file, tp_name, results):
         tp_name (str): Name of the TP.
         results (dict): Simulation results.
     """
-    max_T_out_idx = np.argmax(results["T_out"])
-    max_T_out = round(results["T_out"][max_T_out_idx], 2)
-
-    if tp_name == "TP1":
-        optimal_param = f"cold fluid flow rate of {results['flow_rates'][max_T_out_idx]} L/min"
-    elif tp_name == "TP2":
-        optimal_param = f"hot fluid inlet temperature of {results['T_hot_in'][max_T_out_idx]} °C"
-    elif tp_name == "TP3":
-        optimal_param = f"hot fluid '{results['hot_fluids'][max_T_out_idx]}'"
-    elif tp_name == "TP4":
-        optimal_param = f"pipe {results.get('dimension_type', 'length')} of {results['dimensions'][max_T_out_idx]} m"
-
-    conclusion = (
-        f"This simulation demonstrates how the varied parameter affects the heat exchanger's performance. "
-        f"The optimal configuration, yielding the highest outlet temperature of {max_T_out} °C, is achieved with a {optimal_param}. "
-        "These results highlight the importance of optimizing the varied parameter to maximize heat transfer efficiency."
-    )
-    
     file.write(f'''\\section{{Conclusion}}
-{conclusion}\n''')
+{conclusion_text(tp_name, results)}\n''')
 
-def ecriture_template(tp_name, results, params, output_dir, base_filename,name):
+class ReportError(Exception):
     """
-    Write the complete LaTeX template with all elements.
-    
+    Error raised while generating a report.
+
+    Attributes:
+        stage (str): Step that failed ("plot", "write", "latex-missing" or "compile").
+        log (str): Compiler output, when available.
+    """
+    def __init__(self, stage, message, log=""):
+        super().__init__(message)
+        self.stage = stage
+        self.log = log
+
+PREAMBLE = '''\\documentclass[12pt]{article}
+\\usepackage[a4paper, total={7in, 8in}]{geometry}
+\\usepackage{graphicx,amssymb,dsfont,fourier,xcolor,amsmath,ulem,filecontents,MnSymbol,wasysym}
+\\usepackage[utf8]{inputenc}
+'''
+
+FORMAT_NAME = "hx_preamble"
+MAX_LATEX_PASSES = 4
+# pdflatex messages of a precompiled format it cannot load (missing, or dumped by another pdfTeX)
+FORMAT_ERRORS = ("I can't find the format file", "Fatal format file error", ".fmt was written by", ".fmt doesn't match")
+
+def ecriture_document(file, tp_name, results, params, output_dir, plo_path):
+    """
+    Write the complete LaTeX document (preamble and body) to an open file.
+
     Args:
+        file: Open LaTeX file (or any text stream).
         tp_name (str): Name of the TP.
         results (dict): Simulation results.
         params (dict): Simulation parameters.
-        output_dir (Path): Output directory.
-        base_filename (str): Base filename (without extension).
-    
-    Returns:
-        tuple: Paths to the generated PDF, LaTeX, and PNG files, or None if failed.
+        output_dir (Path): Directory containing the plot.
+        plo_path (str): Path to the PNG plot.
     """
-    output_dir = Path(output_dir)
-    output_dir.mkdir(exist_ok=True)
-    tex_file = output_dir / f"{name}.tex"
-    
-    try:
-        plo_path = generate_plot(tp_name, results, output_dir)
-        if not Path(plo_path).exists():
-            raise FileNotFoundError(f"Le fichier graphique {plo_path} n'a pas été généré.")
-    except Exception as e:
-        messagebox.showerror("Erreur", f"Échec de la génération du graphique : {str(e)}")
-        return None
-    
-    title = f"Heat Exchanger Simulation Report: {tp_name}"
+    title = report_title(tp_name)
     author = params.get("author", "User")
     date = time.strftime("%d.%m.%Y")
-    
-    try:
-        with open(tex_file, "w", encoding="utf-8") as file:
-            file.write(f'''\\documentclass[12pt]{{article}}
-\\usepackage[a4paper, total={{7in, 8in}}]{{geometry}}
-\\usepackage{{graphicx,amssymb,dsfont,fourier,xcolor,amsmath,ulem,filecontents,MnSymbol,wasysym}}
-\\usepackage[utf8]{{inputenc}}
-\\graphicspath{{{{{output_dir.as_posix()}/}}}} % Chemin pour les images
+
+    file.write(PREAMBLE)
+    file.write(f'''\\graphicspath{{{{{Path(output_dir).as_posix()}/}}}} % Chemin pour les images
 
 \\title{{{title}}}
 \\author{{{author}}}
@@ -360,55 +190,191 @@ def ecriture_template(tp_name, results, params, output_dir, base_filename,name):
 \\tableofcontents
 
 ''')
-            ecriture_introduction(file, tp_name)
-            file.write(f'''
+    ecriture_introduction(file, tp_name)
+    file.write(f'''
 \\section{{Experimental Setup}}
-The following parameters were used in the simulation, with default values applied where user input was not provided:
+{SETUP_TEXT}
 ''')
-            ecriture_itemiz(file, params, results)
-            file.write(f'''
+    ecriture_itemiz(file, params, results)
+    file.write(f'''
 \\section{{Methodology}}
 ''')
-            ecriture_equation(file, tp_name)
-            
-            file.write(f'''
+    ecriture_equation(file, tp_name)
+
+    file.write(f'''
 \\section{{Results and Discussion}}
 ''')
-            ecriture_graphique(file, tp_name, results, plo_path)  # Correction : ajout de plo_path
-            ecriture_results(file, tp_name, results)
-            
-            ecriture_conclusion(file, tp_name, results)
-            
-            file.write(f'''
+    ecriture_graphique(file, tp_name, results, plo_path)
+    ecriture_results(file, tp_name, results)
+
+    ecriture_conclusion(file, tp_name, results)
+
+    file.write(f'''
 \\end{{document}}
 ''')
-    except Exception as e:
-        messagebox.showerror("Erreur", f"Échec de l'écriture du fichier LaTeX : {str(e)}")
-        return None
-    
+
+def build_preamble_format(format_dir):
+    """
+    Dump the report preamble into a precompiled pdflatex format file.
+
+    The format loads the document class and all packages once; inside it,
+    \\documentclass and \\usepackage become no-ops so the standalone .tex
+    files still compile unchanged against it.
+
+    Args:
+        format_dir (str or Path): Directory where the format is stored.
+
+    Returns:
+        Path: Path to the .fmt file, or None if it could not be built.
+    """
+    format_dir = Path(format_dir)
+    format_dir.mkdir(parents=True, exist_ok=True)
+    fmt_file = format_dir / f"{FORMAT_NAME}.fmt"
+    digest_file = format_dir / f"{FORMAT_NAME}.sha256"
+    digest = hashlib.sha256(PREAMBLE.encode("utf-8")).hexdigest()
+    if fmt_file.exists() and digest_file.exists() and digest_file.read_text() == digest:
+        return fmt_file
+
+    ini_file = format_dir / f"{FORMAT_NAME}.tex"
+    ini_file.write_text(PREAMBLE + '''\\renewcommand{\\documentclass}[2][]{}
+\\renewcommand{\\usepackage}[2][]{}
+\\dump
+''', encoding="utf-8")
     try:
-        # Utiliser encoding='utf-8' avec errors='replace' pour gérer les caractères problématiques
-        result = subprocess.run(
-            ["pdflatex", "-interaction=nonstopmode", "-output-directory", str(output_dir), str(tex_file)],
+        subprocess.run(
+            ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={FORMAT_NAME}", "&pdflatex", ini_file.name],
+            cwd=format_dir,
             capture_output=True,
             text=True,
             encoding='utf-8',
             errors='replace',
             check=True
         )
-        pdf_file = output_dir / f"{name}.pdf"
-        if not pdf_file.exists():
-            messagebox.showerror("Erreur", f"Échec de la compilation LaTeX :\n{result.stderr}")
-            return None
-        return str(pdf_file), str(tex_file), str(plo_path)
-    except FileNotFoundError:
-        messagebox.showerror("Erreur", "MiKTeX (pdflatex) n'est pas installé ou n'est pas dans le PATH.\nVérifiez votre installation MiKTeX.")
+    except (FileNotFoundError, subprocess.CalledProcessError):
         return None
-    except subprocess.CalledProcessError as e:
-        # Afficher la sortie avec encodage nettoyé
-        stderr_cleaned = e.stderr.encode('utf-8', errors='replace').decode('utf-8')
-        messagebox.showerror("Erreur", f"Erreur lors de la compilation LaTeX :\n{stderr_cleaned}")
+    if not fmt_file.exists():
         return None
+    digest_file.write_text(digest)
+    return fmt_file
+
+def compile_tex(tex_file, output_dir, fmt_file=None):
+    """
+    Compile a LaTeX file with pdflatex, rerunning until cross-references
+    (table of contents, labels) are stable.
+
+    Args:
+        tex_file (Path): LaTeX source file.
+        output_dir (Path): Output directory for the PDF.
+        fmt_file (Path, optional): Precompiled preamble format from build_preamble_format.
+
+    Returns:
+        int: Number of pdflatex passes run.
+
+    Raises:
+        ReportError: If pdflatex is missing or the compilation fails.
+    """
+    tex_file = Path(tex_file).resolve()
+    output_dir = Path(output_dir).resolve()
+    command = ["pdflatex", "-interaction=nonstopmode", "-output-directory", str(output_dir)]
+    cwd = None
+    if fmt_file is not None:
+        command.append(f"-fmt={Path(fmt_file).stem}")
+        cwd = Path(fmt_file).parent
+    command.append(str(tex_file))
+
+    toc_file = output_dir / f"{tex_file.stem}.toc"
+    log_file = output_dir / f"{tex_file.stem}.log"
+    passes = 0
+    while passes < MAX_LATEX_PASSES:
+        toc_before = toc_file.read_bytes() if toc_file.exists() else None
+        try:
+            with profiling.span("pdflatex", "report"):
+                subprocess.run(
+                    command,
+                    cwd=cwd,
+                    capture_output=True,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace',
+                    check=True
+                )
+        except FileNotFoundError:
+            raise ReportError("latex-missing", "MiKTeX (pdflatex) n'est pas installé ou n'est pas dans le PATH.\nVérifiez votre installation MiKTeX.")
+        except subprocess.CalledProcessError as e:
+            # Afficher la sortie avec encodage nettoyé
+            stderr_cleaned = (e.stderr or e.stdout or "").encode('utf-8', errors='replace').decode('utf-8')
+            raise ReportError("compile", f"Erreur lors de la compilation LaTeX :\n{stderr_cleaned}", log=e.stdout or "")
+        passes += 1
+        log = log_file.read_text(encoding="utf-8", errors="replace") if log_file.exists() else ""
+        toc_after = toc_file.read_bytes() if toc_file.exists() else None
+        if toc_after == toc_before and "Rerun to get" not in log:
+            break
+    return passes
+
+@profiling.profiled("build_report", "report")
+def build_report(tp_name, results, params, output_dir, name, fmt_file=None, use_cache=True):
+    """
+    Generate the plot, the LaTeX source and the PDF of one report.
+
+    The PDF is not recompiled when the .tex source and the plot are identical
+    to those of the last successful build in the same directory.
+
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+        params (dict): Simulation parameters.
+        output_dir (str or Path): Output directory.
+        name (str): Base filename of the report (without extension).
+        fmt_file (Path, optional): Precompiled preamble format.
+        use_cache (bool): Skip compilation when the content hash is unchanged.
+
+    Returns:
+        dict: Paths ("pdf", "tex", "plot"), "passes" run and whether the PDF was "cached".
+
+    Raises:
+        ReportError: If any step of the generation fails.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tex_file = output_dir / f"{name}.tex"
+    pdf_file = output_dir / f"{name}.pdf"
+    hash_file = output_dir / f".{name}.sha256"
+
+    try:
+        plo_path = generate_plot(tp_name, results, output_dir, filename=f"{name}_plot.png")
+        if not Path(plo_path).exists():
+            raise FileNotFoundError(f"Le fichier graphique {plo_path} n'a pas été généré.")
+    except Exception as e:
+        raise ReportError("plot", f"Échec de la génération du graphique : {str(e)}")
+
+    try:
+        with profiling.span("build_report.write", "report"):
+            buffer = io.StringIO()
+            ecriture_document(buffer, tp_name, results, params, output_dir.resolve(), plo_path)
+            source = buffer.getvalue()
+            with open(tex_file, "w", encoding="utf-8") as file:
+                file.write(source)
+    except Exception as e:
+        raise ReportError("write", f"Échec de l'écriture du fichier LaTeX : {str(e)}")
+
+    digest = hashlib.sha256(source.encode("utf-8") + Path(plo_path).read_bytes()).hexdigest()
+    report = {"pdf": str(pdf_file), "tex": str(tex_file), "plot": str(plo_path), "passes": 0, "cached": False}
+    if use_cache and pdf_file.exists() and hash_file.exists() and hash_file.read_text() == digest:
+        report["cached"] = True
+        return report
+
+    try:
+        try:
+            report["passes"] = compile_tex(tex_file, output_dir, fmt_file)
+        except ReportError as e:
+            if fmt_file is None or e.stage != "compile" or not any(message in e.log for message in FORMAT_ERRORS):
+                raise
+            # Repli sur une compilation complète si le format précompilé est incompatible
+            report["passes"] = compile_tex(tex_file, output_dir)
+        if not pdf_file.exists():
+            raise ReportError("compile", "Échec de la compilation LaTeX : aucun PDF produit.")
+        hash_file.write_text(digest)
+        return report
     finally:
         # Nettoyage des fichiers auxiliaires
         for ext in [".aux", ".log", ".out", ".toc"]:
@@ -419,33 +385,125 @@ The following parameters were used in the simulation, with default values applie
                 except Exception:
                     pass
 
-def write_tex(tp_name, results, params):
+BACKENDS = ("latex", "pdf", "html")
+
+def generate_report(tp_name, results, params, output_dir, name, backend="latex", fmt_file=None, use_cache=True):
     """
-    Generate a LaTeX report and prompt the user to save it.
-    
+    Generate one report on disk, without any user interaction.
+
     Args:
         tp_name (str): Name of the TP.
         results (dict): Simulation results.
         params (dict): Simulation parameters.
+        output_dir (str or Path): Output directory.
+        name (str): Base filename of the report (without extension).
+        backend (str): "latex" (pdflatex), "pdf" (direct PDF) or "html" (self-contained HTML).
+        fmt_file (Path, optional): Precompiled preamble format (latex backend only).
+        use_cache (bool): Skip compilation when the content hash is unchanged (latex backend only).
+
+    Returns:
+        dict: "path" of the report plus the backend specific paths ("pdf", "tex", "plot" or "html").
+
+    Raises:
+        ReportError: If the generation fails.
     """
-    demander_nom_fichier(tp_name, results, params)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown report backend '{backend}'. Choose among {', '.join(BACKENDS)}.")
+    if backend == "latex":
+        report = build_report(tp_name, results, params, output_dir, name, fmt_file=fmt_file, use_cache=use_cache)
+        report["path"] = report["pdf"]
+        return report
 
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{name}.{backend}"
+    path.write_bytes(render_report(tp_name, results, params, backend))
+    return {"path": str(path), backend: str(path)}
 
-def save_folder(tp_name, results, params,file_name):
-    root = tk.Tk()
-    root.withdraw()
+@profiling.profiled("render_report", "report")
+def render_report(tp_name, results, params, backend="pdf"):
+    """
+    Render one report in memory.
 
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+        params (dict): Simulation parameters.
+        backend (str): "latex", "pdf" or "html".
 
-    output_dir = filedialog.asksaveasfilename(title=f"Select Output Directory for {tp_name} Report")
-    if not output_dir:
-        messagebox.showinfo("cancel",  "The repport was not generated.")
-        root.destroy()
-        return
-    
-    base_filename = tp_name.lower()
-    result = ecriture_template(tp_name, results, params, output_dir, base_filename,file_name)
-    
-    if result:
-        pdf_path, _, _ = result
-        messagebox.showinfo("succes", f"Rapport generated with succes : {pdf_path}")
-    root.destroy()
\ No newline at end of file
+    Returns:
+        bytes: Content of the PDF or HTML document.
+
+    Raises:
+        ReportError: If the generation fails.
+    """
+    if backend == "latex":
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = build_report(tp_name, results, params, tmp_dir, "report", use_cache=False)
+            return Path(report["pdf"]).read_bytes()
+    try:
+        if backend == "html":
+            return render_html(tp_name, results, params).encode("utf-8")
+        if backend == "pdf":
+            return render_pdf(tp_name, results, params)
+    except Exception as e:
+        raise ReportError("write", f"Échec de la génération du rapport : {str(e)}")
+    raise ValueError(f"Unknown report backend '{backend}'. Choose among {', '.join(BACKENDS)}.")
+
+def generate_reports(jobs, output_dir, max_workers=None, use_format=True, use_cache=True, backend="latex"):
+    """
+    Generate many reports concurrently in a worker pool.
+
+    Args:
+        jobs (iterable): Dicts with keys "tp_name", "results", "params" and "name".
+        output_dir (str or Path): Output directory shared by all reports.
+        max_workers (int, optional): Number of parallel workers (default: CPU count).
+        use_format (bool): Compile against a precompiled preamble format when possible.
+        use_cache (bool): Skip reports whose content hash is unchanged.
+        backend (str): Report backend, see generate_report.
+
+    Returns:
+        list: One dict per job, in order, with the keys of generate_report plus "name"
+        and "error" (None, or a dict with "stage", "message" and "log").
+    """
+    jobs = list(jobs)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fmt_file = None
+    if use_format and backend == "latex":
+        fmt_file = build_preamble_format(output_dir / ".latex_format")
+
+    def run(job):
+        try:
+            report = generate_report(job["tp_name"], job["results"], job.get("params", {}), output_dir,
+                                     job["name"], backend=backend, fmt_file=fmt_file, use_cache=use_cache)
+            report["error"] = None
+        except ReportError as e:
+            report = {"path": None, "error": {"stage": e.stage, "message": str(e), "log": e.log}}
+        report["name"] = job["name"]
+        return report
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, jobs))
+
+def ecriture_template(tp_name, results, params, output_dir, base_filename,name):
+    """
+    Write the complete LaTeX template with all elements.
+
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+        params (dict): Simulation parameters.
+        output_dir (Path): Output directory.
+        base_filename (str): Base filename (without extension).
+
+    Returns:
+        tuple: Paths to the generated PDF, LaTeX, and PNG files.
+
+    Raises:
+        ReportError: If the generation fails.
+    """
+    report = build_report(tp_name, results, params, output_dir, name, use_cache=False)
+    return report["pdf"], report["tex"], report["plot"]
@@ -0,0 +1,281 @@
+#text of the reports, shared by the LaTeX and the native (HTML/PDF) backends
+import numpy as np
+
+# Sections of every report, in order: (title, subsections)
+SECTIONS = [
+    ("Introduction", []),
+    ("Experimental Setup", []),
+    ("Methodology", []),
+    ("Results and Discussion", ["Optimal Results", "Qualitative Analysis"]),
+    ("Conclusion", []),
+]
+
+SETUP_TEXT = "The following parameters were used in the simulation, with default values applied where user input was not provided:"
+
+EQUATIONS_TEXT = "The simulation relies on the following key equations to model the heat exchanger's performance:"
+
+# Key equations: (title, label suffix, LaTeX expression, explanation with inline $math$)
+EQUATIONS = [
+    (
+        "Heat transfer by the cold fluid",
+        "heat_transfer",
+        r"Q = \dot{m} \cdot c_p \cdot (T_{out} - T_{in})",
+        r"This equation calculates the heat transfer rate ($Q$) based on the mass flow rate ($\dot{m}$), specific heat capacity ($c_p$), and temperature difference between the outlet ($T_{out}$) and inlet ($T_{in}$) of the cold fluid. It quantifies the energy absorbed by the cold fluid."
+    ),
+    (
+        "Overall heat transfer",
+        "overall_transfer",
+        r"Q = U \cdot A \cdot \Delta T_{lm}",
+        r"This equation computes the heat transfer rate ($Q$) using the overall heat transfer coefficient ($U$), the heat transfer surface area ($A$), and the logarithmic mean temperature difference ($\Delta T_{lm}$). It describes the total heat exchanged between the fluids."
+    ),
+    (
+        "Logarithmic mean temperature difference (LMTD)",
+        "lmtd",
+        r"\Delta T_{lm} = \frac{\Delta T_1 - \Delta T_2}{\ln(\Delta T_1 / \Delta T_2)}",
+        r"The LMTD accounts for the temperature gradient along the exchanger, where $\Delta T_1$ and $\Delta T_2$ are the temperature differences at the two ends. It is critical for calculating the driving force for heat transfer in counter-flow exchangers."
+    ),
+    (
+        "Reynolds number",
+        "reynolds",
+        r"Re = \frac{\rho v D}{\mu}",
+        r"The Reynolds number ($Re$) determines the flow regime (laminar or turbulent) using fluid density ($\rho$), velocity ($v$), characteristic length ($D$), and dynamic viscosity ($\mu$). It influences the convection coefficients and heat transfer efficiency."
+    ),
+    (
+        "Nusselt number (Dittus-Boelter correlation)",
+        "nusselt",
+        r"Nu = 0.023 \cdot Re^{0.8} \cdot Pr^{0.4}",
+        r"The Nusselt number ($Nu$) relates to the convection coefficient ($h$) via $h = Nu \cdot k / D$, where $k$ is the thermal conductivity and $D$ is the diameter. The Dittus-Boelter correlation is used for turbulent flow to estimate $h$, which affects $U$."
+    ),
+]
+
+# Default values of the parameters listed in the experimental setup
+DEFAULT_PARAMS = {
+    'fluid': 'water',
+    'hot_fluid': 'water',
+    'material': 'stainless steel',
+    'T_cold_in': 20,
+    'T_hot_in': 50,
+    'pipe_length': 2,
+    'pipe_diameter': 0.1,
+    'pipe_thickness': 0.005,
+    'gap': 0.01,
+    'flow_cold': 10,
+    'flow_hot': 10,
+    'T_hot_start': 50,
+    'T_hot_end': 100,
+    'T_hot_steps': 20,
+    'flow_start': 5,
+    'flow_end': 15,
+    'flow_steps': 10,
+    'dim_start': 0.05,
+    'dim_end': 0.15,
+    'dim_steps': 10,
+    'dimension_type': 'length'
+}
+
+# (parameter, label, unit) in the order they are listed
+PARAMETER_LABELS = [
+    ('fluid', "Cold Fluid", ""),
+    ('hot_fluid', "Hot Fluid", ""),
+    ('material', "Material", ""),
+    ('T_cold_in', "Cold Inlet Temperature", " °C"),
+    ('T_hot_in', "Hot Inlet Temperature", " °C"),
+    ('pipe_length', "Pipe Length", " m"),
+    ('pipe_diameter', "Pipe Diameter", " m"),
+    ('pipe_thickness', "Pipe Thickness", " m"),
+    ('gap', "Gap", " m"),
+    ('flow_start', "Start Flow Rate", " L/min"),
+    ('flow_end', "End Flow Rate", " L/min"),
+    ('flow_steps', "Flow Steps", ""),
+    ('flow_cold', "Cold Flow Rate", " L/min"),
+    ('flow_hot', "Hot Flow Rate", " L/min"),
+    ('T_hot_start', "Start Hot Temperature", " °C"),
+    ('T_hot_end', "End Hot Temperature", " °C"),
+    ('T_hot_steps', "Hot Temperature Steps", ""),
+    ('dimension_type', "Dimension Type", ""),
+    ('dim_start', "Start Dimension", " m"),
+    ('dim_end', "End Dimension", " m"),
+    ('dim_steps', "Dimension Steps", ""),
+]
+
+def report_title(tp_name):
+    """
+    Title of the report.
+
+    Args:
+        tp_name (str): Name of the TP.
+
+    Returns:
+        str: Report title.
+    """
+    return f"Heat Exchanger Simulation Report: {tp_name}"
+
+def introduction_text(tp_name):
+    """
+    Context and TP-specific objective of the introduction.
+
+    Args:
+        tp_name (str): Name of the TP.
+
+    Returns:
+        tuple: (context, objective) paragraphs.
+    """
+    context = (
+        "Heat exchangers are essential devices in industrial and engineering applications, facilitating efficient thermal energy transfer between two fluids without mixing. "
+        "Widely used in power plants, HVAC systems, and chemical processing, they optimize energy efficiency by leveraging temperature gradients. "
+        "This simulation focuses on a counter-flow concentric tube heat exchanger, where fluids flow in opposite directions to maximize heat transfer efficiency."
+    )
+
+    if tp_name == "TP1":
+        objective = (
+            "The objective of TP1 is to study the effect of the cold fluid flow rate on the heat exchanger's performance. "
+            "By varying the flow rate while keeping other parameters constant (e.g., pipe dimensions, fluid properties, hot fluid conditions), we aim to evaluate its impact on the outlet temperature, heat transfer rate, and efficiency. "
+            "This experiment highlights the trade-off between enhanced convection at higher flow rates and reduced residence time, which affects the heat absorbed."
+        )
+    elif tp_name == "TP2":
+        objective = (
+            "The objective of TP2 is to investigate the influence of the hot fluid inlet temperature on the heat exchanger's performance. "
+            "By adjusting the inlet temperature with fixed flow rates and pipe geometry, we seek to assess its effect on the outlet temperature, heat transfer rate, and efficiency. "
+            "This experiment emphasizes the role of the temperature difference as the primary driving force for heat transfer."
+        )
+    elif tp_name == "TP3":
+        objective = (
+            "The objective of TP3 is to analyze the impact of different hot fluids on the heat exchanger's performance. "
+            "By testing fluids with varying thermophysical properties (e.g., specific heat capacity, viscosity), we aim to identify which fluid maximizes the outlet temperature and heat transfer rate. "
+            "This experiment underscores the critical role of fluid selection in optimizing heat exchanger design."
+        )
+    elif tp_name == "TP4":
+        objective = (
+            "The objective of TP4 is to examine the effect of pipe dimensions (length or diameter) on the heat exchanger's performance. "
+            "By varying one dimension while keeping other parameters constant, we aim to understand its influence on the outlet temperature, heat transfer rate, and efficiency. "
+            "This experiment illustrates the importance of geometry in enhancing heat transfer efficiency."
+        )
+    return context, objective
+
+def parameter_items(params, results):
+    """
+    Plain-text list of the simulation parameters, including user inputs and defaults.
+
+    Args:
+        params (dict): Simulation parameters.
+        results (dict): Simulation results.
+
+    Returns:
+        list: One string per parameter.
+    """
+    items = []
+    for key, label, unit in PARAMETER_LABELS:
+        value = str(params.get(key, DEFAULT_PARAMS.get(key, 'N/A'))).replace('_', ' ')
+        items.append(f"{label}: {value}{unit}{' (default)' if key not in params else ''}")
+
+    items.extend([
+        f"Average Overall Heat Transfer Coefficient (U): {round(np.nanmean(results.get('U', [0])), 2)} W/m²·K",
+        f"Average Internal Reynolds Number: {round(np.nanmean(results.get('Re_internal', [0])), 2)} ({results.get('Re_internal_regime', ['Unknown'])[0]})",
+        f"Average External Reynolds Number: {round(np.nanmean(results.get('Re_external', [0])), 2)} ({results.get('Re_external_regime', ['Unknown'])[0]})"
+    ])
+    return items
+
+def figure_caption(tp_name):
+    """
+    Caption of the results figure.
+
+    Args:
+        tp_name (str): Name of the TP.
+
+    Returns:
+        str: Figure caption.
+    """
+    return f"Simulation results for {tp_name}"
+
+def optimal_results(results):
+    """
+    Results at the point maximizing the outlet temperature.
+
+    Args:
+        results (dict): Simulation results.
+
+    Returns:
+        list: (sentence, value, unit) tuples, or None if results are missing.
+    """
+    required_keys = ["T_out", "Q", "efficiency", "U", "delta_T_lm", "h_internal", "h_external", "A"]
+    if not all(key in results for key in required_keys):
+        return None
+
+    max_T_out_idx = np.nanargmax(results["T_out"])
+    return [
+        ("The outlet temperature is", round(results["T_out"][max_T_out_idx], 2), "°C"),
+        ("The heat transferred is", round(results["Q"][max_T_out_idx], 2), "W"),
+        ("The efficiency is", round(results["efficiency"][max_T_out_idx] * 100, 2), "%"),
+        ("The overall heat transfer coefficient (U) is", round(results["U"][max_T_out_idx], 2), "W/m²·K"),
+        ("The logarithmic mean temperature difference (LMTD) is", round(results["delta_T_lm"][max_T_out_idx], 2), "°C"),
+        ("The internal convection coefficient is", round(results["h_internal"][max_T_out_idx], 2), "W/m²·K"),
+        ("The external convection coefficient is", round(results["h_external"][max_T_out_idx], 2), "W/m²·K"),
+        ("The heat transfer surface area is", round(results["A"][max_T_out_idx], 4), "m²"),
+    ]
+
+OPTIMAL_RESULTS_TEXT = "For the optimal parameters maximizing the outlet temperature, the simulation yields the following results:"
+
+MISSING_RESULTS_TEXT = "Les résultats optimaux n'ont pas pu être calculés en raison de données manquantes."
+
+def qualitative_analysis_text(tp_name):
+    """
+    Qualitative analysis of the results.
+
+    Args:
+        tp_name (str): Name of the TP.
+
+    Returns:
+        str: Analysis paragraph.
+    """
+    if tp_name == "TP1":
+        analysis = (
+            "The results show that increasing the cold fluid flow rate enhances the heat transfer rate due to a higher internal convection coefficient, driven by an increased Reynolds number. "
+            "However, beyond a certain point, the outlet temperature decreases because the fluid spends less time in the exchanger, reducing the heat absorbed. "
+            "The optimal flow rate balances these effects, maximizing the outlet temperature while maintaining efficient heat transfer."
+        )
+    elif tp_name == "TP2":
+        analysis = (
+            "Higher hot fluid inlet temperatures increase the outlet temperature and heat transfer rate by enlarging the logarithmic mean temperature difference, which drives heat transfer. "
+            "The efficiency may slightly decrease at very high temperatures due to a larger maximum possible heat transfer, but the overall performance improves with greater temperature gradients."
+        )
+    elif tp_name == "TP3":
+        analysis = (
+            "Different hot fluids affect performance through their thermophysical properties, such as specific heat capacity and viscosity. "
+            "Fluids with higher specific heat capacities transfer more heat, increasing the outlet temperature and heat transfer rate. "
+            "The choice of fluid significantly influences the exchanger's effectiveness, with optimal fluids balancing high heat capacity and favorable flow characteristics."
+        )
+    elif tp_name == "TP4":
+        analysis = (
+            "Varying pipe dimensions impacts the heat transfer surface area and flow dynamics. Longer pipes or larger diameters increase the surface area, enhancing heat transfer and outlet temperature."
+            "However, larger diameters may reduce flow velocity, affecting convection coefficients. The optimal dimension maximizes heat transfer while maintaining efficient flow regimes."
+        )
+    return analysis
+
+def conclusion_text(tp_name, results):
+    """
+    Conclusion indicating the optimal parameters maximizing T_out.
+
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+
+    Returns:
+        str: Conclusion paragraph.
+    """
+    max_T_out_idx = np.nanargmax(results["T_out"])
+    max_T_out = round(results["T_out"][max_T_out_idx], 2)
+
+    if tp_name == "TP1":
+        optimal_param = f"cold fluid flow rate of {results['flow_rates'][max_T_out_idx]} L/min"
+    elif tp_name == "TP2":
+        optimal_param = f"hot fluid inlet temperature of {results['T_hot_in'][max_T_out_idx]} °C"
+    elif tp_name == "TP3":
+        optimal_param = f"hot fluid '{results['hot_fluids'][max_T_out_idx]}'"
+    elif tp_name == "TP4":
+        optimal_param = f"pipe {results.get('dimension_type', 'length')} of {results['dimensions'][max_T_out_idx]} m"
+
+    return (
+        f"This simulation demonstrates how the varied parameter affects the heat exchanger's performance. "
+        f"The optimal configuration, yielding the highest outlet temperature of {max_T_out} °C, is achieved with a {optimal_param}. "
+        "These results highlight the importance of optimizing the varied parameter to maximize heat transfer efficiency."
+    )
@@ -0,0 +1,349 @@
+#LaTeX-free reports: self-contained HTML and PDF written directly with Matplotlib
+import io
+import html
+import time
+import re
+from functools import lru_cache
+from matplotlib import mathtext
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.backends.backend_pdf import PdfPages
+from plotting import draw_results
+from report_content import (EQUATIONS, EQUATIONS_TEXT, MISSING_RESULTS_TEXT, OPTIMAL_RESULTS_TEXT, SECTIONS, SETUP_TEXT,
+                            conclusion_text, figure_caption, introduction_text, optimal_results,
+                            parameter_items, qualitative_analysis_text, report_title)
+
+HTML_STYLE = """
+body { font-family: Georgia, 'Times New Roman', serif; max-width: 48em; margin: 2em auto; line-height: 1.5; color: #222; }
+h1 { text-align: center; margin-bottom: 0.2em; }
+.meta { text-align: center; color: #555; }
+nav ol { list-style: none; }
+figure { text-align: center; }
+figure svg { max-width: 100%; height: auto; }
+.equation { text-align: center; margin: 0.5em 0; }
+.math { vertical-align: middle; }
+"""
+
+def _strip_xml_header(svg):
+    """
+    Remove the XML declaration and doctype so an SVG document can be inlined in HTML.
+
+    Args:
+        svg (str): SVG document.
+
+    Returns:
+        str: The <svg> element only.
+    """
+    return svg[svg.index("<svg"):]
+
+@lru_cache(maxsize=None)
+def _math_svg(expression, size):
+    """
+    Render a LaTeX math expression to inline SVG with Matplotlib's mathtext.
+
+    Args:
+        expression (str): Math expression without the surrounding $.
+        size (float): Font size (pt).
+
+    Returns:
+        str: Inline <svg> element.
+    """
+    buffer = io.BytesIO()
+    mathtext.math_to_image(f"${expression}$", buffer, prop=FontProperties(size=size), format="svg")
+    return _strip_xml_header(buffer.getvalue().decode("utf-8"))
+
+def _html_text(text):
+    """
+    Convert plain report text with inline $math$ to HTML.
+
+    Args:
+        text (str): Text to convert.
+
+    Returns:
+        str: HTML fragment.
+    """
+    parts = text.split("$")
+    return "".join(
+        html.escape(part) if i % 2 == 0 else f'<span class="math">{_math_svg(part, 11)}</span>'
+        for i, part in enumerate(parts)
+    )
+
+def _plot_svg(tp_name, results):
+    """
+    Render the results plot as an inline SVG element.
+
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+
+    Returns:
+        str: Inline <svg> element.
+    """
+    fig = Figure(figsize=(8, 6))
+    draw_results(fig.add_subplot(), tp_name, results)
+    fig.tight_layout()
+    buffer = io.StringIO()
+    fig.savefig(buffer, format="svg")
+    return _strip_xml_header(buffer.getvalue())
+
+def render_html(tp_name, results, params):
+    """
+    Build a self-contained HTML report with the same sections as the LaTeX report.
+
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+        params (dict): Simulation parameters.
+
+    Returns:
+        str: HTML document.
+    """
+    title = report_title(tp_name)
+    author = params.get("author", "User")
+    date = time.strftime("%d.%m.%Y")
+    optimal = optimal_results(results)
+
+    toc = []
+    for number, (section, subsections) in enumerate(SECTIONS, start=1):
+        toc.append(f'<li><a href="#section-{number}">{number} {html.escape(section)}</a></li>')
+        if section == "Results and Discussion" and optimal is None:
+            subsections = subsections[:1]
+        for sub_number, subsection in enumerate(subsections, start=1):
+            toc.append(f'<li>&emsp;<a href="#section-{number}-{sub_number}">{number}.{sub_number} {html.escape(subsection)}</a></li>')
+
+    context, objective = introduction_text(tp_name)
+    parameters = "\n".join(f"<li>{html.escape(item)}</li>" for item in parameter_items(params, results))
+    equations = "\n".join(
+        f'<li><strong>{html.escape(eq_title)}</strong>:'
+        f'<div class="equation">{_math_svg(expression, 14)}</div>'
+        f'<p>{_html_text(explanation)}</p></li>'
+        for eq_title, _, expression, explanation in EQUATIONS
+    )
+    if optimal is None:
+        results_block = f'<h3 id="section-4-1">4.1 Optimal Results</h3>\n<p>{html.escape(MISSING_RESULTS_TEXT)}</p>'
+    else:
+        values = "\n".join(f"<li>{html.escape(sentence)}: {value} {html.escape(unit)}</li>" for sentence, value, unit in optimal)
+        results_block = f'''<h3 id="section-4-1">4.1 Optimal Results</h3>
+<p>{html.escape(OPTIMAL_RESULTS_TEXT)}</p>
+<ul>
+{values}
+</ul>
+<h3 id="section-4-2">4.2 Qualitative Analysis</h3>
+<p>{html.escape(qualitative_analysis_text(tp_name))}</p>'''
+
+    toc_block = "\n".join(toc)
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>{HTML_STYLE}</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p class="meta">{html.escape(str(author))}<br>{date}</p>
+<nav><h2>Contents</h2><ol>
+{toc_block}
+</ol></nav>
+<h2 id="section-1">1 Introduction</h2>
+<p>{html.escape(context)}</p>
+<p>{html.escape(objective)}</p>
+<h2 id="section-2">2 Experimental Setup</h2>
+<p>{html.escape(SETUP_TEXT)}</p>
+<ul>
+{parameters}
+</ul>
+<h2 id="section-3">3 Methodology</h2>
+<p>{html.escape(EQUATIONS_TEXT)}</p>
+<ul>
+{equations}
+</ul>
+<h2 id="section-4">4 Results and Discussion</h2>
+<figure>
+{_plot_svg(tp_name, results)}
+<figcaption>Figure 1: {html.escape(figure_caption(tp_name))}</figcaption>
+</figure>
+{results_block}
+<h2 id="section-5">5 Conclusion</h2>
+<p>{html.escape(conclusion_text(tp_name, results))}</p>
+</body>
+</html>
+'''
+
+def _wrap(text, width):
+    """
+    Greedy word wrap that keeps inline $math$ on one line and measures it
+    by its rendered length rather than its LaTeX source.
+
+    Args:
+        text (str): Text with inline math.
+        width (int): Maximum number of characters per line.
+
+    Returns:
+        list: Wrapped lines.
+    """
+    parts = text.split("$")
+    protected = "$".join(part.replace(" ", "\u00a0") if i % 2 else part for i, part in enumerate(parts))
+    lines, current, length = [], [], 0
+    for word in protected.split(" "):
+        if not word:
+            continue
+        size = len(re.sub(r"[{}_^$]", "", re.sub(r"\\[a-zA-Z]+", "x", word)))
+        if current and length + 1 + size > width:
+            lines.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += size + (1 if length else 0)
+    lines.append(" ".join(current))
+    return [line.replace("\u00a0", " ") for line in lines]
+
+class _PdfLayout:
+    """
+    Minimal top-to-bottom text layout on A4 Matplotlib figures.
+    Pages are kept in memory and written on save, so the table of contents
+    on the first page can show page numbers.
+    """
+    WIDTH = 8.27
+    HEIGHT = 11.69
+    MARGIN = 0.9
+    BODY_SIZE = 10.5
+
+    def __init__(self):
+        self.pages = []
+        self.headings = []
+        self.new_page()
+
+    def new_page(self):
+        self.page = Figure(figsize=(self.WIDTH, self.HEIGHT))
+        self.pages.append(self.page)
+        self.y = self.HEIGHT - self.MARGIN
+
+    def ensure_space(self, height):
+        if self.y - height < self.MARGIN:
+            self.new_page()
+
+    def skip(self, height):
+        self.y -= height
+
+    def line(self, text, size=None, x=0.0, weight="normal", ha="left"):
+        size = size or self.BODY_SIZE
+        height = size * 1.45 / 72
+        self.ensure_space(height)
+        x_pos = self.WIDTH / 2 if ha == "center" else self.MARGIN + x
+        self.page.text(x_pos / self.WIDTH, self.y / self.HEIGHT, text, fontsize=size,
+                       fontweight=weight, ha=ha, va="top", family="DejaVu Serif")
+        self.y -= height
+
+    def paragraph(self, text, size=None, indent=0.0, bullet=None):
+        size = size or self.BODY_SIZE
+        chars = int((self.WIDTH - 2 * self.MARGIN - indent) / (size * 0.5 / 72))
+        for i, line in enumerate(_wrap(text, chars)):
+            if bullet and i == 0:
+                self.line(bullet, size=size, x=indent - 0.2)
+                self.y += size * 1.45 / 72
+            self.line(line, size=size, x=indent)
+        self.skip(size * 0.5 / 72)
+
+    def heading(self, text, level=1, keep=0.0):
+        size = {0: 18, 1: 15, 2: 12.5}[level]
+        self.ensure_space(size * 4 / 72 + keep)
+        self.skip(size * 0.6 / 72)
+        if level > 0:
+            self.headings.append((level, text, len(self.pages)))
+        self.line(text, size=size, weight="bold", ha="center" if level == 0 else "left")
+        self.skip(size * 0.3 / 72)
+
+    def equation(self, expression):
+        height = 0.55
+        self.ensure_space(height)
+        self.page.text(0.5, (self.y - height / 2) / self.HEIGHT, f"${expression}$", fontsize=13, ha="center", va="center")
+        self.y -= height
+
+    def plot(self, tp_name, results, caption):
+        height = 4.2
+        self.ensure_space(height + 0.4)
+        width = self.WIDTH - 2 * self.MARGIN - 0.6
+        ax = self.page.add_axes([(self.MARGIN + 0.7) / self.WIDTH, (self.y - height + 0.6) / self.HEIGHT,
+                                 (width - 0.5) / self.WIDTH, (height - 0.9) / self.HEIGHT])
+        draw_results(ax, tp_name, results)
+        self.y -= height
+        self.line(caption, ha="center")
+
+    def save(self, target, toc_anchor):
+        first_page, y = toc_anchor
+        for level, text, page_number in self.headings:
+            indent = 0.0 if level == 1 else 0.3
+            size = self.BODY_SIZE + (0.5 if level == 1 else 0)
+            first_page.text((self.MARGIN + indent) / self.WIDTH, y / self.HEIGHT, text, fontsize=size,
+                            fontweight="bold" if level == 1 else "normal", va="top", family="DejaVu Serif")
+            first_page.text((self.WIDTH - self.MARGIN) / self.WIDTH, y / self.HEIGHT, str(page_number),
+                            fontsize=size, ha="right", va="top", family="DejaVu Serif")
+            y -= size * 1.5 / 72
+        with PdfPages(target) as pdf:
+            for number, page in enumerate(self.pages, start=1):
+                page.text(0.5, 0.5 * self.MARGIN / self.HEIGHT, str(number), ha="center", fontsize=9)
+                pdf.savefig(page)
+
+def render_pdf(tp_name, results, params):
+    """
+    Render the report as a PDF directly from Python (no LaTeX installation needed).
+
+    Args:
+        tp_name (str): Name of the TP.
+        results (dict): Simulation results.
+        params (dict): Simulation parameters.
+
+    Returns:
+        bytes: PDF document.
+    """
+    doc, toc_anchor = _pdf_layout(tp_name, results, params)
+    buffer = io.BytesIO()
+    doc.save(buffer, toc_anchor)
+    return buffer.getvalue()
+
+def _pdf_layout(tp_name, results, params):
+    # Pages of the PDF report (headings kept in doc.headings) and the place of its table of contents
+    optimal = optimal_results(results)
+    doc = _PdfLayout()
+
+    doc.heading(report_title(tp_name), level=0)
+    doc.line(str(params.get("author", "User")), size=12, ha="center")
+    doc.line(time.strftime("%d.%m.%Y"), size=12, ha="center")
+    doc.skip(0.3)
+    doc.line("Contents", size=15, weight="bold")
+    toc_anchor = (doc.page, doc.y - 0.1)
+    toc_lines = sum(1 + len(subsections) for _, subsections in SECTIONS)
+    doc.skip(toc_lines * 0.24 + 0.3)
+
+    context, objective = introduction_text(tp_name)
+    doc.heading("1 Introduction")
+    doc.paragraph(context)
+    doc.paragraph(objective)
+
+    doc.heading("2 Experimental Setup")
+    doc.paragraph(SETUP_TEXT)
+    for item in parameter_items(params, results):
+        doc.paragraph(item, indent=0.4, bullet="•")
+
+    doc.heading("3 Methodology")
+    doc.paragraph(EQUATIONS_TEXT)
+    for eq_title, _, expression, explanation in EQUATIONS:
+        doc.paragraph(f"{eq_title}:", indent=0.4, bullet="•")
+        doc.equation(expression)
+        doc.paragraph(explanation, indent=0.4)
+
+    doc.heading("4 Results and Discussion", keep=4.6)
+    doc.plot(tp_name, results, f"Figure 1: {figure_caption(tp_name)}")
+    doc.heading("4.1 Optimal Results", level=2)
+    if optimal is None:
+        doc.paragraph(MISSING_RESULTS_TEXT)
+    else:
+        doc.paragraph(OPTIMAL_RESULTS_TEXT)
+        for sentence, value, unit in optimal:
+            doc.paragraph(f"{sentence}: {value} {unit}", indent=0.4, bullet="•")
+        doc.heading("4.2 Qualitative Analysis", level=2)
+        doc.paragraph(qualitative_analysis_text(tp_name))
+
+    doc.heading("5 Conclusion")
+    doc.paragraph(conclusion_text(tp_name, results))
+    return doc, toc_anchor
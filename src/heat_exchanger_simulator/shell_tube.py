@@ -0,0 +1,297 @@
+#shell-and-tube exchanger model (cold fluid in the tubes, hot fluid on the shell side)
+import numpy as np
+import profiling
+from core import (fluid_properties, material_properties, convection_coefficient_array, friction_factor, sweep_results,
+                  wall_resistance, INVALID_GEOMETRY, INVALID_FLOW, TEMPERATURE_CROSS, NON_FINITE)
+from correlations import DEFAULT_CORRELATION, get_correlation
+
+# Bundle diameter constants (K1, n1) per tube layout and number of tube passes,
+# Db = do * (Nt / K1) ** (1 / n1) (Coulson & Richardson, Vol. 6)
+BUNDLE_CONSTANTS = {
+    "triangular": {1: (0.319, 2.142), 2: (0.249, 2.207), 4: (0.175, 2.285), 6: (0.0743, 2.499), 8: (0.0365, 2.675)},
+    "square": {1: (0.215, 2.207), 2: (0.156, 2.291), 4: (0.158, 2.263), 6: (0.0402, 2.617), 8: (0.0331, 2.643)},
+}
+SHELL_CLEARANCE = 0.015  # Shell inner diameter minus bundle diameter (m), fixed tube sheet
+RETURN_LOSS_HEADS = 2.5  # Velocity heads lost per tube pass in headers and return bends
+
+DEFAULT_GEOMETRY = {
+    "tube_outer_diameter": 0.019,
+    "tube_thickness": 0.002,
+    "tube_length": 4.0,
+    "n_tubes": 200,
+    "tube_passes": 2,
+    "pitch": 0.025,
+    "layout": "triangular",
+    "baffle_spacing": 0.3,
+    "shell_diameter": None,
+    "fouling_internal": 0.0,  # Fouling resistances (m²·K/W), tube side and shell side
+    "fouling_external": 0.0,
+}
+
+# Geometry entries that can be swept (the others are structural choices)
+SWEEPABLE_GEOMETRY = ("tube_outer_diameter", "tube_thickness", "tube_length", "n_tubes", "pitch", "baffle_spacing", "shell_diameter",
+                      "fouling_internal", "fouling_external")
+
+def bundle_diameter(n_tubes, tube_outer_diameter, layout="triangular", passes=1):
+    """
+    Tube bundle diameter from the tube count.
+
+    Args:
+        n_tubes (float or array): Number of tubes.
+        tube_outer_diameter (float or array): Tube outer diameter (m).
+        layout (str): "triangular" or "square" pitch.
+        passes (int): Number of tube passes (1, 2, 4, 6 or 8).
+
+    Returns:
+        float or numpy.ndarray: Bundle diameter (m).
+    """
+    if layout not in BUNDLE_CONSTANTS:
+        raise ValueError(f"Unknown tube layout '{layout}' (use 'triangular' or 'square').")
+    if passes not in BUNDLE_CONSTANTS[layout]:
+        raise ValueError(f"No bundle constants for {passes} tube passes; give the shell_diameter explicitly.")
+    K1, n1 = BUNDLE_CONSTANTS[layout][passes]
+    return tube_outer_diameter * (np.asarray(n_tubes, dtype=float) / K1) ** (1 / n1)
+
+def shell_equivalent_diameter(pitch, tube_outer_diameter, layout="triangular"):
+    """
+    Shell-side equivalent diameter (Kern).
+
+    Args:
+        pitch (float or array): Tube pitch (m).
+        tube_outer_diameter (float or array): Tube outer diameter (m).
+        layout (str): "triangular" or "square" pitch.
+
+    Returns:
+        float or numpy.ndarray: Equivalent diameter (m).
+    """
+    if layout == "triangular":
+        return 1.10 / tube_outer_diameter * (pitch ** 2 - 0.917 * tube_outer_diameter ** 2)
+    return 1.27 / tube_outer_diameter * (pitch ** 2 - 0.785 * tube_outer_diameter ** 2)
+
+def effectiveness(NTU, Cr, passes):
+    """
+    Effectiveness of a counter-flow exchanger (1 tube pass) or of a one shell pass,
+    even tube passes exchanger (2 or more tube passes).
+
+    Args:
+        NTU (array): Number of transfer units U * A / C_min.
+        Cr (array): Heat capacity rate ratio C_min / C_max.
+        passes (int): Number of tube passes.
+
+    Returns:
+        numpy.ndarray: Effectiveness.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if passes == 1:
+            e = np.exp(-NTU * (1 - Cr))
+            return np.where(np.abs(1 - Cr) < 1e-9, NTU / (1 + NTU), (1 - e) / (1 - Cr * e))
+        root = np.sqrt(1 + Cr ** 2)
+        e = np.exp(-NTU * root)
+        return 2 / (1 + Cr + root * (1 + e) / (1 - e))
+
+def tubes_per_pass(n_tubes, passes):
+    """
+    Spread the tubes over the passes (the first passes get the remainder).
+
+    Args:
+        n_tubes (float or array): Number of tubes.
+        passes (int): Number of tube passes.
+
+    Returns:
+        numpy.ndarray: Tubes in each pass, shape (..., passes).
+    """
+    n_tubes = np.floor(np.asarray(n_tubes, dtype=float))[..., None]
+    base = np.floor(n_tubes / passes)
+    remainder = n_tubes - base * passes
+    return base + (np.arange(passes) < remainder)
+
+@profiling.profiled("solve_shell_and_tube_points", "simulation")
+def solve_shell_and_tube_points(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, geometry=None, correlation=DEFAULT_CORRELATION):
+    """
+    Solve a batch of shell-and-tube operating points at once.
+
+    The cold fluid flows in the tubes, the hot fluid on the shell side (Kern method).
+    Tube-side coefficients and pressure drops are computed per pass (passes may hold
+    different tube counts); outlets follow from the effectiveness-NTU relations.
+    Every numeric argument, and the sweepable geometry entries, may be arrays.
+
+    Args:
+        fluid (str): Cold (tube-side) fluid name.
+        hot_fluid (str): Hot (shell-side) fluid name.
+        material (str): Tube material.
+        flow_cold (float or array): Cold fluid flow rate (L/min).
+        flow_hot (float or array): Hot fluid flow rate (L/min).
+        T_cold_in (float or array): Cold fluid inlet temperature (°C).
+        T_hot_in (float or array): Hot fluid inlet temperature (°C).
+        geometry (dict, optional): Entries of DEFAULT_GEOMETRY to override.
+        correlation (str): Tube-side Nusselt correlation (see correlations.available_correlations("tube")).
+
+    Returns:
+        dict: Same arrays as core.solve_points, plus "T_hot_out", "shell_diameter",
+        "tubes_per_pass", "Re_tube_passes", "h_tube_passes" and "dp_tube_passes" (last axis = passes).
+    """
+    geometry = {**DEFAULT_GEOMETRY, **(geometry or {})}
+    passes = int(geometry["tube_passes"])
+    layout = geometry["layout"]
+    if passes < 1:
+        raise ValueError("tube_passes must be at least 1.")
+    if layout not in BUNDLE_CONSTANTS:
+        raise ValueError(f"Unknown tube layout '{layout}' (use 'triangular' or 'square').")
+    if get_correlation(correlation)["kind"] != "tube":
+        raise ValueError(f"Correlation '{correlation}' is for annuli and cannot be used inside the tubes.")
+    cold = fluid_properties(fluid)
+    hot = fluid_properties(hot_fluid)
+    _, wall_roughness = material_properties(material)
+
+    do, thickness, length, n_tubes, pitch, baffle_spacing, fouling_internal, fouling_external = (
+        np.asarray(geometry[key], dtype=float)
+        for key in ("tube_outer_diameter", "tube_thickness", "tube_length", "n_tubes", "pitch", "baffle_spacing",
+                    "fouling_internal", "fouling_external")
+    )
+    if geometry["shell_diameter"] is None:
+        shell_diameter = bundle_diameter(n_tubes, do, layout, passes) + SHELL_CLEARANCE
+    else:
+        shell_diameter = np.asarray(geometry["shell_diameter"], dtype=float)
+    flow_cold, flow_hot, T_cold_in, T_hot_in = (np.asarray(x, dtype=float) for x in (flow_cold, flow_hot, T_cold_in, T_hot_in))
+    shape = np.broadcast_shapes(do.shape, thickness.shape, length.shape, n_tubes.shape, pitch.shape, baffle_spacing.shape,
+                                shell_diameter.shape, flow_cold.shape, flow_hot.shape, T_cold_in.shape, T_hot_in.shape,
+                                fouling_internal.shape, fouling_external.shape)
+    do, thickness, length, n_tubes, pitch, baffle_spacing, shell_diameter, flow_cold, flow_hot, T_cold_in, T_hot_in = (
+        np.broadcast_to(x, shape) for x in (do, thickness, length, n_tubes, pitch, baffle_spacing, shell_diameter,
+                                             flow_cold, flow_hot, T_cold_in, T_hot_in)
+    )
+    di = do - 2 * thickness
+
+    reason = np.zeros(shape, dtype=np.int64)
+    reason |= np.where(~((do > 0) & (thickness >= 0) & (di > 0) & (length > 0) & (n_tubes >= passes)
+                         & (pitch > do) & (baffle_spacing > 0) & (shell_diameter > do)), INVALID_GEOMETRY, 0)
+    reason |= np.where(~((flow_cold > 0) & (flow_hot > 0)), INVALID_FLOW, 0)
+    reason |= np.where(~(T_hot_in > T_cold_in), TEMPERATURE_CROSS, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        m_dot_cold = flow_cold * cold["rho"] / 60
+        m_dot_hot = flow_hot * hot["rho"] / 60
+
+        # Tube side, one column per pass: the whole cold flow goes through every pass
+        tubes = tubes_per_pass(n_tubes, passes)
+        Re_passes = 4 * (m_dot_cold[..., None] / tubes) / (np.pi * di[..., None] * cold["mu"])
+        h_passes = convection_coefficient_array(
+            cold, Re_passes, cold["mu"] * cold["cp"] / cold["k"],
+            {"diameter": di[..., None], "length": length[..., None], "heating": True}, correlation
+        )
+        h_internal = (tubes * h_passes).sum(axis=-1) / tubes.sum(axis=-1)
+        Re_internal = (tubes * Re_passes).sum(axis=-1) / tubes.sum(axis=-1)
+
+        # Shell side (Kern): cross-flow area between baffles and equivalent diameter
+        cross_flow_area = (pitch - do) * shell_diameter * baffle_spacing / pitch
+        De = shell_equivalent_diameter(pitch, do, layout)
+        Re_external = m_dot_hot * De / (cross_flow_area * hot["mu"])
+        Pr_hot = hot["mu"] * hot["cp"] / hot["k"]
+        h_external = 0.36 * hot["k"] / De * Re_external ** 0.55 * Pr_hot ** (1 / 3)
+
+        # Pressure drop: friction and return losses per tube pass, Kern's shell-side correlation
+        rho_cold = cold["rho"] * 1000  # kg/L -> kg/m³
+        rho_hot = hot["rho"] * 1000
+        velocity_passes = 4 * (m_dot_cold[..., None] / tubes) / (rho_cold * np.pi * di[..., None] ** 2)
+        f_passes = friction_factor(Re_passes, wall_roughness / di[..., None])
+        dp_passes = (f_passes * length[..., None] / di[..., None] + RETURN_LOSS_HEADS) * rho_cold * velocity_passes ** 2 / 2
+        dp_internal = dp_passes.sum(axis=-1)
+        G_shell = m_dot_hot / cross_flow_area
+        f_shell = np.exp(0.576 - 0.19 * np.log(Re_external))
+        dp_external = f_shell * G_shell ** 2 * shell_diameter * (length / baffle_spacing) / (2 * rho_hot * De)
+        pumping_power = (dp_internal * flow_cold + dp_external * flow_hot) / 60000  # L/min -> m³/s
+
+        # Overall coefficient referred to the tube outer surface
+        U = 1 / (do / (di * h_internal) + fouling_internal * do / di + np.pi * do * wall_resistance(do, thickness, material)
+                 + fouling_external + 1 / h_external)
+        A = n_tubes * np.pi * do * length
+
+        C_cold = m_dot_cold * cold["cp"]
+        C_hot = m_dot_hot * hot["cp"]
+        C_min = np.minimum(C_cold, C_hot)
+        C_max = np.maximum(C_cold, C_hot)
+        eps = effectiveness(U * A / C_min, C_min / C_max, passes)
+        Q = eps * C_min * (T_hot_in - T_cold_in)
+        T_out = T_cold_in + Q / C_cold
+        T_hot_out = T_hot_in - Q / C_hot
+        delta_T_lm = Q / (U * A)  # Mean temperature difference, pass correction included
+        efficiency = Q / (C_cold * (T_hot_in - T_cold_in))
+
+    T_out, T_hot_out, Q, delta_T_lm, efficiency = (np.array(x, dtype=float) for x in (T_out, T_hot_out, Q, delta_T_lm, efficiency))
+    reason[(reason == 0) & ~np.isfinite(T_out)] |= NON_FINITE
+    valid = reason == 0
+    for column in (T_out, T_hot_out, Q, delta_T_lm, efficiency):
+        column[~valid] = np.nan
+    return {
+        "T_out": T_out,
+        "T_hot_out": T_hot_out,
+        "Q": Q,
+        "efficiency": efficiency,
+        "U": U,
+        "Re_internal": Re_internal,
+        "Re_external": Re_external,
+        "delta_T_lm": delta_T_lm,
+        "h_internal": h_internal,
+        "h_external": h_external,
+        "A": A,
+        "dp_internal": dp_internal,
+        "dp_external": dp_external,
+        "pumping_power": pumping_power,
+        "shell_diameter": np.array(shell_diameter, dtype=float),
+        "tubes_per_pass": tubes,
+        "Re_tube_passes": Re_passes,
+        "h_tube_passes": h_passes,
+        "dp_tube_passes": dp_passes,
+        # Closed-form solution: no iteration and no energy-balance mismatch
+        "residual": np.where(valid, 0.0, np.nan),
+        "iterations": np.zeros(shape, dtype=np.int64),
+        "energy_balance_error": np.where(valid, 0.0, np.nan),
+        "reason": reason,
+        "valid": valid,
+    }
+
+@profiling.profiled("simulate_shell_and_tube", "simulation")
+def simulate_shell_and_tube(fluid, hot_fluid, material, flow_cold, flow_hot, T_cold_in, T_hot_in, geometry, parameter, start, end, steps, diagnostics=False, correlation=DEFAULT_CORRELATION):
+    """
+    Sweep one operating or geometry parameter of a shell-and-tube exchanger.
+
+    Args:
+        fluid (str): Cold (tube-side) fluid name.
+        hot_fluid (str): Hot (shell-side) fluid name.
+        material (str): Tube material.
+        flow_cold (float): Cold fluid flow rate (L/min).
+        flow_hot (float): Hot fluid flow rate (L/min).
+        T_cold_in (float): Cold fluid inlet temperature (°C).
+        T_hot_in (float): Hot fluid inlet temperature (°C).
+        geometry (dict): Entries of DEFAULT_GEOMETRY to override.
+        parameter (str): Swept parameter: "flow_cold", "flow_hot", "T_cold_in", "T_hot_in"
+            or one of SWEEPABLE_GEOMETRY.
+        start (float): First value.
+        end (float): Last value.
+        steps (int): Number of values.
+        diagnostics (bool): Add per-point "residual", "iterations" and "energy_balance_error".
+        correlation (str): Tube-side Nusselt correlation.
+
+    Returns:
+        dict: Simulation results (same columns as the TP sweeps) with "parameter", the swept
+        values under its own name, "T_hot_out", "shell_diameter" and "h_internal_passes".
+    """
+    try:
+        values = np.linspace(start, end, steps)
+        inputs = {"flow_cold": flow_cold, "flow_hot": flow_hot, "T_cold_in": T_cold_in, "T_hot_in": T_hot_in}
+        geometry = {**DEFAULT_GEOMETRY, **(geometry or {})}
+        if parameter in inputs:
+            inputs[parameter] = values
+        elif parameter in SWEEPABLE_GEOMETRY:
+            geometry[parameter] = values
+        else:
+            raise ValueError(f"Cannot sweep '{parameter}'.")
+        points = solve_shell_and_tube_points(fluid, hot_fluid, material, geometry=geometry, correlation=correlation, **inputs)
+        with profiling.span("simulate_shell_and_tube.results", "simulation"):
+            results = sweep_results("Shell-and-tube", {parameter: values.tolist(), "parameter": parameter}, points, diagnostics)
+            shape = points["valid"].shape
+            results["shell_diameter"] = np.broadcast_to(points["shell_diameter"], shape).tolist()
+            results["h_internal_passes"] = np.broadcast_to(points["h_tube_passes"], shape + points["h_tube_passes"].shape[-1:]).tolist()
+        return results
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la simulation shell-and-tube : {str(e)}")
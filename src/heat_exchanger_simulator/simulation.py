@@ -1,5 +1,215 @@
-#to manage animation (visual simulation)
-# Placeholder for animation logic
-def animate_exchanger(canvas):
-    # TODO: Implement animated exchanger diagram
-    pass
\ No newline at end of file
+#to manage animation (visual simulation): axial temperature profiles and flow direction, blitted
+import time
+import numpy as np
+from matplotlib import colormaps, colors
+from profiles import axial_profiles
+
+def exchanger_state(model, index=None):
+    """
+    Operating point of an ExchangerModel to animate.
+
+    Args:
+        model (ExchangerModel): Model holding the last simulated batch.
+        index (int, optional): Point of the batch, the middle valid point by default.
+
+    Returns:
+        dict: "T_cold_in", "T_cold_out", "T_hot_in", "T_hot_out" (°C), "velocity_cold" and
+        "velocity_hot" (m/s) and "length" (m); None if no point of the batch is valid.
+    """
+    outlet = model["outlet"]
+    shape = outlet["reason"].shape
+    valid = np.flatnonzero(np.ravel(outlet["valid"]))
+    if not len(valid):
+        return None
+    index = valid[len(valid) // 2] if index is None else index
+    point = lambda name: float(np.broadcast_to(model[name], shape).flat[index])
+    ro, ri, gap = point("outer_diameter") / 2, point("outer_diameter") / 2 - point("thickness"), point("gap")
+    return {
+        "T_cold_in": point("T_cold_in"),
+        "T_cold_out": float(np.ravel(outlet["T_out"])[index]),
+        "T_hot_in": point("T_hot_in"),
+        "T_hot_out": float(np.ravel(outlet["T_hot_out"])[index]),
+        "velocity_cold": point("flow_cold") / 60000 / (np.pi * ri ** 2),
+        "velocity_hot": point("flow_hot") / 60000 / (np.pi * ((ro + gap) ** 2 - ro ** 2)),
+        "length": point("length"),
+    }
+
+def exchanger_frames(state, frames=120, particles=16, grid=200, seed=0):
+    """
+    Precompute an animation loop: the axial profiles and, for every frame, the positions of
+    the particles showing the flow direction (cold to the right in the tube, hot to the left
+    in the annulus, the faster fluid crossing the pipe twice per loop).
+
+    Args:
+        state (dict): See exchanger_state.
+        frames (int): Frames per loop.
+        particles (int): Particles per fluid.
+        grid (int): Profile points along the pipe.
+        seed (int): Seed of the particle placement.
+
+    Returns:
+        dict: "x" (m), "T_cold", "T_hot" (°C, on x), "cold" and "hot" (particle positions,
+        frames × particles × 2, y in the schematic units), "cold_tracer" and "hot_tracer"
+        (frames × 2, (x, T) of one particle of each fluid on the profile plot).
+    """
+    length = state["length"]
+    x = np.linspace(0, 1, grid)
+    T_cold, T_hot = axial_profiles(state["T_cold_in"], state["T_cold_out"], state["T_hot_in"], state["T_hot_out"], x)
+    fastest = max(state["velocity_cold"], state["velocity_hot"], 1e-12)
+    # Whole number of passes per loop, so that the last frame joins the first one
+    passes = {side: max(1, round(2 * state[f"velocity_{side}"] / fastest)) for side in ("cold", "hot")}
+    rng = np.random.default_rng(seed)
+    phase = np.arange(frames)[:, None] / frames
+    result = {"x": x * length, "T_cold": T_cold, "T_hot": T_hot}
+    for side, direction, band in (("cold", 1, (-0.3, 0.3)), ("hot", -1, (0.65, 0.95))):
+        start = (np.arange(particles) + rng.uniform(0, 1, particles)) / particles
+        position = (start[None, :] + direction * passes[side] * phase) % 1
+        y = rng.uniform(*band, particles)
+        if side == "hot":
+            y[1::2] *= -1  # annulus above and below the tube
+        result[side] = np.stack([position * length, np.broadcast_to(y, position.shape)], axis=-1)
+        tracer = position[:, 0]
+        profile = T_cold if side == "cold" else T_hot
+        result[f"{side}_tracer"] = np.stack([tracer * length, np.interp(tracer, x, profile)], axis=-1)
+    return result
+
+class ExchangerAnimation:
+    """
+    Animated exchanger on a Matplotlib canvas: a temperature map of the tube and annulus
+    with moving particles, above the T(x) profiles with one tracer per fluid.
+
+    The frames are precomputed; every tick only restores the cached background and draws
+    the four moving artists (blitting), so a frame costs well under a millisecond of the
+    Tk event loop. Frames are chosen from the elapsed time, so a late tick skips frames
+    instead of slowing the motion.
+    """
+    def __init__(self, canvas, fps=60, frames=120, particles=16):
+        """
+        Args:
+            canvas (FigureCanvasTkAgg): Canvas to draw on (its figure is cleared).
+            fps (int): Target frame rate.
+            frames (int): Frames per loop (2 s at 60 fps).
+            particles (int): Particles per fluid.
+        """
+        self.canvas, self.fps, self.frames, self.particles = canvas, fps, frames, particles
+        self.figure = canvas.figure
+        self.figure.clear()
+        self.pipe, self.plot = self.figure.subplots(2, 1, gridspec_kw={"height_ratios": [1, 1.3]})
+        self.data = None
+        self.background = None
+        self.frame = 0
+        self.running = False
+        self._after = None
+        self._start = time.perf_counter()
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+        self.map = self.pipe.imshow(np.zeros((20, 2)), aspect="auto", origin="lower", extent=(0, 1, -1, 1), interpolation="nearest",
+                                    cmap=colormaps["coolwarm"].with_extremes(bad="0.45"))
+        self.cold = self.pipe.scatter([], [], marker=">", s=18, c="white", edgecolors="black", linewidths=0.4, animated=True)
+        self.hot = self.pipe.scatter([], [], marker="<", s=18, c="white", edgecolors="black", linewidths=0.4, animated=True)
+        self.pipe.set_yticks([])
+        self.pipe.set_title("Cold fluid → (tube)   ← Hot fluid (annulus)", fontsize=9)
+        self.cold_line, = self.plot.plot([], [], "b-", label="Cold")
+        self.hot_line, = self.plot.plot([], [], "r-", label="Hot")
+        self.cold_tracer, = self.plot.plot([], [], "bo", animated=True)
+        self.hot_tracer, = self.plot.plot([], [], "ro", animated=True)
+        self.plot.set_xlabel("Position (m)")
+        self.plot.set_ylabel("Temperature (°C)")
+        self.plot.grid(True)
+        self.plot.legend(loc="best", fontsize=8)
+        self.figure.tight_layout()
+        self.animated = (self.cold, self.hot, self.cold_tracer, self.hot_tracer)
+        for artist in self.animated:
+            artist.set_visible(False)
+
+    def set_state(self, state):
+        """Animate a new operating point (see exchanger_state); None shows an empty view."""
+        if state is None:
+            self.data = None
+            for artist in self.animated:
+                artist.set_visible(False)
+            self.canvas.draw_idle()
+            return
+        self.data = exchanger_frames(state, self.frames, self.particles)
+        length = state["length"]
+        T_cold, T_hot = self.data["T_cold"], self.data["T_hot"]
+        # Tube (|y| < 0.4) inside the annulus (|y| > 0.5), the pipe wall in between
+        y = np.abs((np.arange(20) + 0.5) / 10 - 1)[:, None]
+        self.map.set_data(np.ma.masked_invalid(np.where(y < 0.4, T_cold, np.where(y > 0.5, T_hot, np.nan))))
+        self.map.set_extent((0, length, -1, 1))
+        self.map.set_norm(colors.Normalize(state["T_cold_in"], state["T_hot_in"]))
+        self.pipe.set_xlim(0, length)
+        self.cold_line.set_data(self.data["x"], T_cold)
+        self.hot_line.set_data(self.data["x"], T_hot)
+        self.plot.set_xlim(0, length)
+        margin = 0.05 * (state["T_hot_in"] - state["T_cold_in"])
+        self.plot.set_ylim(state["T_cold_in"] - margin, state["T_hot_in"] + margin)
+        for artist in self.animated:
+            artist.set_visible(True)
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        # Full redraws (new state, resize) exclude the animated artists: cache the result
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_frame(self.frame)
+
+    def draw_frame(self, frame):
+        """Blit one precomputed frame over the cached background."""
+        self.frame = frame % self.frames
+        if self.data is None or self.background is None:
+            return
+        data = self.data
+        self.canvas.restore_region(self.background)
+        self.cold.set_offsets(data["cold"][self.frame])
+        self.hot.set_offsets(data["hot"][self.frame])
+        self.cold_tracer.set_data(data["cold_tracer"][self.frame, :1], data["cold_tracer"][self.frame, 1:])
+        self.hot_tracer.set_data(data["hot_tracer"][self.frame, :1], data["hot_tracer"][self.frame, 1:])
+        for artist in self.animated:
+            artist.axes.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def start(self):
+        """Run the animation on the Tk event loop."""
+        if not self.running:
+            self.running = True
+            self._start = time.perf_counter() - self.frame / self.fps
+            self._tick()
+
+    def stop(self):
+        """Pause the animation."""
+        self.running = False
+        if self._after is not None:
+            try:
+                self.canvas.get_tk_widget().after_cancel(self._after)
+            except Exception:
+                pass
+            self._after = None
+
+    def _tick(self):
+        widget = self.canvas.get_tk_widget()
+        try:
+            if not self.running or not widget.winfo_exists():
+                self.running = False
+                return
+            self.draw_frame(int((time.perf_counter() - self._start) * self.fps))
+            self._after = widget.after(max(1, int(1000 / self.fps)), self._tick)
+        except Exception:
+            # The window was closed between two ticks
+            self.running = False
+
+def animate_exchanger(canvas, state=None, fps=60):
+    """
+    Start an animated view of the exchanger on a Matplotlib Tk canvas.
+
+    Args:
+        canvas (FigureCanvasTkAgg): Canvas to draw on.
+        state (dict, optional): Operating point, see exchanger_state.
+        fps (int): Target frame rate.
+
+    Returns:
+        ExchangerAnimation: The running animation (set_state() shows another point, stop() pauses it).
+    """
+    animation = ExchangerAnimation(canvas, fps=fps)
+    animation.set_state(state)
+    animation.start()
+    return animation
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The package modules import each other by name (e.g., "from utils import ..."), as when running main.py
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "heat_exchanger_simulator"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
@@ -0,0 +1,26 @@
+import bench
+
+
+def test_compare_flags_slowdown_and_memory_growth():
+    baseline = {"results": {"case": {"throughput": 100.0, "peak_memory_mb": 10.0}}}
+    current = {"results": {"case": {"throughput": 70.0, "peak_memory_mb": 20.0}}}
+    regressions = bench.compare(current, baseline, threshold=0.2)
+    assert len(regressions) == 2
+
+
+def test_compare_accepts_results_within_threshold():
+    baseline = {"results": {"case": {"throughput": 100.0, "peak_memory_mb": 10.0}}}
+    current = {"results": {"case": {"throughput": 85.0, "peak_memory_mb": 11.0}}, "extra": {}}
+    assert bench.compare(current, baseline, threshold=0.2) == []
+
+
+def test_report_benchmark_runs_with_pdflatex_stand_in():
+    results = bench.run_benchmarks(["report"])["results"]
+    assert set(results) == {"report.latex", "report.pdf", "report.html"}
+    assert all(r["throughput"] > 0 for r in results.values())
+
+
+def test_float32_accuracy_is_within_the_benchmark_tolerance():
+    accuracy = bench.precision_accuracy(1_000)
+    assert all(accuracy[key] <= limit for key, limit in bench.PRECISION_TOLERANCE.items())
+    assert accuracy["reason_mismatches"] == 0
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import calibration
+import core
+
+PIPE = {"outer_diameter": 0.025, "thickness": 0.002, "length": 2.0}
+
+
+def _measurements(pipe, n=400, noise=0.0, seed=0, correlation=None):
+    rng = np.random.default_rng(seed)
+    data = {"flow_cold": rng.uniform(5, 20, n), "flow_hot": rng.uniform(5, 20, n),
+            "T_cold_in": rng.uniform(10, 25, n), "T_hot_in": rng.uniform(60, 90, n)}
+    points = core.solve_points("water", "water", "copper (pure)", data["flow_cold"], data["flow_hot"],
+                               data["T_cold_in"], data["T_hot_in"], pipe, correlation=correlation)
+    data["T_cold_out"] = points["T_out"] + rng.normal(0, noise, n)
+    return data
+
+
+def test_fouling_lowers_the_overall_coefficient():
+    clean = core.calculate_overall_heat_transfer_coefficient(PIPE, "copper (pure)", 2000, 1500)
+    fouled = core.calculate_overall_heat_transfer_coefficient(PIPE, "copper (pure)", 2000, 1500, fouling_internal=2e-4)
+    assert fouled < clean
+    assert 1 / fouled - 1 / clean == pytest.approx(2e-4 * PIPE["outer_diameter"] / (PIPE["outer_diameter"] - 2 * PIPE["thickness"]))
+
+
+@pytest.mark.parametrize("jacobian", ["analytic", "finite-difference"])
+def test_calibration_recovers_fouling_and_multiplier(jacobian):
+    data = _measurements(dict(PIPE, fouling_internal=3e-4))
+    data["T_cold_out"][5] = np.nan
+    fit = calibration.calibrate(data, "water", "water", "copper (pure)", PIPE, jacobian=jacobian,
+                                parameters=("fouling_internal", "h_external_factor"))
+    assert fit["converged"] and fit["samples"] == 399
+    assert fit["parameters"]["fouling_internal"] == pytest.approx(3e-4, rel=1e-5)
+    assert fit["parameters"]["h_external_factor"] == pytest.approx(1.0, rel=1e-5)
+    assert fit["rms"] < 1e-6 and np.isnan(fit["residuals"][5])
+
+
+def test_segment_fouling_follows_its_growth():
+    days = np.repeat(np.arange(10), 24)
+    truth = 1e-4 * (1 + days)
+    data = _measurements(dict(PIPE, fouling_internal=truth), n=len(days), noise=0.01)
+    fit = calibration.calibrate(data, "water", "water", "copper (pure)", PIPE, segments=days)
+    fouling = fit["parameters"]["fouling_internal"]
+    assert fouling.shape == (10,)
+    assert np.all(np.abs(fouling - 1e-4 * np.arange(1, 11)) < 5 * fit["std_error"]["fouling_internal"])
+    assert fit["pipe_properties"]["fouling_internal"] == fouling[-1]
+    core.simulate_tp1("water", "water", "copper (pure)", 15, 60, 1, 20, 7, fit["pipe_properties"])
+    replay = calibration.calibrated_pipe_properties(fit, days)
+    np.testing.assert_allclose(replay["fouling_internal"], fouling[days])
+    assert calibration.calibrated_pipe_properties(fit, 3)["fouling_internal"] == fouling[3]
+
+
+def test_multipliers_stay_global_and_the_registry_is_untouched():
+    import correlations
+
+    days = np.repeat(np.arange(2), 50)
+    data = _measurements(PIPE, n=len(days))
+    with pytest.raises(ValueError):
+        calibration.calibrate(data, "water", "water", "copper (pure)", PIPE, parameters=("h_external_factor",),
+                              segments=days, segment_parameters=("h_external_factor",))
+    registered = correlations.available_correlations()
+    data = _measurements(PIPE, correlation={"internal": ("legacy", 1.3)})
+    fit = calibration.calibrate(data, "water", "water", "copper (pure)", PIPE, parameters=("h_internal_factor",))
+    name, factor = fit["correlation_factors"]["internal"]
+    assert name == "legacy" and factor == pytest.approx(1.3, rel=1e-6)
+    correlation = calibration.calibrated_correlation(fit)
+    assert correlation == {"internal": ("legacy", factor), "external": "legacy"}
+    points = core.solve_points("water", "water", "copper (pure)", data["flow_cold"], data["flow_hot"],
+                               data["T_cold_in"], data["T_hot_in"], PIPE, correlation=correlation)
+    np.testing.assert_allclose(points["T_out"], data["T_cold_out"], atol=1e-6)
+    assert correlations.available_correlations() == registered
@@ -0,0 +1,41 @@
+import numpy as np
+
+import catalog
+from core import solve_points, wall_resistance
+
+
+def test_catalog_scan_matches_single_pipe_solves():
+    flows = np.array([2.0, 5.0, 10.0])
+    results = catalog.scan_catalog("water", "water", "copper (pure)", flows, 5, 15, 60, names=["NPS 1 Sch 40", "NPS 2 Sch 80"])
+    assert results["names"] == ["NPS 1 Sch 40", "NPS 2 Sch 80"]
+    assert results["Q"].shape == (2, 3)
+    for row, name in enumerate(results["names"]):
+        # Without the cached wall resistance, solve_points computes it from the geometry
+        single = solve_points("water", "water", "copper (pure)", flows, 5, 15, 60, catalog.pipe_preset(name))
+        np.testing.assert_allclose(results["Q"][row], single["Q"])
+
+
+def test_catalog_rejects_impossible_pipes(tmp_path):
+    path = tmp_path / "pipes.csv"
+    path.write_text("name,nominal_size,schedule,outer_diameter_mm,thickness_mm\nbad,1,40,10,6\n")
+    try:
+        catalog.load_pipe_catalog(path)
+    except ValueError as e:
+        assert "bad" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_unknown_materials_are_rejected_instead_of_read_as_steel():
+    # k = 401 W/m·K for pure copper, 16 for stainless steel
+    ratio = wall_resistance(0.03, 0.003, "stainless steel") / wall_resistance(0.03, 0.003, "copper (pure)")
+    np.testing.assert_allclose(ratio, 401 / 16)
+    for call in (lambda: wall_resistance(0.03, 0.003, "copper"),
+                 lambda: catalog.scan_catalog("water", "water", "copper", 5, 5, 15, 60),
+                 lambda: solve_points("water", "water", "no-such-metal", 5, 5, 15, 60, catalog.pipe_preset("NPS 1 Sch 40"))):
+        try:
+            call()
+        except ValueError as e:
+            assert "Unknown pipe material" in str(e)
+        else:
+            raise AssertionError("expected ValueError")
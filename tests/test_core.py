@@ -1,2 +1,74 @@
+import numpy as np
+import pytest
 
+import core
 
+
+def test_friction_factor_solves_colebrook_and_is_laminar_below_2300():
+    Re = np.array([3e3, 1e4, 1e5, 1e6, 1e8])
+    relative_roughness = np.array([1e-4, 1e-3, 1e-2, 5e-2, 1e-6])
+    x = 1 / np.sqrt(core.friction_factor(Re, relative_roughness))
+    np.testing.assert_allclose(x, -2 * np.log10(relative_roughness / 3.7 + 2.51 * x / Re), rtol=1e-9)
+    assert core.friction_factor(1000.0, 1e-3) == 64 / 1000.0
+
+
+def test_pressure_drop_grows_with_flow_and_roughness():
+    pipe = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+    smooth = core.solve_points("water", "water", "copper (pure)", np.array([50.0, 100.0]), 10, 20, 80, pipe)
+    rough = core.solve_points("water", "water", "iron", np.array([50.0, 100.0]), 10, 20, 80, pipe)
+    assert smooth["dp_internal"][1] > smooth["dp_internal"][0] > 0
+    assert np.all(rough["dp_internal"] > smooth["dp_internal"])
+    assert np.all(rough["pumping_power"] > 0)
+
+
+def test_smooth_correlation_has_no_jump_at_the_regime_change():
+    import correlations
+
+    Re = np.linspace(1500, 12000, 20001)
+    geometry = {"diameter": 0.1, "length": 2.0}
+    assert np.abs(np.diff(correlations.nusselt("smooth", Re, 7.0, geometry))).max() < 0.01
+    assert np.abs(np.diff(correlations.nusselt("legacy", Re, 7.0, geometry))).max() > 10
+
+
+def test_custom_correlation_is_selectable_per_sweep():
+    import correlations
+
+    def double(Re, Pr, geometry):
+        return 2 * correlations.nusselt("legacy", Re, Pr, geometry)
+
+    with correlations.registered_correlation("double_legacy", double):
+        pipe = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+        legacy = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 10, pipe)
+        custom = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 10, pipe, correlation="double_legacy")
+        np.testing.assert_allclose(custom["h_internal"], 2 * np.asarray(legacy["h_internal"]))
+    assert "double_legacy" not in correlations.available_correlations()
+
+
+def test_registry_rejects_duplicates_and_scaled_reuses_its_entry():
+    import correlations
+
+    with pytest.raises(ValueError):
+        correlations.register_correlation("legacy")(lambda Re, Pr, geometry: Re)
+    first = correlations.scaled("gnielinski", 1.0000001)
+    second = correlations.scaled("gnielinski", 1.0000002)
+    try:
+        assert first != second
+        assert correlations.scaled("gnielinski", 1.0000001) == first
+        geometry = {"diameter": 0.1, "length": 2.0}
+        ratio = correlations.nusselt(second, 2e4, 7.0, geometry) / correlations.nusselt(first, 2e4, 7.0, geometry)
+        np.testing.assert_allclose(ratio, 1.0000002 / 1.0000001, rtol=1e-12)
+    finally:
+        correlations.unregister_correlation(first)
+        correlations.unregister_correlation(second)
+    assert first not in correlations.available_correlations()
+
+
+def test_tp3_keeps_hot_fluids_whose_duty_exceeds_their_capacity():
+    results = core.simulate_tp3("water", "iron", 10, 10, {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0},
+                                diagnostics=True, arrays=True)
+    assert len(results["hot_fluids"]) == 9 and results["valid"].all()
+    # Gases cannot release the LMTD duty: their energy-balance outlet falls below the cold inlet,
+    # which the energy-balance error reports instead of dropping the points
+    short = [fluid for fluid, T in zip(results["hot_fluids"], results["T_hot_out"]) if T < 20]
+    assert short == ["air", "steam", "nitrogen", "carbon dioxide", "helium"]
+    assert (results["energy_balance_error"][results["T_hot_out"] < 20] > 0.5).all()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import core
+import degradation
+
+PIPE = {"outer_diameter": 0.025, "thickness": 0.002, "length": 2.0}
+SCHEDULE = {"flow_cold": 10, "flow_hot": 12, "T_cold_in": 15, "T_hot_in": 70}
+
+
+def test_kern_seaton_step_does_not_depend_on_the_step_size():
+    coarse = degradation.kern_seaton(0.0, 100.0, 5e-4, 200.0)
+    fine = 0.0
+    for _ in range(100):
+        fine = degradation.kern_seaton(fine, 1.0, 5e-4, 200.0)
+    assert fine == pytest.approx(coarse) == pytest.approx(5e-4 * (1 - np.exp(-0.5)))
+
+
+def test_cleaning_scenarios_are_solved_together_and_streamed(tmp_path):
+    summary = degradation.simulate_degradation(tmp_path / "run.npy", "water", "water", "copper (pure)", PIPE, SCHEDULE,
+                                               cleaning=[None, 100, [150]], time_constant=50.0, steps=300,
+                                               downtime=2, chunk_steps=64)
+    records = np.load(tmp_path / "run.npy").reshape(300, 3)
+    assert summary["cleanings"].tolist() == [0, 2, 1]
+    assert records["fouling"][0].tolist() == [0, 0, 0]
+    assert records["fouling"][100, 1] == 0 and records["fouling"][150, 2] == 0 and records["fouling"][150, 1] > 0
+    assert not records["online"][[100, 101], 1].any() and records["online"][102, 1]
+    assert summary["best"] == 1 and summary["energy"][1] > summary["energy"][0]
+
+    expected = core.solve_points("water", "water", "copper (pure)", 10, 12, 15, 70,
+                                 dict(PIPE, fouling_internal=records["fouling"][:, 0]))["Q"]
+    np.testing.assert_allclose(records["Q"][:, 0], expected)
+    np.testing.assert_allclose(summary["energy"][0], expected.sum() / 1000)
+
+
+def test_schedule_lengths_must_match(tmp_path):
+    with pytest.raises(ValueError):
+        degradation.simulate_degradation(tmp_path / "run.csv", "water", "water", "copper (pure)", PIPE,
+                                         dict(SCHEDULE, flow_cold=[10, 11, 12]), time_constant=[1.0, 2.0])
@@ -0,0 +1,35 @@
+import numpy as np
+
+import core
+import diagnostics
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+def test_diagnostics_do_not_change_results():
+    plain = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 20, PIPE)
+    diag = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 20, PIPE, diagnostics=True)
+    assert all(diag[key] == value for key, value in plain.items())
+    assert diag["iterations"] == [5] * 20
+    summary = diagnostics.summarize_diagnostics(diag)
+    assert summary["residual"]["max"] < 1e-3
+
+
+def test_tolerance_stops_early_and_flags_are_masked():
+    results = core.simulate_tp2("water", "water", "iron", 20, 10, 50, 100, 30, PIPE, max_iter=50, tol=1e-9, diagnostics=True)
+    assert max(results["residual"]) <= 1e-9
+    assert max(results["iterations"]) < 50
+
+    flags = diagnostics.flag_points(results, max_residual=None, max_energy_balance_error=None, max_iterations=5)
+    masked = diagnostics.mask_results(results, ~flags)
+    assert len(masked["T_out"]) == int((~flags).sum()) == len(masked["T_hot_in"])
+    assert np.all(np.asarray(masked["iterations"]) <= 5)
+
+
+def test_invalid_points_are_masked_instead_of_aborting_the_sweep():
+    results = core.simulate_tp1("water", "water", "iron", 20, 80, -10, 100, 12, PIPE, diagnostics=True)
+    valid = np.asarray(results["valid"])
+    assert 0 < valid.sum() < 12
+    assert np.isnan(np.asarray(results["T_out"])[~valid]).all()
+    assert diagnostics.count_invalid(results) == {core.describe_reason(core.INVALID_FLOW): int((~valid).sum())}
+    assert np.isfinite(diagnostics.summarize_diagnostics(results)["residual"]["max"])
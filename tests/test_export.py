@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import core
+import export
+import replay
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+def test_dataframe_wraps_array_columns_without_copying():
+    results = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 50, PIPE, arrays=True)
+    frame = export.to_dataframe(results)
+    assert len(frame) == 50 and np.shares_memory(frame["T_out"].to_numpy(), results["T_out"])
+    assert list(frame["Re_internal_regime"].cat.categories) == list(core.REGIMES)
+    assert frame["Re_internal_regime"].tolist() == core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 50, PIPE)["Re_internal_regime"]
+
+    tp4 = export.to_dataframe(core.simulate_tp4("water", "water", "iron", 10, 10, 20, 80, "length", 1, 5, 5))
+    assert tp4.attrs == {"dimension_type": "length"} and tp4["T_out"].dtype == np.float64
+
+
+def test_arrow_shares_buffers_and_parquet_round_trips(tmp_path):
+    pytest.importorskip("pyarrow")
+    results = core.simulate_tp3("water", "iron", 10, 10, PIPE, hot_fluids=["water", "glycol", "water"], arrays=True)
+    table = export.to_arrow(results)
+    assert np.shares_memory(np.frombuffer(table["Q"].chunk(0).buffers()[1]), results["Q"])
+    assert str(table.schema.field("hot_fluids").type) == "dictionary<values=string, indices=int32, ordered=0>"
+
+    export.export_results(results, tmp_path / "tp3.parquet")
+    loaded = pd.read_parquet(tmp_path / "tp3.parquet")
+    assert loaded["hot_fluids"].tolist() == ["water", "glycol", "water"]
+    np.testing.assert_array_equal(loaded["T_out"], results["T_out"])
+    with pytest.raises(ValueError, match="format"):
+        export.export_results(results, tmp_path / "tp3.xlsx")
+
+
+def test_record_files_are_converted_chunk_by_chunk(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(2)
+    data = np.column_stack([rng.uniform(2, 10, 300), rng.uniform(5, 15, 300), rng.uniform(10, 20, 300),
+                            rng.uniform(55, 80, 300), rng.uniform(15, 30, 300)])
+    np.savetxt(tmp_path / "historian.csv", data, fmt="%.3f", delimiter=",",
+               header="flow_cold,flow_hot,T_cold_in,T_hot_in,T_cold_out", comments="")
+    replay.replay_historian(tmp_path / "historian.csv", tmp_path / "replay.npy", "water", "water", "iron", PIPE)
+    summary = export.export_records(tmp_path / "replay.npy", tmp_path / "replay.arrow", chunk_rows=128)
+    assert summary["rows"] == 300
+    with pa.ipc.open_file(tmp_path / "replay.arrow") as reader:
+        assert reader.num_record_batches == 3
+        table = reader.read_all()
+    np.testing.assert_array_equal(table["T_out_predicted"].to_numpy(), np.load(tmp_path / "replay.npy")["T_out_predicted"])
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+import core
+import mixtures
+
+
+def test_glycol_table_and_mixing_rules():
+    assert mixtures.parse_mixture("Water+Glycol:35%") == ("water", "glycol", 0.35)
+    # Tabulated points are reproduced, pure components at both ends
+    assert mixtures.mixture_properties("water+glycol:0.3")["cp"] == 3720
+    assert mixtures.mixture_properties("water+glycol:1")["rho"] == pytest.approx(1.11)
+    # Pairs without a table use the mixing rules
+    rules = mixtures.mixture_properties("water+thermal oil:0.5")
+    assert rules["cp"] == pytest.approx((4186 + 2200) / 2)
+    assert rules["rho"] == pytest.approx(1 / (0.5 / 1.0 + 0.5 / 0.9))
+    with pytest.raises(ValueError):
+        mixtures.parse_mixture("water+glycol")
+
+
+def test_concentration_sweep_computes_each_mixture_once():
+    mixtures._mixture_properties.cache_clear()
+    hot_fluids = ["water+glycol:0.2", "water+glycol:0.4", "water+glycol:0.2"]
+    properties = core.fluid_properties(hot_fluids)
+    assert mixtures._mixture_properties.cache_info().misses == 2
+    np.testing.assert_array_equal(properties["cp"][[0, 2]], mixtures.mixture_properties("water+glycol:0.2")["cp"])
+    pipe = {"outer_diameter": 0.03, "thickness": 0.003, "length": 2.0}
+    results = core.simulate_tp3("water", "copper (pure)", 5, 5, pipe, hot_fluids=hot_fluids)
+    assert results["hot_fluids"] == hot_fluids and all(results["valid"])
@@ -0,0 +1,36 @@
+import numpy as np
+
+import core
+from model import ExchangerModel
+
+
+PIPE = {"outer_diameter": 0.03, "thickness": 0.003, "length": 2.0}
+
+
+def test_model_matches_solve_points_and_only_recomputes_downstream():
+    flows = np.linspace(1, 20, 8)
+    model = ExchangerModel(fluid="water", hot_fluid="water", material="copper (pure)", flow_cold=flows, flow_hot=10,
+                           T_cold_in=15, T_hot_in=60, pipe_properties=PIPE)
+    expected = core.solve_points("water", "water", "copper (pure)", flows, 10, 15, 60, PIPE)
+    points = model.points()
+    for key in expected:
+        np.testing.assert_array_equal(points[key], expected[key])
+
+    model.update(T_hot_in=80)
+    assert model.points()["T_out"].shape == (8,)
+    assert model.evaluations["U"] == 1 and model.evaluations["Re_internal"] == 1
+    assert model.evaluations["outlet"] == 2
+    # Nodes nobody asked for since the change stay invalid until read
+    model.update(flow_hot=12)
+    model.points()["T_out"]
+    assert model.evaluations["dp_internal"] == 1 and model.evaluations["Re_internal"] == 1
+    assert model.evaluations["Re_external"] == 2
+
+
+def test_simulate_with_model_reuses_unchanged_nodes():
+    model = ExchangerModel()
+    first = core.simulate_tp1("water", "water", "copper (pure)", 15, 60, 1, 20, 10, PIPE, model=model)
+    second = core.simulate_tp1("water", "water", "copper (pure)", 15, 70, 1, 20, 10, PIPE, model=model)
+    assert model.evaluations["h_internal"] == 1 and model.evaluations["outlet"] == 2
+    assert first["U"] == second["U"]
+    assert second == core.simulate_tp1("water", "water", "copper (pure)", 15, 70, 1, 20, 10, PIPE)
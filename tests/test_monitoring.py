@@ -0,0 +1,45 @@
+import numpy as np
+
+import monitoring
+
+PIPE = {"outer_diameter": 0.025, "thickness": 0.002, "length": 2.0}
+
+
+def test_rolling_window_matches_the_last_values():
+    window = monitoring.RollingWindow(50)
+    values = np.random.default_rng(1).normal(3, 2, 1037)
+    for value in values:
+        window.push(float(value))
+    assert len(window) == 50
+    np.testing.assert_allclose([window.mean, window.std], [values[-50:].mean(), values[-50:].std(ddof=1)])
+
+
+def test_monitor_tracks_fouling_and_flags_drift():
+    samples = list(monitoring.simulated_samples("water", "water", "copper (pure)", PIPE, samples=1500, fouling_rate=4e-7))
+    clean = monitoring.Monitor("water", "water", "copper (pure)", PIPE, window=100)
+    results = list(clean.run(samples))
+    assert not any(result["flags"] & monitoring.RESIDUAL_DRIFT for result in results[:200])
+    assert results[-1]["flags"] & monitoring.RESIDUAL_DRIFT
+    assert monitoring.describe_flags(results[-1]["flags"]) == ["residual drift"]
+    # Internal fouling seen on the outer surface, lagging by half a window
+    expected = 4e-7 * (len(samples) - 50) * PIPE["outer_diameter"] / (PIPE["outer_diameter"] - 2 * PIPE["thickness"])
+    assert abs(results[-1]["fouling_mean"] - expected) < 0.1 * expected
+
+    # The model's own outlet gives its U back: no bias from the outlet assumption
+    model_only = monitoring.Monitor("water", "water", "copper (pure)", PIPE, max_iter=50, tol=1e-12)
+    predicted = model_only.update(**dict(samples[0], T_cold_out=np.nan))["T_out_predicted"]
+    result = model_only.update(**dict(samples[0], T_cold_out=predicted))
+    assert abs(result["fouling"]) < 1e-9 and np.isclose(result["U_effective"], result["U_model"])
+
+    spike = clean.update(**dict(samples[-1], T_cold_out=samples[-1]["T_cold_out"] + 20))
+    assert spike["flags"] & monitoring.RESIDUAL_SPIKE
+
+
+def test_samples_are_read_from_a_tailed_file(tmp_path):
+    path = tmp_path / "live.csv"
+    path.write_text("time,flow_cold,flow_hot,T_cold_in,T_hot_in,TI-5\nt0,10,12,15,70,20.5\nt1,0,12,15,70,bad\nt2,10,12")
+    samples = list(monitoring.parse_lines(monitoring.tail_lines(path, follow=False), columns={"T_cold_out": "TI-5"}))
+    assert samples[0] == {"flow_cold": 10, "flow_hot": 12, "T_cold_in": 15, "T_hot_in": 70, "T_cold_out": 20.5}
+    assert len(samples) == 2 and np.isnan(samples[1]["T_cold_out"])
+    result = monitoring.Monitor("water", "water", "copper (pure)", PIPE).update(**samples[1])
+    assert result["flags"] == monitoring.INVALID_SAMPLE and np.isnan(result["T_out_predicted"])
@@ -0,0 +1,98 @@
+import numpy as np
+
+import core
+from network import ExchangerNetwork
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+def _pair():
+    net = ExchangerNetwork()
+    net.add_unit("E1", "water", "water", "iron", PIPE)
+    net.add_unit("E2", "water", "water", "iron", PIPE)
+    net.feed("E1", "hot", 10, 80)
+    net.feed("E2", "hot", 10, 80)
+    net.connect("E1", "cold", "E2", "cold")
+    return net
+
+
+def test_series_units_match_chained_single_unit_solves():
+    net = _pair()
+    flows = np.array([5.0, 10.0, 20.0])
+    net.feed("E1", "cold", flows, 20)
+    result = net.solve()
+
+    single = ExchangerNetwork()
+    single.add_unit("E2", "water", "water", "iron", PIPE)
+    single.feed("E2", "hot", 10, 80)
+    single.feed("E2", "cold", flows, result["T_cold_out"][0])
+    second = single.solve()
+    assert result["valid"].all()
+    np.testing.assert_allclose(result["T_cold_out"][1], second["T_cold_out"][0])
+    np.testing.assert_allclose(result["T_hot_out"][1], second["T_hot_out"][0])
+
+
+def test_low_hot_flow_keeps_both_energy_balances():
+    net = ExchangerNetwork()
+    net.add_unit("E1", "water", "water", "copper (pure)", dict(PIPE, length=4.0))
+    net.feed("E1", "hot", np.array([10.0, 0.1, 0.05]), 60)
+    net.feed("E1", "cold", 30, 20)
+    result = net.solve()
+
+    water = core.fluid_properties("water")
+    C = np.array([result["flow_cold"][0], result["flow_hot"][0]]) * water["rho"] / 60 * water["cp"]
+    assert result["valid"].all()
+    assert (result["T_hot_out"][0] > 20).all() and (result["T_hot_out"][0] < 60).all()
+    np.testing.assert_allclose(C[0] * (result["T_cold_out"][0] - 20), result["Q"][0])
+    np.testing.assert_allclose(C[1] * (60 - result["T_hot_out"][0]), result["Q"][0])
+    # A tiny hot stream nearly reaches the cold inlet: its duty is capped by its own capacity
+    assert result["Q"][0, 2] < result["Q"][0, 1] < C[1, 1] * 40
+
+
+def test_recycle_converges_and_closes_the_energy_balance():
+    net = _pair()
+    net.feed("E1", "cold", 10, 20)
+    net.connect("E2", "cold", "E1", "cold", fraction=0.3)
+    result = net.solve()
+
+    assert result["tear_residual"] <= 1e-6
+    product = 0.7 * result["flow_cold"][1]
+    np.testing.assert_allclose(product, 10.0)
+    # Heat picked up by the cold product equals the duties of both units
+    heat_gained = (product * result["T_cold_out"][1] - 10 * 20) / 60 * 4186
+    np.testing.assert_allclose(heat_gained, result["Q"].sum(axis=0))
+
+
+def test_counter_current_train_converges_with_every_unit_valid():
+    net = ExchangerNetwork()
+    for name in ("A", "B", "C"):
+        net.add_unit(name, "water", "water", "copper (pure)", PIPE)
+    net.connect("A", "hot", "B", "hot")
+    net.connect("B", "hot", "C", "hot")
+    net.connect("C", "cold", "B", "cold")
+    net.connect("B", "cold", "A", "cold")
+    net.feed("A", "hot", np.array([10.0, 20.0]), 80)
+    net.feed("C", "cold", 10, np.array([20.0, 50.0]))
+    result = net.solve()
+
+    assert result["valid"].all() and result["tear_residual"] <= 1e-6
+    # Heat released by the hot train equals the heat picked up by the cold train and the duties
+    water = core.fluid_properties("water")
+    C_hot = np.array([10.0, 20.0]) * water["rho"] / 60 * water["cp"]
+    C_cold = 10 * water["rho"] / 60 * water["cp"]
+    released = C_hot * (80 - result["T_hot_out"][2])
+    picked_up = C_cold * (result["T_cold_out"][0] - np.array([20.0, 50.0]))
+    np.testing.assert_allclose(released, picked_up, rtol=1e-6)
+    np.testing.assert_allclose(released, result["Q"].sum(axis=0), rtol=1e-6)
+
+
+def test_units_with_a_tight_approach_are_solved():
+    net = ExchangerNetwork()
+    net.add_unit("E1", "water", "water", "copper (pure)", PIPE)
+    net.feed("E1", "hot", 10, np.array([25.0, 20.5, 20.0]))
+    net.feed("E1", "cold", 10, 20)
+    result = net.solve()
+
+    assert result["valid"][0].tolist() == [True, True, False]
+    assert result["reason"][0, 2] == core.TEMPERATURE_CROSS
+    assert (result["T_cold_out"][0, :2] > 20).all() and (result["T_hot_out"][0, :2] > 20).all()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import core
+import replay
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+def test_float32_sweep_stays_close_to_float64():
+    reference = core.simulate_tp2("water", "water", "iron", 20, 10, 50, 100, 200, PIPE, profiles="analytic")
+    reduced = core.simulate_tp2("water", "water", "iron", 20, 10, 50, 100, 200, PIPE, profiles="analytic", precision="float32")
+    for key in ("T_out", "Q", "U", "dp_internal"):
+        assert reduced[key].dtype == np.float32
+        np.testing.assert_allclose(reduced[key], reference[key], rtol=1e-5, equal_nan=True)
+    np.testing.assert_array_equal(reduced["reason"], reference["reason"])
+    assert reduced["profiles"].nbytes == reference["profiles"].nbytes // 2
+
+    with pytest.raises(ValueError, match="precision"):
+        core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 10, PIPE, precision="float16")
+
+
+def test_float32_replay_halves_the_stored_fields(tmp_path):
+    rng = np.random.default_rng(1)
+    data = np.column_stack([rng.uniform(2, 10, 500), rng.uniform(5, 15, 500), rng.uniform(10, 20, 500),
+                            rng.uniform(55, 80, 500), rng.uniform(15, 30, 500)])
+    historian = tmp_path / "historian.csv"
+    np.savetxt(historian, data, fmt="%.3f", delimiter=",", header="flow_cold,flow_hot,T_cold_in,T_hot_in,T_cold_out", comments="")
+    reference = replay.replay_historian(historian, tmp_path / "float64.npy", "water", "water", "iron", PIPE, chunk_rows=128)
+    reduced = replay.replay_historian(historian, tmp_path / "float32.npy", "water", "water", "iron", PIPE, chunk_rows=128,
+                                      precision="float32")
+    records = np.load(tmp_path / "float32.npy")
+    assert records.dtype["T_out_predicted"] == np.float32 and records.dtype["row"] == np.int64
+    np.testing.assert_allclose(records["T_out_predicted"], np.load(tmp_path / "float64.npy")["T_out_predicted"], rtol=1e-5)
+    assert reduced["valid"] == reference["valid"]
+    assert reduced["residual_rms"] == pytest.approx(reference["residual_rms"], rel=1e-5)
@@ -0,0 +1,47 @@
+import numpy as np
+
+import core
+import diagnostics
+import profiles
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+def test_sweep_profiles_are_compact_and_expand_to_the_end_temperatures():
+    results = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 50, PIPE, profiles="analytic")
+    stored = results["profiles"]
+    assert len(stored) == 50 and stored.nbytes == 5 * 8 * 50
+    x, T_cold, T_hot = stored.expand(11, [0, 49])
+    np.testing.assert_allclose(T_cold[:, -1], np.array(results["T_out"])[[0, 49]])
+    np.testing.assert_allclose(T_hot[:, 0], np.array(results["T_hot_out"])[[0, 49]])
+    np.testing.assert_allclose(T_hot[:, -1], 80)
+    expected = profiles.axial_profiles(20, results["T_out"][49], 80, results["T_hot_out"][49], x)
+    np.testing.assert_allclose(T_cold[1], expected[0])
+
+    sampled = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 50, PIPE, profiles=33)["profiles"]
+    assert sampled.samples.dtype == np.float32 and sampled.nbytes == 2 * 4 * 50 * 33
+    _, T_cold_sampled, T_hot_sampled = sampled.expand(x, [0, 49])
+    np.testing.assert_allclose(T_cold_sampled, T_cold, atol=1e-3)
+    np.testing.assert_allclose(T_hot_sampled, T_hot, atol=1e-3)
+
+
+def test_masking_keeps_the_profiles_of_the_kept_points():
+    results = core.simulate_tp2("water", "water", "iron", 20, 10, 50, 100, 6, PIPE, profiles="analytic")
+    masked = diagnostics.mask_results(results, [True, False, True, False, False, True])
+    _, T_cold, _ = masked["profiles"].expand(3)
+    np.testing.assert_allclose(T_cold[:, -1], masked["T_out"])
+
+
+def test_hot_outlet_and_profiles_close_the_energy_balance_of_both_streams():
+    results = core.simulate_tp1("water", "water", "iron", 20, 80, 5, 100, 50, PIPE, profiles="analytic", arrays=True)
+    water = core.fluid_properties("water")
+    C_hot = 10 * water["rho"] / 60 * water["cp"]
+    np.testing.assert_allclose(C_hot * (80 - results["T_hot_out"]), results["Q"])
+    C_cold = np.linspace(5, 100, 50) * water["rho"] / 60 * water["cp"]
+    _, T_cold, T_hot = results["profiles"].expand(7)
+    np.testing.assert_allclose(C_hot * (T_hot - results["T_hot_out"][:, None]), C_cold[:, None] * (T_cold - 20), rtol=1e-9)
+
+    # A duty larger than the hot stream can give is kept and shows in the energy-balance error
+    points = core.solve_points("water", "water", "iron", 10, np.array([10, 0.05]), 20, 80, PIPE)
+    assert points["valid"].all() and points["T_hot_out"][1] < 20 < points["T_hot_out"][0]
+    assert points["energy_balance_error"][1] > 0.5
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+import core
+import profiling
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+@pytest.fixture
+def tracer():
+    yield profiling.enable()
+    profiling.disable()
+
+
+def test_simulation_trace_is_a_valid_chrome_trace(tracer, tmp_path):
+    for _ in range(2):
+        core.simulate_tp1("water", "water", "iron", 20, 80, 5, 50, 5, PIPE)
+    tracer.export_chrome_trace(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+
+    events = trace["traceEvents"]
+    assert trace["otherData"]["dropped_events"] == 0
+    for event in events:
+        assert event["ph"] == "X" and event["ts"] >= 0 and event["dur"] >= 0
+        assert isinstance(event["pid"], int) and isinstance(event["tid"], int)
+        assert isinstance(event["name"], str) and isinstance(event["args"]["alloc_blocks"], int)
+    # Every solve_points span lies inside a simulate_tp1 span
+    outer = [e for e in events if e["name"] == "simulate_tp1"]
+    inner = [e for e in events if e["name"] == "solve_points"]
+    assert len(outer) == len(inner) == 2
+    for parent, child in zip(outer, inner):
+        assert parent["ts"] <= child["ts"] and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"]
+
+    assert tracer.stats["simulate_tp1"]["calls"] == 2
+    assert tracer.stats["simulate_tp1"]["total_ns"] >= tracer.stats["solve_points"]["total_ns"]
+    stages = ["solve_points.properties", "solve_points.validate", "solve_points.U", "solve_points.pressure_drop", "solve_points.lmtd"]
+    assert [name for name in tracer.stats if name.startswith("solve_points.")] == stages
+    assert all(tracer.stats[name]["calls"] == 2 for name in stages)
+    lines = tracer.summary().splitlines()
+    assert lines[0].split()[:2] == ["stage", "calls"]
+    assert lines[1].split()[:2] == ["simulate_tp1", "2"]
+
+
+def test_allocations_and_bounded_events():
+    tracer = profiling.Tracer(max_events=2)
+    kept = []
+    for _ in range(5):
+        with tracer.span("allocate"):
+            kept.append([object() for _ in range(1000)])
+    assert tracer.stats["allocate"]["calls"] == 5
+    assert tracer.stats["allocate"]["alloc_blocks"] >= 5000
+    assert len(tracer.events) == 2 and tracer.dropped_events == 3
+    assert "3 events not kept" in tracer.summary()
+
+    untracked = profiling.Tracer(track_allocations=False)
+    with untracked.span("allocate"):
+        kept.append([object() for _ in range(1000)])
+    assert untracked.stats["allocate"]["alloc_blocks"] == 0
+
+
+def test_disabled_profiling_does_nothing():
+    profiling.disable()
+    assert profiling.tracer() is None
+    assert profiling.span("a") is profiling.span("b") is profiling._NULL_SPAN
+    with profiling.span("stage") as span:
+        assert span is profiling._NULL_SPAN
+
+    @profiling.profiled("double")
+    def double(x):
+        return 2 * x
+
+    assert double(3) == 6 and double.__name__ == "double"
+    core.simulate_tp1("water", "water", "iron", 20, 80, 5, 50, 5, PIPE)
+    tracer = profiling.enable()
+    try:
+        assert tracer.stats == {} and tracer.events == []
+        double(1)
+        assert tracer.stats["double"]["calls"] == 1
+    finally:
+        profiling.disable()
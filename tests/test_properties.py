@@ -0,0 +1,34 @@
+import json
+
+import numpy as np
+import pytest
+
+import properties
+
+
+def test_cache_is_reused_until_a_source_changes(tmp_path):
+    fluids = tmp_path / "fluids.csv"
+    fluids.write_text("name,specific_heat_capacity,density,viscosity,thermal_conductivity\nBrine,3300,1.2,0.002,0.5\n")
+    tables = tmp_path / "tables.json"
+    tables.write_text(json.dumps({"fluids": {"brine": {
+        "specific_heat_capacity": 3300, "density": 1.2, "viscosity": 0.002, "thermal_conductivity": 0.5,
+        "table": {"temperature": [0, 50], "specific_heat_capacity": [3200, 3400], "density": [1.2, 1.2],
+                  "viscosity": [0.003, 0.001], "thermal_conductivity": [0.5, 0.5]}}}}))
+    cache = tmp_path / "cache.npz"
+
+    database = properties.load_database((fluids, tables), cache)
+    assert cache.exists() and database["fluids"].tolist() == ["brine"]
+    assert properties.property_at("brine", "specific_heat_capacity", [25, 100], database).tolist() == [3300, 3400]
+
+    # The cached arrays are used as long as the sources are untouched
+    assert properties._read_cache(cache, properties.default_sources()) is None
+    assert properties._read_cache(cache, tuple(str(p.resolve()) for p in (fluids, tables))) is not None
+    fluids.write_text(fluids.read_text() + "oil,2000,0.9,0.05,0.15\n")
+    assert properties._read_cache(cache, tuple(str(p.resolve()) for p in (fluids, tables))) is None
+
+
+def test_invalid_sources_are_rejected(tmp_path):
+    fluids = tmp_path / "fluids.csv"
+    fluids.write_text("name,specific_heat_capacity,density,viscosity,thermal_conductivity\nwater,4186,-1,0.001,0.6\n")
+    with pytest.raises(ValueError, match="density"):
+        properties.compile_database([fluids])
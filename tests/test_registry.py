@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import core
+import registry
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+def test_runs_are_summarized_and_found_by_material_fluid_and_metrics(tmp_path):
+    tp1 = core.simulate_tp1("water", "water", "copper (pure)", 20, 80, 5, 100, 20, PIPE)
+    tp3 = core.simulate_tp3("water", "copper (pure)", 10, 10, PIPE, hot_fluids=["water", "water+glycol:0.3"])
+    with registry.RunRegistry(tmp_path / "runs.sqlite", store_format=".npz") as runs:
+        first = runs.register("TP1", {"fluid": "Water", "hot_fluid": "water", "material": "Copper (Pure)", "T_cold_in": "20",
+                                      "pipe_properties": PIPE}, tp1)
+        second = runs.register("TP3", {"fluid": "water", "material": "copper (pure)", "flow_cold": 10.0}, tp3)
+        runs.register("TP1", {"fluid": "water", "hot_fluid": "oil", "material": "iron"}, tp1, store=False)
+
+        run = runs.get(first)
+        assert run["material"] == "copper (pure)" and run["parameters"]["T_cold_in"] == 20.0
+        assert run["max_T_out"] == pytest.approx(np.nanmax(tp1["T_out"]))
+        assert run["optimal_value"] == tp1["flow_rates"][int(np.nanargmax(tp1["T_out"]))]
+        assert isinstance(runs.get(second)["optimal_value"], str)
+
+        assert [r["id"] for r in runs.find(material="copper (pure)", fluid="glycol")] == [second]
+        assert [r["id"] for r in runs.find(hot_fluid="oil")] == [3]
+        threshold = run["efficiency_max"] - 1e-9
+        assert {r["id"] for r in runs.find(min_efficiency=threshold)} >= {first, 3}
+        assert len(runs.find(tp="tp1", where="Q_max > ?", params=(0,))) == 2
+
+        np.testing.assert_allclose(runs.load_results(first)["T_out"], tp1["T_out"])
+        with pytest.raises(FileNotFoundError):
+            runs.load_results(3)
+        runs.delete(first)
+        assert len(runs) == 2 and not (tmp_path / "runs_results" / f"run_{first}.npz").exists()
+
+
+def test_material_family_finds_every_grade_the_gui_offers(tmp_path):
+    tp3 = {grade: core.simulate_tp3("water", grade, 10, 10, PIPE, hot_fluids=["water+glycol:0.3"])
+           for grade in ("copper (pure)", "copper (annealed)", "stainless steel")}
+    with registry.RunRegistry(tmp_path / "runs.sqlite") as runs:
+        ids = {grade: runs.register("TP3", {"fluid": "water", "material": grade}, results, store=False)
+               for grade, results in tp3.items()}
+        threshold = min(runs.get(ids[grade])["efficiency_max"] for grade in ids) - 1e-9
+        copper = runs.find(material="copper", fluid="glycol", min_efficiency=threshold)
+        assert {r["id"] for r in copper} == {ids["copper (pure)"], ids["copper (annealed)"]}
+        assert [r["id"] for r in runs.find(material="Copper (Annealed)")] == [ids["copper (annealed)"]]
+        assert runs.get(ids["copper (pure)"])["material_family"] == "copper"
+        plan = " ".join(row[-1] for row in runs.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE material = ? OR material_family = ?", ("copper", "copper")))
+        assert "runs_material_family" in plan and "SCAN runs" not in plan
+
+
+def test_identical_setups_share_the_parameter_hash():
+    assert registry.normalize_parameters({"fluid": "Water ", "T_cold_in": "20"}) == \
+        registry.normalize_parameters({"T_cold_in": 20, "fluid": "water"})
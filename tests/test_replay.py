@@ -0,0 +1,33 @@
+import numpy as np
+
+import core
+import replay
+
+PIPE = {"outer_diameter": 0.03, "thickness": 0.003, "length": 2.0}
+
+
+def test_replay_streams_chunks_matching_the_batch_engine(tmp_path):
+    historian = tmp_path / "historian.csv"
+    historian.write_text(
+        "time,FI-1,flow_hot,T_cold_in,T_hot_in,T_cold_out\n"
+        "t0,5,10,15,60,20\n"
+        "t1,8,10,15,65,21\n"
+        "t2,nan,10,15,60,20\n"
+        "t3,3,12,18,70,25\n"
+        "t4,6,10,15,60,19\n"
+    )
+    summary = replay.replay_historian(historian, tmp_path / "out.npy", "water", "water", "copper (pure)", PIPE,
+                                      columns={"flow_cold": "FI-1"}, chunk_rows=2)
+    records = np.load(tmp_path / "out.npy")
+    assert summary["rows"] == 5 and summary["valid"] == 4 and summary["measured"] == 4
+    assert records["row"].tolist() == [0, 1, 2, 3, 4]
+    assert records["reason"][2] != 0 and np.isnan(records["T_out_predicted"][2])
+
+    expected = core.solve_points("water", "water", "copper (pure)", np.array([5, 8, 3, 6]), np.array([10, 10, 12, 10]),
+                                 np.array([15, 15, 18, 15]), np.array([60, 65, 70, 60]), PIPE)["T_out"]
+    np.testing.assert_allclose(records["T_out_predicted"][[0, 1, 3, 4]], expected)
+    np.testing.assert_allclose(records["residual"], records["T_out_predicted"] - records["T_out_measured"])
+
+    replay.replay_historian(historian, tmp_path / "out.csv", "water", "water", "copper (pure)", PIPE, columns={"flow_cold": "FI-1"})
+    lines = (tmp_path / "out.csv").read_text().splitlines()
+    assert lines[0] == ",".join(replay.OUTPUT_DTYPE.names) and len(lines) == 6
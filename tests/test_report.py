@@ -0,0 +1,153 @@
+import io
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import bench
+import core
+import report
+import report_native
+from report_content import EQUATIONS, SECTIONS
+
+PIPE = {"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0}
+
+
+@pytest.fixture
+def pdflatex(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", os.environ["PATH"])
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    bench.install_fake_pdflatex(bin_dir)
+
+
+@pytest.fixture(scope="module")
+def results():
+    return core.simulate_tp1("water", "water", "iron", 20, 80, 5, 50, 5, PIPE)
+
+
+def test_second_build_of_the_same_report_is_a_cache_hit(pdflatex, results, tmp_path):
+    first = report.build_report("TP1", results, {}, tmp_path / "out", "tp1")
+    second = report.build_report("TP1", results, {}, tmp_path / "out", "tp1")
+    assert not first["cached"] and first["passes"] == 2
+    assert second["cached"] and second["passes"] == 0
+    assert not report.build_report("TP1", results, {"author": "Someone else"}, tmp_path / "out", "tp1")["cached"]
+
+
+def test_table_of_contents_is_compiled_until_stable(pdflatex, tmp_path):
+    tex_file = tmp_path / "toc.tex"
+    tex_file.write_text("\\tableofcontents\n\\section{A}\n\\section{B}\n", encoding="utf-8")
+    assert report.compile_tex(tex_file, tmp_path) == 2
+    assert (tmp_path / "toc.pdf").exists()
+
+
+def test_failing_compile_raises_a_structured_error(pdflatex, results, tmp_path):
+    with pytest.raises(report.ReportError) as error:
+        report.build_report("TP1", results, {"author": "\\undefined"}, tmp_path, "broken")
+    assert error.value.stage == "compile"
+    assert "Undefined control sequence" in error.value.log
+    assert not (tmp_path / "broken.pdf").exists()
+
+
+def test_only_format_errors_fall_back_to_a_full_compile(pdflatex, results, tmp_path, monkeypatch):
+    fmt_file = report.build_preamble_format(tmp_path / "format")
+    calls = []
+    compile_tex = report.compile_tex
+    monkeypatch.setattr(report, "compile_tex", lambda *args: calls.append(args) or compile_tex(*args))
+    with pytest.raises(report.ReportError) as error:
+        report.build_report("TP1", results, {"author": "\\undefined"}, tmp_path, "broken", fmt_file=fmt_file)
+    assert error.value.stage == "compile" and len(calls) == 1
+
+    fmt_file.write_bytes(b"stale")
+    assert report.build_report("TP1", results, {}, tmp_path, "stale", fmt_file=fmt_file)["passes"] == 2
+    assert len(calls) == 3 and calls[-1][2:] == ()
+
+
+def test_batch_generation_writes_one_report_per_job(pdflatex, results, tmp_path):
+    jobs = [{"tp_name": "TP1", "results": results, "params": {"author": f"Run {i}"}, "name": f"run_{i}"} for i in range(6)]
+    jobs.append({"tp_name": "TP1", "results": results, "params": {"author": "\\undefined"}, "name": "broken"})
+    reports = report.generate_reports(jobs, tmp_path, max_workers=3)
+    assert [r["name"] for r in reports] == [job["name"] for job in jobs]
+    assert all(r["error"] is None and Path(r["path"]).exists() for r in reports[:-1])
+    assert reports[-1]["path"] is None and reports[-1]["error"]["stage"] == "compile"
+
+
+def _headings():
+    # "1 Introduction", ..., "4.1 Optimal Results", ... as numbered by the native backends
+    headings = []
+    for number, (section, subsections) in enumerate(SECTIONS, start=1):
+        headings.append(f"{number} {section}")
+        headings += [f"{number}.{sub_number} {subsection}" for sub_number, subsection in enumerate(subsections, start=1)]
+    return headings
+
+
+def test_native_reports_have_the_sections_of_the_latex_report(results, tmp_path):
+    buffer = io.StringIO()
+    report.ecriture_document(buffer, "TP1", results, {}, tmp_path, tmp_path / "plot.png")
+    latex = re.findall(r"^\\(?:sub)?section\{(.*)\}", buffer.getvalue(), flags=re.M)
+    assert latex == [heading.split(" ", 1)[1] for heading in _headings()]
+
+    html = report_native.render_html("TP1", results, {})
+    assert [text for _, text in re.findall(r'<h([23]) id="section-[\d-]+">(.*?)</h\1>', html)] == _headings()
+
+    doc, _ = report_native._pdf_layout("TP1", results, {})
+    assert [text for _, text, _ in doc.headings] == _headings()
+    assert report_native.render_pdf("TP1", results, {}).startswith(b"%PDF")
+
+
+def test_html_report_is_self_contained(results):
+    html = report_native.render_html("TP1", results, {})
+    # One inline SVG for the plot and one per equation, nothing loaded from elsewhere
+    assert html.count("<svg") >= 1 + len(EQUATIONS)
+    assert "<img" not in html and "<link" not in html and "<script" not in html
+    targets = re.findall(r'(?:href|src)="([^"]*)"', html) + re.findall(r"url\(([^)]*)\)", html)
+    assert targets and all(target.startswith("#") for target in targets)
+
+
+def test_reports_are_generated_without_tk(pdflatex, results, tmp_path):
+    for backend in report.BACKENDS:
+        generated = report.generate_report("TP1", results, {}, tmp_path, f"report_{backend}", backend=backend)
+        assert Path(generated["path"]).stat().st_size > 0
+    assert report.render_report("TP1", results, {}, "html").startswith(b"<!DOCTYPE html>")
+    assert report.render_report("TP1", results, {}, "latex").startswith(b"%PDF")
+    # Importing and using the report API never loads tkinter
+    code = ("import sys, core, report; "
+            "r = core.simulate_tp1('water', 'water', 'iron', 20, 80, 5, 50, 5, "
+            "{'outer_diameter': 0.11, 'thickness': 0.005, 'length': 2.0}); "
+            "report.render_report('TP1', r, {}, 'pdf'); assert 'tkinter' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], cwd=Path(report.__file__).parent, check=True)
+
+
+class _Window:
+    # Stand-in for the Tk root: ReportQueue only schedules its polling with after()
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+
+def test_report_queue_calls_back_once_per_job(results, tmp_path):
+    pytest.importorskip("tkinter")
+    from interface import ReportQueue
+
+    done = []
+    window = _Window()
+    queue = ReportQueue(window, lambda name, generated, error: done.append((name, generated, error)), max_workers=2)
+    for i in range(4):
+        queue.submit("TP1", results, {}, tmp_path, f"queued_{i}", "html")
+    queue.submit("TP1", results, {}, tmp_path, "unknown", "docx")
+    assert len(window.scheduled) == 1
+    deadline = time.time() + 60
+    while window.scheduled and time.time() < deadline:
+        time.sleep(0.01)
+        window.scheduled.pop(0)()
+
+    assert queue.pending == 0 and len(done) == 5
+    by_name = {name: (generated, error) for name, generated, error in done}
+    assert all(Path(by_name[f"queued_{i}"][0]["path"]).exists() for i in range(4))
+    assert by_name["unknown"][0] is None and isinstance(by_name["unknown"][1], ValueError)
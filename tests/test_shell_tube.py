@@ -0,0 +1,21 @@
+import numpy as np
+
+import shell_tube
+
+
+def test_shell_and_tube_sweep_closes_energy_balance_and_masks_bad_geometry():
+    results = shell_tube.simulate_shell_and_tube(
+        "water", "water", "iron", 300, 400, 20, 80, {"tube_passes": 4, "n_tubes": 203}, "pitch", 0.015, 0.03, 7
+    )
+    valid = np.asarray(results["valid"])
+    # Pitches not larger than the tube diameter (0.019 m) are invalid geometry
+    assert not valid[0] and valid[-1]
+    Q = np.asarray(results["Q"])[valid]
+    cold_gain = 300 / 60 * 4186 * (np.asarray(results["T_out"])[valid] - 20)
+    hot_loss = 400 / 60 * 4186 * (80 - np.asarray(results["T_hot_out"])[valid])
+    np.testing.assert_allclose(cold_gain, Q)
+    np.testing.assert_allclose(hot_loss, Q)
+
+
+def test_uneven_passes_get_the_remaining_tubes():
+    np.testing.assert_array_equal(shell_tube.tubes_per_pass(203, 4), [51, 51, 51, 50])
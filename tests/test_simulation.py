@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import core
+import profiles
+import simulation
+from model import ExchangerModel
+
+
+def test_axial_profiles_match_the_end_temperatures_and_the_lmtd():
+    x = np.linspace(0, 1, 2001)
+    T_cold, T_hot = profiles.axial_profiles(20, 45, 80, 70, x)
+    assert (T_cold[0], T_cold[-1], T_hot[0], T_hot[-1]) == pytest.approx((20, 45, 70, 80))
+    mean_difference = np.trapezoid(T_hot - T_cold, x)
+    assert mean_difference == pytest.approx(core.calculate_delta_T_lm(80, 70, 20, 45), rel=1e-6)
+
+
+def test_animation_frames_loop_and_blit_without_tk():
+    model = ExchangerModel(fluid="water", hot_fluid="water", material="copper (pure)",
+                           pipe_properties={"outer_diameter": 0.11, "thickness": 0.005, "length": 2.0},
+                           flow_cold=np.linspace(5, 20, 7), flow_hot=10.0, T_cold_in=20.0, T_hot_in=80.0)
+    state = simulation.exchanger_state(model)
+    assert state["T_cold_out"] == pytest.approx(model["outlet"]["T_out"][3])
+    assert state["T_hot_out"] == pytest.approx(model["outlet"]["T_hot_out"][3])
+    assert state["T_hot_out"] != pytest.approx(80 - core.HOT_OUTLET_DROP)
+
+    frames = simulation.exchanger_frames(state, frames=60, particles=8)
+    assert frames["cold"].shape == (60, 8, 2)
+    step = np.diff(frames["cold"][:, :, 0], axis=0, append=frames["cold"][:1, :, 0]) % state["length"]
+    np.testing.assert_allclose(step, step[0, 0])  # constant speed, including from the last frame to the first
+
+    canvas = FigureCanvasAgg(Figure())
+    animation = simulation.ExchangerAnimation(canvas, frames=60, particles=8)
+    animation.set_state(state)
+    canvas.draw()
+    animation.draw_frame(61)
+    assert animation.frame == 1
+    np.testing.assert_allclose(animation.cold.get_offsets(), frames["cold"][1])